@@ -0,0 +1,81 @@
+"""
+`pynes` command line: ROM library indexing and the demo
+"""
+import argparse
+import sys
+from typing import List, Optional
+
+from pynes.library import DEFAULT_DB_PATH, RomLibrary
+
+
+def index(args: argparse.Namespace) -> int:
+    library = RomLibrary(args.db)
+    try:
+        result = library.scan(args.directory, jobs=args.jobs)
+    finally:
+        library.close()
+    print('hashed {r.hashed}, unchanged {r.unchanged}, removed {r.removed}, failed {r.failed}'.format(r=result))
+    return 0
+
+
+def info(args: argparse.Namespace) -> int:
+    library = RomLibrary(args.db)
+    try:
+        records = library.lookup(args.key)
+        for record in records:
+            print(record.path)
+            if record.error:
+                print('  error: ' + record.error)
+                continue
+            print('  mapper {r.mapper}.{r.submapper}, {r.mirroring} mirroring{b}'.format(
+                r=record, b=', battery' if record.battery else ''))
+            print('  PRG {p} KB, CHR {c} KB, crc32 {r.rom_crc32}, sha1 {r.rom_sha1}'.format(
+                p=record.prg_rom_size // 1024, c=record.chr_rom_size // 1024, r=record))
+            override = library.override(record.rom_sha1)
+            if override:
+                print('  override: ' + ', '.join('{k}={v}'.format(k=k, v=v) for k, v in override.items()))
+    finally:
+        library.close()
+    return 0 if records else 1
+
+
+def run(args: argparse.Namespace) -> int:
+    # pygame is only needed here
+    from pynes.demos.demo_cpu6502_render import DemoCpu6502Render
+
+    demo = DemoCpu6502Render(args.rom)
+    demo.setup(width=800, height=600)
+    demo.run()
+    return 0
+
+
+def parser() -> argparse.ArgumentParser:
+    root = argparse.ArgumentParser(prog='pynes', description='NES Emulator on Python 3')
+    commands = root.add_subparsers(dest='command')
+    commands.required = True
+
+    index_parser = commands.add_parser('index', help='scan directory into the ROM library')
+    index_parser.add_argument('directory')
+    index_parser.add_argument('-j', '--jobs', type=int, default=None, help='worker processes, all cores by default')
+    index_parser.set_defaults(handler=index)
+
+    info_parser = commands.add_parser('info', help='look ROM up by path, CRC32 or SHA-1')
+    info_parser.add_argument('key')
+    info_parser.set_defaults(handler=info)
+
+    for command_parser in (index_parser, info_parser):
+        command_parser.add_argument('--db', default=DEFAULT_DB_PATH, help='library file, %(default)s by default')
+
+    run_parser = commands.add_parser('run', help='run .nes file in the debugger demo')
+    run_parser.add_argument('rom')
+    run_parser.set_defaults(handler=run)
+    return root
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parser().parse_args(argv)
+    return args.handler(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
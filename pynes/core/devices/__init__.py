@@ -1,4 +1,4 @@
-from .abstract_device import AbstractDevice
+from .abstract_device import AbstractDevice, MemoryRange
 from .abstract_memory_device import AbstractMemoryDevice
 
 from .bus import Bus
@@ -6,3 +6,4 @@ from .cpu.cpu6502 import Cpu6502
 from .ppu.ppu2C02 import Ppu2C02
 from .ram import Ram
 from .cartridge import Cartridge
+from .io_registers import IoRegisters
@@ -1,7 +1,21 @@
 from abc import ABC
+from typing import Callable, List, NamedTuple, Optional
+
+
+class MemoryRange(NamedTuple):
+    """
+    Address range [lo, hi] of a bus served by a device through int read/write handlers
+    """
+    lo: int
+    hi: int
+    read: Callable[[int], int]
+    write: Callable[[int, int], None]
+    device: object
 
 
 class AbstractDevice(ABC):
+    # subclasses may list their attributes in __slots__ too
+    __slots__ = ('bus',)
 
     def __init__(self):
         self.bus = None
@@ -9,3 +23,31 @@ class AbstractDevice(ABC):
     def connect_to_bus(self, bus) -> None:
         self.bus = bus
         self.bus.register_device(self)
+
+    def memory_map(self, bus) -> List[MemoryRange]:
+        """
+        Address ranges of `bus` this device responds to, nothing by default
+        """
+        return []
+
+    def bus_remapped(self, bus) -> None:
+        """
+        Called when page table of `bus` has been rebuilt
+        """
+        pass
+
+    def pages_switching(self, bus, first_page: int, count: int) -> None:
+        """
+        Called right before Bus.set_pages() re-points `count` pages of `bus`
+        from `first_page` on (e.g. on bank switch)
+        """
+        pass
+
+    def stable_until(self, addr: int) -> Optional[float]:
+        """
+        CPU cycle from which reading `addr` again may give another value than
+        the last read did, as long as the CPU writes nothing meanwhile. None
+        (the default) when that is not known or reads have side effects, so
+        polling `addr` is never skipped (see Cpu6502.skip_idle_loop()).
+        """
+        return None
@@ -1,7 +1,11 @@
 from abc import abstractmethod
-from ctypes import c_uint8, c_uint16
+from typing import List, Union
 
 from pynes.core.devices import AbstractDevice
+from pynes.core.devices.abstract_device import MemoryRange
+from pynes.core.exceptions import OutOfRangeMemoryException
+
+Block = Union[bytes, bytearray, memoryview]
 
 
 class AbstractMemoryDevice(AbstractDevice):
@@ -25,17 +29,53 @@ class AbstractMemoryDevice(AbstractDevice):
 
     def __init__(self):
         super().__init__()
-        self.data = [c_uint8(AbstractMemoryDevice.INIT_VALUE) for _ in range(self.size_memory)]
+        # contiguous storage, `memory` gives zero-copy views over it
+        self.data = bytearray([AbstractMemoryDevice.INIT_VALUE]) * self.size_memory
+        self.memory = memoryview(self.data)
         self.bus = None
 
-    def write(self, addr: c_uint16, data: c_uint8) -> None:
+    def write(self, addr: int, data: int) -> None:
         if self.is_address_valid(addr):
-            self.data[addr.value - self.min_address].value = data.value
+            self.data[addr - self.min_address] = data
 
-    def read(self, addr: c_uint16, read_only: bool = False) -> c_uint8:
+    def read(self, addr: int, read_only: bool = False) -> int:
         if self.is_address_valid(addr):
-            return self.data[addr.value - self.min_address]
-        return c_uint8(AbstractMemoryDevice.INIT_VALUE)
+            return self.data[addr - self.min_address]
+        return AbstractMemoryDevice.INIT_VALUE
+
+    def read_block(self, addr: int, length: int) -> Block:
+        """
+        Zero-copy view over `length` bytes starting at `addr`
+        """
+        offset = self.block_offset(addr, length)
+        return self.memory[offset:offset + length]
+
+    def write_block(self, addr: int, data: Block) -> None:
+        offset = self.block_offset(addr, len(data))
+        self.memory[offset:offset + len(data)] = data
+
+    def block_offset(self, addr: int, length: int) -> int:
+        if length < 0 or not self.is_address_valid(addr) or not self.is_address_valid(addr + max(length - 1, 0)):
+            raise OutOfRangeMemoryException(f'block {hex(addr)}+{hex(length)} in {type(self).__name__}')
+        return addr - self.min_address
+
+    def is_address_valid(self, addr: int) -> bool:
+        return self.min_address <= addr <= self.max_address
+
+    def snapshot(self) -> bytes:
+        return bytes(self.data)
+
+    def restore(self, snapshot: bytes) -> None:
+        self.memory[:] = snapshot
+
+    def memory_map(self, bus) -> List[MemoryRange]:
+        data = self.data
+        offset = self.min_address
+
+        def read(addr: int) -> int:
+            return data[addr - offset]
+
+        def write(addr: int, value: int) -> None:
+            data[addr - offset] = value
 
-    def is_address_valid(self, addr: c_uint16) -> bool:
-        return self.min_address <= addr.value <= self.max_address
+        return [MemoryRange(self.min_address, self.max_address, read, write, self)]
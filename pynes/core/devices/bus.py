@@ -1,16 +1,255 @@
+from bisect import bisect_right
 from ctypes import c_uint16
+from typing import Callable, List, Optional, Tuple, Union
 
 from pynes.core.devices import AbstractMemoryDevice
+from pynes.core.devices.abstract_memory_device import Block
+from pynes.core.devices.abstract_device import MemoryRange
+from pynes.core.devices.watchpoints import (
+    WATCH_KINDS, Watchpoint, WatchCallback, watched_fetcher, watched_reader, watched_writer,
+)
 from pynes.core.exceptions import NoSuchDeviceException
 
+PAGE_SHIFT: int = 8
+PAGE_SIZE:  int = 1 << PAGE_SHIFT
+PAGES:      int = 0x10000 >> PAGE_SHIFT
+
+Reader = Callable[[int], int]
+Writer = Callable[[int, int], None]
+# (lo, hi, range) address span served by a single memory range
+Segment = Tuple[int, int, MemoryRange]
+
+
+def unmapped_read(addr: int) -> int:
+    raise NoSuchDeviceException(f'with address {hex(addr)}')
+
+
+def unmapped_write(addr: int, data: int) -> None:
+    raise NoSuchDeviceException(f'with address {hex(addr)}')
+
 
 class Bus:
+    """
+    Address decoding is done by page table: `readers`/`writers` keep one handler
+    per 256-byte page, so an access costs one list index and one call. Pages shared
+    by several devices get a handler which dispatches on the low address byte.
+    Table lists are only mutated in place, so devices may keep references to them.
+
+    Block accesses are split only where the serving memory range changes, memory
+    devices transfer their part in one slice, other devices byte by byte through
+    their handlers.
+
+    Opcode fetches go through the separate `fetchers` table. Watchpoints swap
+    instrumented handlers into the pages they cover only, so other pages run
+    untouched (block accesses bypass watchpoints).
+    """
 
     def __init__(self):
         self.devices = {}
+        self.ranges: List[MemoryRange] = []
+        self.readers: List[Reader] = [unmapped_read] * PAGES
+        self.writers: List[Writer] = [unmapped_write] * PAGES
+        self.fetchers: List[Reader] = [unmapped_read] * PAGES
+        # page tables as decoded from memory maps, with no watchpoints
+        self.base_readers: List[Reader] = list(self.readers)
+        self.base_writers: List[Writer] = list(self.writers)
+        self.watchpoints: List[Watchpoint] = []
+        self.page_owners: List[Optional[List[Optional[object]]]] = [None] * PAGES
+        self.segments: List[Segment] = []
+        self.segment_starts: List[int] = []
+
+    def register_device(self, device, first: bool = False) -> None:
+        """
+        Adds `device` to the bus, with `first` its ranges win over the ones of
+        devices registered earlier
+        """
+        name = type(device).__name__
+        if first:
+            self.devices = {name: device, **{n: d for n, d in self.devices.items() if n != name}}
+        else:
+            self.devices.update({name: device})
+        self.remap()
+
+    def remap(self) -> None:
+        """
+        Rebuilds page table from memory maps of registered devices, ranges
+        registered first win on overlap
+        """
+        readers: List[Reader] = [unmapped_read] * PAGES
+        writers: List[Writer] = [unmapped_write] * PAGES
+        owners: List[List[Optional[object]]] = [[None] * PAGE_SIZE for _ in range(PAGES)]
+        split = {}
+
+        self.ranges = [r for device in self.devices.values() for r in device.memory_map(self)]
+        for memory_range in self.ranges:
+            for page in range(memory_range.lo >> PAGE_SHIFT, (memory_range.hi >> PAGE_SHIFT) + 1):
+                page_lo = page << PAGE_SHIFT
+                lo = max(memory_range.lo, page_lo) - page_lo
+                hi = min(memory_range.hi, page_lo + PAGE_SIZE - 1) - page_lo
+                page_owners = owners[page]
+                if lo == 0 and hi == PAGE_SIZE - 1 and page not in split and page_owners[0] is None:
+                    readers[page] = memory_range.read
+                    writers[page] = memory_range.write
+                    owners[page] = [memory_range.device] * PAGE_SIZE
+                    continue
+                if page not in split:
+                    split[page] = ([readers[page]] * PAGE_SIZE, [writers[page]] * PAGE_SIZE)
+                    owners[page] = page_owners = list(page_owners)
+                byte_readers, byte_writers = split[page]
+                for offset in range(lo, hi + 1):
+                    if page_owners[offset] is None:
+                        byte_readers[offset] = memory_range.read
+                        byte_writers[offset] = memory_range.write
+                        page_owners[offset] = memory_range.device
+
+        for page, (byte_readers, byte_writers) in split.items():
+            readers[page], writers[page] = self.split_page_handlers(byte_readers, byte_writers)
+
+        self.base_readers = readers
+        self.base_writers = writers
+        self.readers[:] = readers
+        self.writers[:] = writers
+        self.fetchers[:] = readers
+        self.page_owners[:] = [o if any(d is not None for d in o) else None for o in owners]
+        self.segments = self.resolve_segments(self.ranges)
+        self.segment_starts = [lo for lo, _, _ in self.segments]
+
+        self.instrument_pages({page for watchpoint in self.watchpoints for page in watchpoint.pages()})
+        self.notify_remapped()
+
+    def notify_remapped(self) -> None:
+        for device in self.devices.values():
+            device.bus_remapped(self)
 
-    def register_device(self, device) -> None:
-        self.devices.update({type(device).__name__: device})
+    def add_watchpoint(self, lo: int, hi: int, kind: str, callback: WatchCallback) -> Watchpoint:
+        """
+        Calls `callback(addr, value, pc)` on every `kind` ('read', 'write' or
+        'execute') access to $lo-$hi, returns handle for remove_watchpoint().
+        Addresses are matched as put on the bus: mirrors are folded by devices
+        only, so accesses through them (e.g. RAM at $0800-$1fff for a watch on
+        $0000-$07ff) need a watchpoint of their own.
+        """
+        if kind not in WATCH_KINDS:
+            raise ValueError(f'unknown watchpoint kind {kind!r}')
+        watchpoint = Watchpoint(lo, hi, kind, callback)
+        self.watchpoints.append(watchpoint)
+        self.instrument_pages(watchpoint.pages())
+        self.notify_remapped()
+        return watchpoint
+
+    def remove_watchpoint(self, watchpoint: Watchpoint) -> None:
+        self.watchpoints.remove(watchpoint)
+        self.instrument_pages(watchpoint.pages())
+        self.notify_remapped()
+
+    def set_pages(self, first_page: int, readers: List[Reader], writers: Optional[List[Writer]] = None) -> None:
+        """
+        Re-points consecutive pages to other handlers of the same device (e.g. on
+        bank switch) without remapping the whole bus
+        """
+        end = first_page + len(readers)
+        for device in self.devices.values():
+            device.pages_switching(self, first_page, len(readers))
+        self.base_readers[first_page:end] = readers
+        self.readers[first_page:end] = readers
+        self.fetchers[first_page:end] = readers
+        if writers is not None:
+            self.base_writers[first_page:end] = writers
+            self.writers[first_page:end] = writers
+        if self.watchpoints:
+            self.instrument_pages({page for watchpoint in self.watchpoints for page in watchpoint.pages()
+                                   if first_page <= page < end})
+
+    def instrument_pages(self, pages) -> None:
+        """
+        Puts base handlers of `pages` back, wrapped if the page has watchpoints
+        """
+        current_pc = self.current_pc
+        for page in pages:
+            watched = {kind: [w for w in self.watchpoints if w.kind == kind and page in w.pages()]
+                       for kind in WATCH_KINDS}
+            read, write = self.base_readers[page], self.base_writers[page]
+            self.readers[page] = watched_reader(read, watched['read'], current_pc) if watched['read'] else read
+            self.writers[page] = watched_writer(write, watched['write'], current_pc) if watched['write'] else write
+            self.fetchers[page] = watched_fetcher(read, watched['execute']) if watched['execute'] else read
+
+    def current_pc(self) -> Optional[int]:
+        cpu = self.devices.get('Cpu6502')
+        return cpu.instruction_pc() if cpu is not None else None
+
+    @staticmethod
+    def split_page_handlers(byte_readers: List[Reader], byte_writers: List[Writer]):
+
+        def read(addr: int) -> int:
+            return byte_readers[addr & 0xff](addr)
+
+        def write(addr: int, data: int) -> None:
+            byte_writers[addr & 0xff](addr, data)
+
+        return read, write
+
+    @staticmethod
+    def resolve_segments(ranges: List[MemoryRange]) -> List[Segment]:
+        """
+        Splits address space into non-overlapping spans, ranges registered first
+        win on overlap
+        """
+        segments: List[Segment] = []
+        for memory_range in ranges:
+            pieces = [(memory_range.lo, memory_range.hi)]
+            for lo, hi, _ in segments:
+                pieces = [piece for a, b in pieces for piece in ((a, min(b, lo - 1)), (max(a, hi + 1), b))
+                          if piece[0] <= piece[1]]
+            segments.extend((lo, hi, memory_range) for lo, hi in pieces)
+        return sorted(segments, key=lambda segment: segment[0])
+
+    def block_segments(self, addr: int, length: int):
+        """
+        Yields (addr, length, range) parts of the block, raises on unmapped address
+        """
+        end = addr + length
+        while addr < end:
+            index = bisect_right(self.segment_starts, addr) - 1
+            lo, hi, memory_range = self.segments[index] if index >= 0 else (0, -1, None)
+            if not lo <= addr <= hi:
+                raise NoSuchDeviceException(f'with address {hex(addr)}')
+            part = min(end, hi + 1) - addr
+            yield addr, part, memory_range
+            addr += part
+
+    def read_block(self, addr: int, length: int) -> Block:
+        """
+        `length` bytes from `addr`: a zero-copy view when the block is served by a
+        single memory device, bytes otherwise
+        """
+        parts = []
+        for part_addr, part_length, memory_range in self.block_segments(addr, length):
+            device = memory_range.device
+            if isinstance(device, AbstractMemoryDevice):
+                parts.append(device.read_block(part_addr, part_length))
+            else:
+                parts.append(bytes(memory_range.read(a) for a in range(part_addr, part_addr + part_length)))
+        if len(parts) == 1:
+            return parts[0]
+        return b''.join(parts)
+
+    def write_block(self, addr: int, data: Block) -> None:
+        data = memoryview(data).cast('B')
+        start = addr
+        for part_addr, part_length, memory_range in self.block_segments(addr, len(data)):
+            part = data[part_addr - start:part_addr - start + part_length]
+            device = memory_range.device
+            if isinstance(device, AbstractMemoryDevice):
+                device.write_block(part_addr, part)
+            else:
+                for a, value in enumerate(part, part_addr):
+                    memory_range.write(a, value)
+
+    def read(self, addr: int) -> int:
+        return self.readers[addr >> PAGE_SHIFT](addr)
+
+    def write(self, addr: int, data: int) -> None:
+        self.writers[addr >> PAGE_SHIFT](addr, data)
 
     def get_ram(self):
         device_name = 'Ram'
@@ -40,13 +279,13 @@ class Bus:
             raise NoSuchDeviceException(device_name)
         return ppu
 
-    def address_owner(self, address: c_uint16) -> AbstractMemoryDevice:
-        memory_devices = filter(lambda d: d.__class__ in AbstractMemoryDevice.__subclasses__(), self.devices.values())
-        for device_instance in memory_devices:
-            if device_instance.is_address_valid(address):
-                return device_instance
-        else:
-            raise NoSuchDeviceException(f'with address {hex(address.value)}')
+    def address_owner(self, address: Union[int, c_uint16]) -> AbstractMemoryDevice:
+        addr = getattr(address, 'value', address)
+        page_owners = self.page_owners[addr >> PAGE_SHIFT]
+        owner = page_owners[addr & 0xff] if page_owners else None
+        if owner is None:
+            raise NoSuchDeviceException(f'with address {hex(addr)}')
+        return owner
 
     def __repr__(self) -> str:
         return "Bus({i}) {d}".format(i=id(self),
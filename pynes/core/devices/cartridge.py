@@ -1,6 +1,227 @@
+import mmap
+import os
+from os import PathLike
+from typing import List, Optional, Tuple, Union
+
 from pynes.core.devices import AbstractMemoryDevice
+from pynes.core.devices.abstract_device import MemoryRange
+from pynes.core.devices.abstract_memory_device import Block
+from pynes.core.devices.ines import HEADER_SIZE, INesHeader, parse_header
+from pynes.core.devices.mappers import Mapper, mapper_for
+from pynes.core.devices.mappers.mapper import CHR_SIZE, PRG_ADDRESS
+from pynes.core.devices.ppu.nametable import Mirroring, PpuNametable
+from pynes.core.devices.save_ram import SaveRam
+from pynes.core.exceptions import InvalidRomException, OutOfRangeMemoryException
+
+PRG_RAM_ADDRESS: int = 0x6000
+PRG_RAM_SIZE:    int = 0x2000
+TRAINER_ADDRESS: int = 0x7000
 
 
 class Cartridge(AbstractMemoryDevice):
+    """
+    Blank cartridge is plain memory over $4020-$ffff. Loaded one keeps the file
+    image (mmap'd when possible) and exposes PRG-ROM, CHR-ROM and trainer as
+    memoryview slices of it. Its mapper serves CPU $8000-$ffff and, once
+    connected with connect_to_ppu(), PPU $0000-$1fff. PRG-RAM at $6000-$7fff
+    is a buffer of its own, memory-mapped .sav file for cartridges with battery.
+    CPU $4020-$5fff stays plain memory.
+    """
     min_address = 0x4020
     max_address = 0xffff
+
+    def __init__(self, header: Optional[INesHeader] = None, image: Optional[Block] = None,
+                 save_path: Optional[Union[str, PathLike]] = None):
+        super().__init__()
+        self.header = header
+        self.image = image
+        self.prg_rom: Optional[memoryview] = None
+        self.chr_rom: Optional[memoryview] = None
+        self.trainer: Optional[memoryview] = None
+        self.prg_ram: Optional[memoryview] = None
+        self.save_ram: Optional[SaveRam] = None
+        self.mapper: Optional[Mapper] = None
+        self.ppu_bus = None
+        if header is not None:
+            if header.battery and save_path is not None:
+                self.save_ram = SaveRam(save_path, PRG_RAM_SIZE)
+                self.prg_ram = self.save_ram.memory
+            else:
+                self.prg_ram = memoryview(bytearray(PRG_RAM_SIZE))
+            self.slice_image(header, memoryview(image))
+            self.mapper = mapper_for(self)
+
+    @classmethod
+    def from_file(cls, path: Union[str, PathLike], save_path: Optional[Union[str, PathLike]] = None) -> 'Cartridge':
+        """
+        Loads .nes file, battery-backed PRG-RAM is kept in `save_path`, by
+        default the .sav file next to the ROM
+        """
+        with open(path, 'rb') as rom_io:
+            try:
+                image = mmap.mmap(rom_io.fileno(), 0, access=mmap.ACCESS_READ)
+            except (ValueError, OSError):
+                # empty files and some file systems can't be mapped
+                image = rom_io.read()
+        return cls.from_bytes(image, save_path or os.path.splitext(path)[0] + '.sav')
+
+    @classmethod
+    def from_bytes(cls, image: Block, save_path: Optional[Union[str, PathLike]] = None) -> 'Cartridge':
+        return cls(parse_header(image[:HEADER_SIZE]), image, save_path)
+
+    def flush(self) -> None:
+        """
+        Writes battery-backed PRG-RAM to its save file
+        """
+        if self.save_ram is not None:
+            self.save_ram.flush()
+
+    def maybe_flush(self) -> None:
+        if self.save_ram is not None:
+            self.save_ram.maybe_flush()
+
+    def close(self) -> None:
+        """
+        Writes back and closes the save file and the mapped ROM image, the
+        cartridge can't be used afterwards. Views from read_block() have to be
+        dropped first: a file with views of it left stays mapped until they
+        are gone (see SaveRam.close()).
+        """
+        if self.save_ram is not None:
+            self.save_ram.close()
+        # an mmap can only be closed once no view of it is left
+        views = [self.prg_rom, self.chr_rom, self.trainer]
+        if self.mapper is not None:
+            views += self.mapper.prg_banks + self.mapper.chr_banks
+        for view in views:
+            if view is not None:
+                view.release()
+        if isinstance(self.image, mmap.mmap):
+            try:
+                self.image.close()
+            except BufferError:
+                pass
+
+    def __enter__(self) -> 'Cartridge':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    @property
+    def mirroring(self) -> Optional[Mirroring]:
+        return self.mapper.mirroring if self.mapper else None
+
+    def slice_image(self, header: INesHeader, image: memoryview) -> None:
+        if len(image) < header.file_size:
+            raise InvalidRomException(f'file is {len(image)} bytes, header needs {header.file_size}')
+        if not header.prg_rom_size:
+            raise InvalidRomException('no PRG-ROM')
+        offset = HEADER_SIZE
+        if header.trainer:
+            self.trainer = image[offset:offset + header.trainer_size]
+            offset += header.trainer_size
+            self.write_block(TRAINER_ADDRESS, self.trainer)
+        self.prg_rom = image[offset:offset + header.prg_rom_size]
+        offset += header.prg_rom_size
+        self.chr_rom = image[offset:offset + header.chr_rom_size]
+
+    def connect_to_ppu(self, ppu) -> None:
+        """
+        Maps CHR into pattern table space of `ppu`, over its own pattern memory,
+        lays out its nametables by mirroring of the mapper and lets mappers with
+        a scanline counter see rendered scanlines
+        """
+        self.ppu_bus = ppu.internal_bus
+        self.ppu_bus.register_device(self, first=True)
+        nametable = self.nametable()
+        if nametable is not None and self.mapper is not None:
+            nametable.set_mirroring(self.mapper.mirroring)
+        ppu.scanline_callback = getattr(self.mapper, 'scanline', None)
+
+    def nametable(self) -> Optional[PpuNametable]:
+        return self.ppu_bus.devices.get('PpuNametable') if self.ppu_bus is not None else None
+
+    def banked_view(self, addr: int) -> Tuple[Optional[memoryview], int, int]:
+        """
+        Bank serving `addr` (PPU addresses are below $2000), offset into it and
+        bank size, (None, addr, 0) for plain memory
+        """
+        if self.mapper is not None:
+            if addr < CHR_SIZE:
+                return self.mapper.chr_view(addr) + (self.mapper.chr_window_size,)
+            if addr >= PRG_ADDRESS:
+                return self.mapper.prg_view(addr) + (self.mapper.prg_window_size,)
+        if self.prg_ram is not None and PRG_RAM_ADDRESS <= addr < PRG_ADDRESS:
+            return self.prg_ram, addr - PRG_RAM_ADDRESS, PRG_RAM_SIZE
+        return None, addr, 0
+
+    def is_address_valid(self, addr: int) -> bool:
+        if self.mapper is not None and 0 <= addr < CHR_SIZE:
+            return True
+        return super().is_address_valid(addr)
+
+    def read(self, addr: int, read_only: bool = False) -> int:
+        bank, offset, _ = self.banked_view(addr)
+        if bank is not None:
+            return bank[offset]
+        return super().read(addr, read_only)
+
+    def write(self, addr: int, data: int) -> None:
+        bank, offset, _ = self.banked_view(addr)
+        if bank is None:
+            super().write(addr, data)
+        elif addr >= PRG_ADDRESS:
+            self.mapper.write_register(addr, data)
+        elif addr >= PRG_RAM_ADDRESS or self.mapper.chr_writable:
+            bank[offset] = data
+
+    def read_block(self, addr: int, length: int) -> Block:
+        bank, offset, size = self.banked_view(addr)
+        if bank is None:
+            return super().read_block(addr, length)
+        if length < 0 or not self.is_address_valid(addr + max(length - 1, 0)):
+            raise OutOfRangeMemoryException(f'block {hex(addr)}+{hex(length)} in {type(self).__name__}')
+        if offset + length <= size:
+            return bank[offset:offset + length]
+        head = size - offset
+        return bytes(bank[offset:]) + bytes(self.read_block(addr + head, length - head))
+
+    def write_block(self, addr: int, data: Block) -> None:
+        """
+        Stores into plain memory, PRG-RAM and CHR-RAM, PRG-ROM ignores blocks
+        """
+        bank, offset, size = self.banked_view(addr)
+        if bank is None:
+            if self.prg_ram is not None:
+                head = min(len(data), max(PRG_RAM_ADDRESS - addr, 0))
+                data, rest = data[:head], data[head:]
+                if len(rest):
+                    self.write_block(addr + head, rest)
+            if len(data):
+                super().write_block(addr, data)
+        elif PRG_RAM_ADDRESS <= addr < PRG_ADDRESS or (addr < CHR_SIZE and self.mapper.chr_writable):
+            head = min(len(data), size - offset)
+            bank[offset:offset + head] = data[:head]
+            if head < len(data):
+                self.write_block(addr + head, data[head:])
+
+    def memory_map(self, bus) -> List[MemoryRange]:
+        if bus is self.ppu_bus:
+            return self.mapper.ppu_ranges() if self.mapper else []
+        ranges = self.mapper.cpu_ranges() if self.mapper else []
+        if self.prg_ram is not None:
+            ranges.append(self.prg_ram_range())
+        # ranges listed first win, so plain memory is left for $4020-$5fff
+        return ranges + super().memory_map(bus)
+
+    def prg_ram_range(self) -> MemoryRange:
+        prg_ram = self.prg_ram
+
+        def read(addr: int) -> int:
+            return prg_ram[addr - PRG_RAM_ADDRESS]
+
+        def write(addr: int, data: int) -> None:
+            prg_ram[addr - PRG_RAM_ADDRESS] = data
+
+        return MemoryRange(PRG_RAM_ADDRESS, PRG_ADDRESS - 1, read, write, self)
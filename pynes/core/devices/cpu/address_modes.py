@@ -1,182 +1,169 @@
-from ctypes import c_uint8, c_uint16
+ADDR_MODE_EXIT_SUCCESS:        int = 0
+ADDR_MODE_EXIT_ADD_CYCLE_NEED: int = 1
 
-ADDR_MODE_EXIT_SUCCESS:        c_uint8 = c_uint8(0)
-ADDR_MODE_EXIT_ADD_CYCLE_NEED: c_uint8 = c_uint8(0)
 
-
-def am_imp(cpu) -> c_uint8:
+def am_imp(cpu) -> int:
     """
     Implicit/Accumulator Addressing
     :param cpu:
     :return:
     """
-    cpu.fetched.value = cpu.a.value
+    cpu._fetched = cpu._a
     return ADDR_MODE_EXIT_SUCCESS
 
 
-def am_imm(cpu) -> c_uint8:
+def am_imm(cpu) -> int:
     """
     Immediate Addressing
     :param cpu:
     :return:
     """
-    cpu.addr_abs.value = cpu.pc.value
-    cpu.pc.value += 1
+    cpu._addr_abs = cpu._pc
+    cpu._pc = (cpu._pc + 1) & 0xffff
     return ADDR_MODE_EXIT_SUCCESS
 
 
-def am_zp0(cpu) -> c_uint8:
+def am_zp0(cpu) -> int:
     """
     Zero Page Addressing
     :param cpu:
     :return:
     """
-    cpu.addr_abs.value = cpu.read(cpu.pc).value
-    cpu.pc.value += 1
-    cpu.addr_abs.value &= 0x00FF  # get 00 page with FF offset
+    cpu._addr_abs = cpu.read(cpu._pc)  # get 00 page with FF offset
+    cpu._pc = (cpu._pc + 1) & 0xffff
     return ADDR_MODE_EXIT_SUCCESS
 
 
-def am_zpx(cpu) -> c_uint8:
+def am_zpx(cpu) -> int:
     """
     Zero Page with X offset Addressing
     :param cpu:
     :return:
     """
-    cpu.addr_abs.value = c_uint16(cpu.read(cpu.pc).value + cpu.x.value).value
-    cpu.pc.value += 1
-    cpu.addr_abs.value &= 0x00FF  # get 00 page with FF offset
+    cpu._addr_abs = (cpu.read(cpu._pc) + cpu._x) & 0x00FF  # get 00 page with FF offset
+    cpu._pc = (cpu._pc + 1) & 0xffff
     return ADDR_MODE_EXIT_SUCCESS
 
 
-def am_zpy(cpu) -> c_uint8:
+def am_zpy(cpu) -> int:
     """
     Zero Page with Y offset Addressing
     :param cpu:
     :return:
     """
-    cpu.addr_abs.value = c_uint16(cpu.read(cpu.pc).value + cpu.y.value).value
-    cpu.pc.value += 1
-    cpu.addr_abs.value &= 0x00FF  # get 00 page with FF offset
+    cpu._addr_abs = (cpu.read(cpu._pc) + cpu._y) & 0x00FF  # get 00 page with FF offset
+    cpu._pc = (cpu._pc + 1) & 0xffff
     return ADDR_MODE_EXIT_SUCCESS
 
 
-def am_abs(cpu) -> c_uint8:
+def am_abs(cpu) -> int:
     """
     Absolute Addressing
     :param cpu:
     :return:
     """
-    lo = cpu.read(cpu.pc)
-    cpu.pc.value += 1
-    hi = cpu.read(cpu.pc)
-    cpu.pc.value += 1
+    lo = cpu.read(cpu._pc)
+    hi = cpu.read((cpu._pc + 1) & 0xffff)
+    cpu._pc = (cpu._pc + 2) & 0xffff
 
-    cpu.addr_abs.value = c_uint16((hi.value << 8) | lo.value).value
+    cpu._addr_abs = (hi << 8) | lo
 
     return ADDR_MODE_EXIT_SUCCESS
 
 
-def am_abx(cpu) -> c_uint8:
+def am_abx(cpu) -> int:
     """
     Absolute with X offset Addressing
     :param cpu:
     :return:
     """
-    lo = cpu.read(cpu.pc)
-    cpu.pc.value += 1
-    hi = cpu.read(cpu.pc)
-    cpu.pc.value += 1
+    lo = cpu.read(cpu._pc)
+    hi = cpu.read((cpu._pc + 1) & 0xffff)
+    cpu._pc = (cpu._pc + 2) & 0xffff
 
-    cpu.addr_abs.value = c_uint16(((hi.value << 8) | lo.value) + cpu.x.value).value
+    cpu._addr_abs = (((hi << 8) | lo) + cpu._x) & 0xffff
 
-    return ADDR_MODE_EXIT_SUCCESS if (cpu.addr_abs.value & 0xFF00) == (hi.value << 8) else ADDR_MODE_EXIT_ADD_CYCLE_NEED
+    return ADDR_MODE_EXIT_SUCCESS if (cpu._addr_abs & 0xFF00) == (hi << 8) else ADDR_MODE_EXIT_ADD_CYCLE_NEED
 
 
-def am_aby(cpu) -> c_uint8:
+def am_aby(cpu) -> int:
     """
     Absolute with Y offset Addressing
     :param cpu:
     :return:
     """
-    lo = cpu.read(cpu.pc)
-    cpu.pc.value += 1
-    hi = cpu.read(cpu.pc)
-    cpu.pc.value += 1
+    lo = cpu.read(cpu._pc)
+    hi = cpu.read((cpu._pc + 1) & 0xffff)
+    cpu._pc = (cpu._pc + 2) & 0xffff
 
-    cpu.addr_abs.value = c_uint16(((hi.value << 8) | lo.value) + cpu.y.value).value
+    cpu._addr_abs = (((hi << 8) | lo) + cpu._y) & 0xffff
 
-    return ADDR_MODE_EXIT_SUCCESS if (cpu.addr_abs.value & 0xFF00) == (hi.value << 8) else ADDR_MODE_EXIT_ADD_CYCLE_NEED
+    return ADDR_MODE_EXIT_SUCCESS if (cpu._addr_abs & 0xFF00) == (hi << 8) else ADDR_MODE_EXIT_ADD_CYCLE_NEED
 
 
-def am_ind(cpu) -> c_uint8:
+def am_ind(cpu) -> int:
     """
     Indirect Addressing
     :param cpu:
     :return:
     """
-    ptr_lo = cpu.read(cpu.pc)
-    cpu.pc.value += 1
-    ptr_hi = cpu.read(cpu.pc)
-    cpu.pc.value += 1
+    ptr_lo = cpu.read(cpu._pc)
+    ptr_hi = cpu.read((cpu._pc + 1) & 0xffff)
+    cpu._pc = (cpu._pc + 2) & 0xffff
 
-    ptr = c_uint16((ptr_hi.value << 8) | ptr_lo.value)
+    ptr = (ptr_hi << 8) | ptr_lo
 
     # Page boundary hardware bug else normal behaviour
-    if ptr_lo.value == 0x00ff:
-        cpu.addr_abs.value = c_uint16((cpu.read(c_uint16(ptr.value & 0xFF00)).value << 8) | cpu.read(ptr).value).value
+    if ptr_lo == 0x00ff:
+        cpu._addr_abs = (cpu.read(ptr & 0xFF00) << 8) | cpu.read(ptr)
     else:
-        cpu.addr_abs.value = c_uint16((cpu.read(c_uint16(ptr.value + 1)).value << 8) | cpu.read(ptr).value).value
+        cpu._addr_abs = (cpu.read(ptr + 1) << 8) | cpu.read(ptr)
 
     return ADDR_MODE_EXIT_SUCCESS
 
 
-def am_izx(cpu) -> c_uint8:
+def am_izx(cpu) -> int:
     """
     Indirect X Addressing
     :param cpu:
     :return:
     """
-    t = cpu.read(cpu.pc)
-    cpu.pc.value += 1
+    t = cpu.read(cpu._pc)
+    cpu._pc = (cpu._pc + 1) & 0xffff
 
-    lo = cpu.read(c_uint16(
-        (t.value + c_uint16(cpu.x.value).value) & 0x00FF)
-    )
-    hi = cpu.read(c_uint16(
-        (t.value + c_uint16(cpu.x.value).value + 1) & 0x00FF)
-    )
+    lo = cpu.read((t + cpu._x) & 0x00FF)
+    hi = cpu.read((t + cpu._x + 1) & 0x00FF)
 
-    cpu.addr_abs.value = c_uint16((hi.value << 8) | lo.value).value
+    cpu._addr_abs = (hi << 8) | lo
 
     return ADDR_MODE_EXIT_SUCCESS
 
 
-def am_izy(cpu) -> c_uint8:
+def am_izy(cpu) -> int:
     """
     Indirect Y Addressing
     :param cpu:
     :return:
     """
-    t = cpu.read(cpu.pc)
-    cpu.pc.value += 1
+    t = cpu.read(cpu._pc)
+    cpu._pc = (cpu._pc + 1) & 0xffff
 
-    lo = cpu.read(c_uint16(t.value & 0x00FF))
-    hi = cpu.read(c_uint16((t.value + 1) & 0x00FF))
+    lo = cpu.read(t & 0x00FF)
+    hi = cpu.read((t + 1) & 0x00FF)
 
-    cpu.addr_abs.value = c_uint16(((hi.value << 8) | lo.value) + cpu.y.value).value
+    cpu._addr_abs = (((hi << 8) | lo) + cpu._y) & 0xffff
 
-    return ADDR_MODE_EXIT_SUCCESS if (cpu.addr_abs.value & 0xFF00) == (hi.value << 8) else ADDR_MODE_EXIT_ADD_CYCLE_NEED
+    return ADDR_MODE_EXIT_SUCCESS if (cpu._addr_abs & 0xFF00) == (hi << 8) else ADDR_MODE_EXIT_ADD_CYCLE_NEED
 
 
-def am_rel(cpu) -> c_uint8:
+def am_rel(cpu) -> int:
     """
     Relative Addressing
     :param cpu:
     :return:
     """
-    cpu.addr_rel.value = cpu.read(cpu.pc).value
-    cpu.pc.value += 1
-    if cpu.addr_rel.value & 0x80:
-        cpu.addr_rel.value |= 0xFF00
+    cpu._addr_rel = cpu.read(cpu._pc)
+    cpu._pc = (cpu._pc + 1) & 0xffff
+    if cpu._addr_rel & 0x80:
+        cpu._addr_rel |= 0xFF00
     return ADDR_MODE_EXIT_SUCCESS
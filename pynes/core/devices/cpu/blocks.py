@@ -0,0 +1,92 @@
+"""
+Basic block translation for Cpu6502.
+
+A block is straight code from an entry pc up to the first instruction which
+changes the flow (branch, JMP, JSR, RTS, RTI, BRK) or writes through the bus,
+within one page. It is compiled into one Python function out of the same
+sources the opcode handlers are generated from (see handlers), with operand
+bytes put in as constants, so there is no fetch and no dispatch inside.
+
+Between instructions the function counts cycles into `cpu.total_cycles` and
+leaves as soon as the slice ends, so devices see the same time and slices end
+at the same instructions as with the interpreter. A write ends the block, so a
+bank switch or a store into the code itself is always noticed before the next
+instruction.
+
+Blocks are kept by (entry pc, page reader). Every PRG bank mapped into a window
+has a reader of its own, so code of a bank switched out stays cached for when
+it comes back. Writable pages are watched by Cpu6502 for stores into translated
+code.
+"""
+from typing import Callable, NamedTuple, Optional
+
+from pynes.core.devices.cpu.handlers import (
+    HANDLER_NAMESPACE, body_source, cycles_source, indent, inline_bus_access, prologue_source,
+)
+from pynes.core.devices.cpu.instructions import OPCODE_TABLE, OPERAND_SIZES
+
+# instruction count limit of a block
+MAX_BLOCK_INSTRUCTIONS: int = 32
+# entries into a pc before code from there is translated
+TRANSLATE_THRESHOLD: int = 8
+
+BLOCK_ENDS = ('BCC', 'BCS', 'BNE', 'BEQ', 'BPL', 'BMI', 'BVC', 'BVS', 'JMP', 'JSR', 'RTS', 'RTI', 'BRK')
+
+
+class TranslatedBlock(NamedTuple):
+    # run(cpu) executes the block, True when it got to its end
+    run: Callable[[object], bool]
+    last_pc: int
+    last_opcode: int
+
+
+def instruction_source(opcode: int, pc: int, operand: bytes, direct_ram: bool) -> str:
+    """
+    Body of the instruction at `pc` with its operand bytes as constants, leaves
+    taken cycles in `cycles`
+    """
+    instruction = OPCODE_TABLE[opcode]
+    source = body_source(instruction)
+    if len(operand) > 0:
+        source = source.replace('read(pc)', '0x{:02x}'.format(operand[0]))
+    if len(operand) > 1:
+        source = source.replace('read((pc + 1) & 0xffff)', '0x{:02x}'.format(operand[1]))
+    source = inline_bus_access(source, direct_ram)
+    prologue = 'pc = 0x{:04x}\n'.format((pc + 1) & 0xffff)
+    if 'writers[' in source:
+        # a device written to may look at the instruction (e.g. OAM DMA at its cycles)
+        prologue += 'cpu._opcode = 0x{:02x}\ncpu._pc = pc\n'.format(opcode)
+    return prologue + source + 'cpu.total_cycles += ' + cycles_source(instruction) + '\n'
+
+
+def translate_block(cpu, start: int, direct_ram: bool) -> Optional[TranslatedBlock]:
+    """
+    Compiles the block at `start` read from the current mapping, None if not
+    even its first instruction fits in the page
+    """
+    page = start >> 8
+    pc, parts, last_pc, last_opcode = start, [], start, 0
+    while len(parts) < MAX_BLOCK_INSTRUCTIONS:
+        opcode = cpu.read(pc, True)
+        instruction = OPCODE_TABLE[opcode]
+        size = 1 + OPERAND_SIZES[instruction.addr_mode]
+        if (pc + size - 1) >> 8 != page:
+            break
+        operand = bytes(cpu.read(pc + i, True) for i in range(1, size))
+        source = instruction_source(opcode, pc, operand, direct_ram)
+        last_pc, last_opcode = pc, opcode
+        pc += size
+        if instruction.name in BLOCK_ENDS or 'writers[' in source:
+            parts.append(source)
+            break
+        parts.append(source + 'if cpu.total_cycles >= cpu.slice_end:\n    cpu._pc = 0x{:04x}\n    return False\n'
+                     .format(pc & 0xffff))
+    if not parts:
+        return None
+    body = ''.join(parts)
+    prologue = prologue_source(body)
+    name = 'block_{:04x}'.format(start)
+    source = 'def {name}(cpu):\n{body}'.format(name=name, body=indent(prologue + body + 'cpu._pc = pc\nreturn True'))
+    namespace = dict(HANDLER_NAMESPACE)
+    exec(compile(source, '<cpu6502 block ${:04x}>'.format(start), 'exec'), namespace)
+    return TranslatedBlock(namespace[name], last_pc, last_opcode)
@@ -1,212 +1,478 @@
-from ctypes import c_uint8, c_uint16
-from typing import Dict, List
+from typing import Callable, Dict, List, Optional, Tuple, Union
 
 from pynes.core.exceptions import NoSuchDeviceException
-from pynes.core.devices import AbstractDevice
+from pynes.core.devices import AbstractDevice, AbstractMemoryDevice
+from pynes.core.devices.abstract_memory_device import Block
 from pynes.core.devices.cpu import address_modes as ams
-from pynes.core.devices.cpu.utils import get_mask
-from pynes.core.devices.cpu.instructions import opcode_instruction_mapping, instruction_by_opcode
+from pynes.core.devices.cpu.blocks import TRANSLATE_THRESHOLD, TranslatedBlock, translate_block
+from pynes.core.devices.cpu.handlers import FUSED_HANDLERS, FUSED_RAM_HANDLERS, HANDLERS, RAM_HANDLERS, Handler
+from pynes.core.devices.cpu.idle_loops import LOOP_OPCODES, NO_LOOP_OPCODES, IdleLoop, find_idle_loop
+from pynes.core.devices.cpu.instructions import OPCODE_TABLE
+from pynes.core.devices.cpu.registers import register_property
+from pynes.core.devices.cpu.utils import FLAG_MASKS, FLAG_B, FLAG_I, FLAG_U
+from pynes.core.devices.mappers.mapper import PRG_ADDRESS
+
+PPU_DOTS_PER_FRAME: int = 341 * 262
 
 
 class Cpu6502(AbstractDevice):
+    """
+    Registers are stored as plain masked ints in slots (`_pc`, `_a`, ...), that is
+    the fast path used by instructions and addressing modes. Public `pc`, `a`, ...
+    properties give `.value` compatible access to them.
+    """
     INIT_VALUE_PC: int = 0x0000
     INIT_VALUE_SP: int = 0x00
     INIT_VALUE_REG: int = 0x00
     INIT_VALUE_STATUS: bool = False
 
+    __slots__ = ('_pc', '_sp', '_a', '_x', '_y', '_status',
+                 '_fetched', '_addr_abs', '_addr_rel', '_opcode', '_cycles',
+                 'total_cycles', 'slice_end', 'skip_idle_loops', 'idle_loops',
+                 'translate_blocks', 'blocks', 'block_entries', 'code_page_traps', '_fuse_instructions',
+                 'lookup', 'handlers', 'readers', 'writers', 'fetchers', 'ram')
+
+    pc = register_property('_pc', 0xffff)
+    sp = register_property('_sp', 0xff)
+    a = register_property('_a', 0xff)
+    x = register_property('_x', 0xff)
+    y = register_property('_y', 0xff)
+    status = register_property('_status', 0xff)
+    fetched = register_property('_fetched', 0xff)
+    addr_abs = register_property('_addr_abs', 0xffff)
+    addr_rel = register_property('_addr_rel', 0xffff)
+    opcode = register_property('_opcode', 0xff)
+    cycles = register_property('_cycles', 0xff)
+
     def __init__(self):
         super().__init__()
         # 6502 INTERNALS BEGIN
-        self.pc = c_uint16(Cpu6502.INIT_VALUE_PC)  # program counter
-        self.sp = c_uint8(Cpu6502.INIT_VALUE_SP)  # stack pointer
+        self._pc = Cpu6502.INIT_VALUE_PC  # program counter
+        self._sp = Cpu6502.INIT_VALUE_SP  # stack pointer
         # registers
-        self.a = c_uint8(Cpu6502.INIT_VALUE_REG)  # accumulator
-        self.x = c_uint8(Cpu6502.INIT_VALUE_REG)
-        self.y = c_uint8(Cpu6502.INIT_VALUE_REG)
-        self.status = c_uint8(0x00)
+        self._a = Cpu6502.INIT_VALUE_REG  # accumulator
+        self._x = Cpu6502.INIT_VALUE_REG
+        self._y = Cpu6502.INIT_VALUE_REG
+        self._status = 0x00
         # 6502 INTERNALS END
-        self.fetched = c_uint8(0x00)
-        self.addr_abs = c_uint16(0x0000)
-        self.addr_rel = c_uint16(0x00)
-        self.opcode = c_uint8(0x00)
-        self.cycles = c_uint8(0)
-
-        self.lookup = opcode_instruction_mapping(self)
+        self._fetched = 0x00
+        self._addr_abs = 0x0000
+        self._addr_rel = 0x0000
+        self._opcode = 0x00
+        self._cycles = 0
+        # cycles elapsed since power up, never reset
+        self.total_cycles = 0
+        # run_until() stops once total_cycles reaches it, see end_slice()
+        self.slice_end = 0
+        # run_until() skips iterations of idle loops, off for exact instruction traces
+        self.skip_idle_loops = True
+        # idle loops by address of their closing branch, None for loops which are not idle
+        self.idle_loops: Dict[int, Optional[IdleLoop]] = {}
+        # run_until() runs translated basic blocks (see blocks), off by default
+        self.translate_blocks = False
+        # blocks by (entry pc, page reader), None where there is nothing to translate
+        self.blocks: Dict[Tuple[int, Callable], Optional[TranslatedBlock]] = {}
+        self.block_entries: Dict[Tuple[int, Callable], int] = {}
+        # (wrapped, original) write handlers of pages with translated code, the
+        # wrapped one drops blocks of the code it stores into
+        self.code_page_traps: Dict[int, Tuple[Callable, Callable]] = {}
+        # see fuse_instructions
+        self._fuse_instructions = False
+
+        self.lookup = OPCODE_TABLE
+        self.handlers = HANDLERS
+        # page tables of the bus, see Bus
+        self.readers = None
+        self.writers = None
+        self.fetchers = None
+        # internal RAM buffer for RAM_HANDLERS, None while it is not directly mapped
+        self.ram = None
 
     def reset(self) -> None:
-        self.addr_abs.value = 0xfffc
-        lo = self.read(c_uint16(self.addr_abs.value + 0))
-        hi = self.read(c_uint16(self.addr_abs.value + 1))
+        self._addr_abs = 0xfffc
+        lo = self.read(self._addr_abs + 0)
+        hi = self.read(self._addr_abs + 1)
 
-        self.pc.value = (hi.value << 8) | lo.value
+        self._pc = (hi << 8) | lo
 
-        self.a.value = self.x.value = self.y.value = 0
-        self.sp.value = 0xfd
-        self.status.value = 0x00 | get_mask('u')
+        self._a = self._x = self._y = 0
+        self._sp = 0xfd
+        # IRQ stays masked until the program clears I
+        self._status = FLAG_U | FLAG_I
 
-        self.addr_rel.value = 0x0000
-        self.addr_abs.value = 0x0000
-        self.fetched.value = 0x00
+        self._addr_rel = 0x0000
+        self._addr_abs = 0x0000
+        self._fetched = 0x00
 
-        self.cycles.value = 8
+        self._cycles = 8
 
     def clock(self) -> None:
-        if self.cycles.value == 0:
-            self.opcode.value = self.read(self.pc).value
-
-            self.set_flag('u', True)
-
-            self.pc.value += 1
-
-            curr_inst = instruction_by_opcode(opcode=self.opcode.value,
-                                              cpu=self)
-            self.cycles.value = curr_inst.cycles.value
-
-            add_cycle_1 = curr_inst.addr_mode(self)
-            add_cycle_2 = curr_inst.operate()
-            self.cycles.value += (add_cycle_1.value & add_cycle_2.value)
-
-            self.set_flag('u', True)
-
-        self.cycles.value -= 1
+        if self._cycles == 0:
+            self._opcode = self.fetchers[self._pc >> 8](self._pc)
+            self._pc = (self._pc + 1) & 0xffff
+            total_cycles = self.total_cycles
+            # no fused pair, the instruction is spent clock by clock
+            self.slice_end = total_cycles
+            self._cycles = self.handlers[self._opcode](self)
+            # stalls charged by the instruction (see stall()) are spent clock by clock here
+            self._cycles += self.total_cycles - total_cycles
+            self.total_cycles = total_cycles
+
+        self._cycles -= 1
+        self.total_cycles += 1
+
+    def step(self) -> int:
+        """
+        Executes the whole next instruction (finishing the current one first if
+        clock() was used in between) and returns the amount of cycles spent
+        """
+        start = self.total_cycles
+        self.total_cycles += self._cycles
+        self._cycles = 0
+
+        self._opcode = self.fetchers[self._pc >> 8](self._pc)
+        self._pc = (self._pc + 1) & 0xffff
+        # exactly one instruction, fused handlers do not go on to the next one
+        self.slice_end = self.total_cycles
+        # handler may charge a stall, so its cycles are added after the call
+        cycles = self.handlers[self._opcode](self)
+        self.total_cycles += cycles
+        return self.total_cycles - start
+
+    def instruction_pc(self) -> int:
+        """
+        Address of the opcode being executed, valid while a handler runs
+        """
+        return (self._pc - 1) & 0xffff
+
+    def stall(self, cycles: int) -> None:
+        """
+        Charges `cycles` the CPU is halted for (e.g. by DMA) as one lump
+        """
+        self.total_cycles += cycles
+
+    def run_cycles(self, cycles: int) -> int:
+        """
+        Runs whole instructions until at least `cycles` cycles are spent, returns
+        the actual amount (the last instruction may overrun the budget)
+        """
+        return self.run_until(max_cycles=cycles)
+
+    def run_until(self, pc: Optional[int] = None, max_cycles: Optional[int] = None) -> int:
+        """
+        Runs whole instructions until program counter reaches `pc` or
+        `max_cycles` budget is spent, returns the amount of spent cycles
+        """
+        start = self.total_cycles
+        self.total_cycles += self._cycles
+        self._cycles = 0
+
+        stop_pc = -1 if pc is None else pc
+        self.slice_end = float('inf') if max_cycles is None else start + max_cycles
+        handlers = self.handlers
+        fetchers = self.fetchers
+        idle_loops = self.idle_loops
+        # a loop with the stop pc in it must not be skipped over
+        loop_opcodes = LOOP_OPCODES if self.skip_idle_loops and pc is None else NO_LOOP_OPCODES
+        # blocks are generated from the same sources as the handlers and
+        # bypass watched fetches, a stop pc could be in the middle of one
+        if self.translate_blocks and self.is_generated(handlers) and pc is None and not self.bus.watchpoints:
+            self.run_blocks(loop_opcodes)
+            return self.total_cycles - start
+        if pc is not None:
+            # nor may it be the second instruction of a fused pair
+            handlers = self.unfused_handlers()
+        while self.total_cycles < self.slice_end:
+            opcode_pc = self._pc
+            if opcode_pc == stop_pc:
+                break
+            self._opcode = opcode = fetchers[opcode_pc >> 8](opcode_pc)
+            self._pc = (opcode_pc + 1) & 0xffff
+            cycles = handlers[opcode](self)
+            self.total_cycles += cycles
+            if loop_opcodes[opcode] and self._pc <= opcode_pc and idle_loops.get(opcode_pc, True) is not None:
+                self.skip_idle_loop(opcode_pc)
+        return self.total_cycles - start
+
+    def run_blocks(self, loop_opcodes: List[bool]) -> None:
+        """
+        run_until() loop over translated blocks, code entered less than
+        TRANSLATE_THRESHOLD times is interpreted
+        """
+        handlers = self.handlers
+        fetchers = self.fetchers
+        idle_loops = self.idle_loops
+        blocks = self.blocks
+        entries = self.block_entries
+        while self.total_cycles < self.slice_end:
+            opcode_pc = self._pc
+            key = (opcode_pc, fetchers[opcode_pc >> 8])
+            block = blocks.get(key)
+            if block is None and key not in blocks:
+                entries[key] = count = entries.get(key, 0) + 1
+                if count >= TRANSLATE_THRESHOLD:
+                    block = blocks[key] = self.translate(opcode_pc)
+            if block is not None:
+                if not block.run(self):
+                    continue
+                opcode_pc, opcode = block.last_pc, block.last_opcode
+            else:
+                self._opcode = opcode = key[1](opcode_pc)
+                self._pc = (opcode_pc + 1) & 0xffff
+                # handler may charge a stall (or a fused instruction), so its cycles are added after the call
+                cycles = handlers[opcode](self)
+                self.total_cycles += cycles
+            if loop_opcodes[opcode] and self._pc <= opcode_pc and idle_loops.get(opcode_pc, True) is not None:
+                self.skip_idle_loop(opcode_pc)
+
+    def translate(self, pc: int) -> Optional[TranslatedBlock]:
+        """
+        Translates the block at `pc`, None for code outside of memory devices
+        (or in zero page and stack, which RAM_HANDLERS write past the bus)
+        """
+        aliases = self.page_aliases(pc >> 8)
+        if not aliases:
+            return None
+        block = translate_block(self, pc, self.ram is not None)
+        if block is not None and not self.is_rom_page(pc >> 8):
+            for page in aliases:
+                self.trap_code_writes(page, aliases)
+        return block
+
+    def page_aliases(self, page: int) -> List[int]:
+        """
+        Pages of the CPU bus with the same memory as `page`, empty if code
+        from there is not translated
+        """
+        owners = self.bus.page_owners[page]
+        owner = owners[0] if owners is not None and owners.count(owners[0]) == len(owners) else None
+        if not isinstance(owner, AbstractMemoryDevice):
+            return []
+        ram = self.bus.devices.get('Ram')
+        if owner is not ram:
+            return [page]
+        mirror = ram.size_memory >> 8
+        if page % mirror < 2:
+            return []
+        return list(range(page % mirror, (ram.max_address >> 8) + 1, mirror))
+
+    def is_rom_page(self, page: int) -> bool:
+        """
+        True for PRG-ROM of a mapper, where writes go to its registers
+        """
+        cartridge = self.bus.devices.get('Cartridge')
+        if cartridge is None or cartridge.mapper is None or page < PRG_ADDRESS >> 8:
+            return False
+        return self.bus.page_owners[page][0] is cartridge
+
+    def trap_code_writes(self, page: int, aliases: List[int]) -> None:
+        if page in self.code_page_traps:
+            return
+        write = self.writers[page]
+
+        def trap(addr: int, data: int) -> None:
+            write(addr, data)
+            self.drop_blocks(aliases)
+
+        self.code_page_traps[page] = (trap, write)
+        self.writers[page] = trap
+
+    def drop_blocks(self, pages: List[int]) -> None:
+        """
+        Forgets translated code of `pages` and stops watching writes to them
+        """
+        for key in [key for key in self.blocks if key[0] >> 8 in pages]:
+            del self.blocks[key]
+            self.block_entries.pop(key, None)
+        for page in pages:
+            trap, write = self.code_page_traps.pop(page, (None, None))
+            # the page may have been re-pointed meanwhile
+            if trap is not None and self.writers[page] is trap:
+                self.writers[page] = write
+
+    def flush_blocks(self) -> None:
+        """
+        Forgets all translated code, e.g. after code is stored with a block
+        write, which no trap sees
+        """
+        self.drop_blocks(list(self.code_page_traps))
+        self.blocks.clear()
+        self.block_entries.clear()
+
+    def skip_idle_loop(self, branch_pc: int) -> None:
+        """
+        Called by run_until() after a jump back from `branch_pc`. If that closes
+        an idle loop (see idle_loops), runs one more iteration and if it leaves
+        registers as they were, skips whole iterations up to the slice end or
+        up to the cycle a device says a read value may change at
+        (AbstractDevice.stable_until()), whichever comes first.
+        """
+        loop = self.idle_loops.get(branch_pc)
+        if loop is None or not loop.matches(self):
+            loop = self.idle_loops[branch_pc] = find_idle_loop(self, self._pc, branch_pc)
+            if loop is None:
+                return
+        if self.slice_end == float('inf') or self.bus.watchpoints:
+            return
+        state = (self._a, self._x, self._y, self._status)
+        start = self.total_cycles
+        # one instruction per handler call for the count to hold
+        handlers = self.unfused_handlers()
+        for _ in range(loop.instructions):
+            # slice may end (or be cut short by NMI) in the middle of the iteration
+            if self.total_cycles >= self.slice_end:
+                return
+            opcode_pc = self._pc
+            self._opcode = opcode = self.fetchers[opcode_pc >> 8](opcode_pc)
+            self._pc = (opcode_pc + 1) & 0xffff
+            self.total_cycles += handlers[opcode](self)
+        if self._pc != loop.start or (self._a, self._x, self._y, self._status) != state:
+            return
+        horizon = self.slice_end
+        for addr in loop.reads:
+            stable_until = self.bus.address_owner(addr).stable_until(addr)
+            if stable_until is None:
+                return
+            horizon = min(horizon, stable_until)
+        period = self.total_cycles - start
+        self.total_cycles += max(0, int(horizon - self.total_cycles) // period) * period
+
+    def end_slice(self) -> None:
+        """
+        Makes run_until() return after the current instruction, e.g. when a
+        device raises an interrupt in the middle of a slice
+        """
+        self.slice_end = self.total_cycles
+
+    def run_frame(self) -> int:
+        """
+        Runs until the start of the next NTSC frame, an approximation counting
+        every frame as 341 x 262 dots from power up: the dot the PPU skips on
+        odd rendered frames is not known here, so these boundaries drift from
+        the PPU's ones. Nes.run_frame() follows the PPU.
+        """
+        next_frame = self.total_cycles * 3 // PPU_DOTS_PER_FRAME + 1
+        frame_start = (next_frame * PPU_DOTS_PER_FRAME + 2) // 3
+        return self.run_until(max_cycles=frame_start - self.total_cycles)
 
     def irq(self) -> None:
-        if self.get_flag('i'):
+        if self._status & FLAG_I:
             return
-        self.write(c_uint16(0x0100 + self.sp.value), c_uint8((self.pc.value >> 8) & 0x00ff))
-        self.sp.value -= 1
-        self.write(c_uint16(0x0100 + self.sp.value), c_uint8(self.pc.value & 0x00ff))
-        self.sp.value -= 1
+        self.push(self._pc >> 8)
+        self.push(self._pc & 0x00ff)
 
-        self.set_flag('b', False)
-        self.set_flag('u', True)
-        self.set_flag('i', True)
-        self.write(c_uint16(0x0100 + self.sp.value), self.status)
-        self.sp.value -= 1
+        # pushed copy keeps the I flag of the interrupted code, so RTI restores it
+        self.push((self._status & ~FLAG_B) | FLAG_U)
+        self._status = (self._status & ~FLAG_B) | FLAG_U | FLAG_I
 
-        self.addr_abs.value = 0xfffc
-        lo = self.read(c_uint16(self.addr_abs.value + 0))
-        hi = self.read(c_uint16(self.addr_abs.value + 1))
-        self.pc.value = (hi.value << 8) | lo.value
+        self._addr_abs = 0xfffe
+        lo = self.read(self._addr_abs + 0)
+        hi = self.read(self._addr_abs + 1)
+        self._pc = (hi << 8) | lo
 
-        self.cycles.value = 7
+        self._cycles = 7
 
     def nmi(self) -> None:
-        self.write(c_uint16(0x0100 + self.sp.value), c_uint8((self.pc.value >> 8) & 0x00ff))
-        self.sp.value -= 1
-        self.write(c_uint16(0x0100 + self.sp.value), c_uint8(self.pc.value & 0x00ff))
-        self.sp.value -= 1
+        self.push(self._pc >> 8)
+        self.push(self._pc & 0x00ff)
 
-        self.set_flag('b', False)
-        self.set_flag('u', True)
-        self.set_flag('i', True)
-        self.write(c_uint16(0x0100 + self.sp.value), self.status)
-        self.sp.value -= 1
+        # pushed copy keeps the I flag of the interrupted code, so RTI restores it
+        self.push((self._status & ~FLAG_B) | FLAG_U)
+        self._status = (self._status & ~FLAG_B) | FLAG_U | FLAG_I
 
-        self.addr_abs.value = 0xfffa
-        lo = self.read(c_uint16(self.addr_abs.value + 0))
-        hi = self.read(c_uint16(self.addr_abs.value + 1))
-        self.pc.value = (hi.value << 8) | lo.value
+        self._addr_abs = 0xfffa
+        lo = self.read(self._addr_abs + 0)
+        hi = self.read(self._addr_abs + 1)
+        self._pc = (hi << 8) | lo
 
-        self.cycles.value = 8
+        self._cycles = 8
 
     def complete(self) -> bool:
-        return self.cycles.value == 0
+        return self._cycles == 0
 
     def disassemble(self, start, stop) -> Dict[int, str]:
         spaces_amt = 7
         ops_spaces_amt = 6
         map_lines = dict()
-        addr = c_uint16(start)
-        lo = c_uint8(0)
-        hi = c_uint8(0)
+        addr = start
 
-        while addr.value <= stop:
-            line_addr = addr.value
+        while addr <= stop:
+            line_addr = addr
             # instruction addr
-            instr_str = ('$' + hex(addr.value)[2:].zfill(4) + ':').ljust(spaces_amt)
+            instr_str = ('$' + hex(addr)[2:].zfill(4) + ':').ljust(spaces_amt)
             # instruction
-            opcode = self.bus.address_owner(addr).read(addr, True).value
-            instruction = instruction_by_opcode(opcode)
-            addr.value += 1
+            opcode = self.read(addr & 0xffff, True)
+            instruction = self.lookup[opcode]
+            addr += 1
             instr_str += instruction.name.ljust(ops_spaces_amt)
             # addressing mode
             # TODO: okay, I decided write a lot of if/elifs, but sure, there exists more
             #  elegant way to do it (Strategy maybe?)
-            if instruction.addr_mode == ams.am_imp:
+            if instruction.addr_mode is ams.am_imp:
                 instr_str += "{IMP}".ljust(ops_spaces_amt)
-            elif instruction.addr_mode == ams.am_imm:
-                value = self.bus.get_ram().read(addr, True)
-                addr.value += 1
-                instr_str += ("#$" + hex(value.value)[2:].zfill(2)).ljust(
+            elif instruction.addr_mode is ams.am_imm:
+                value = self.read(addr & 0xffff, True)
+                addr += 1
+                instr_str += ("#$" + hex(value)[2:].zfill(2)).ljust(
                     ops_spaces_amt) + "{IMM}".ljust(ops_spaces_amt)
-            elif instruction.addr_mode == ams.am_zp0:
-                lo = self.bus.get_ram().read(addr, True)
-                addr.value += 1
-                hi.value = 0x00
-                instr_str += ("$" + hex(lo.value)[2:].zfill(2) + ")").ljust(
+            elif instruction.addr_mode is ams.am_zp0:
+                lo = self.read(addr & 0xffff, True)
+                addr += 1
+                instr_str += ("$" + hex(lo)[2:].zfill(2) + ")").ljust(
                     ops_spaces_amt) + "{ZP0}".ljust(ops_spaces_amt)
-            elif instruction.addr_mode == ams.am_zpx:
-                lo = self.bus.get_ram().read(addr, True)
-                addr.value += 1
-                hi.value = 0x00
-                instr_str += ("$" + hex(lo.value)[2:].zfill(2) + ", X)").ljust(
+            elif instruction.addr_mode is ams.am_zpx:
+                lo = self.read(addr & 0xffff, True)
+                addr += 1
+                instr_str += ("$" + hex(lo)[2:].zfill(2) + ", X)").ljust(
                     ops_spaces_amt) + "{ZPX}".ljust(ops_spaces_amt)
-            elif instruction.addr_mode == ams.am_zpy:
-                lo = self.bus.get_ram().read(addr, True)
-                addr.value += 1
-                hi.value = 0x00
-                instr_str += ("$" + hex(lo.value)[2:].zfill(2) + ", Y)").ljust(
+            elif instruction.addr_mode is ams.am_zpy:
+                lo = self.read(addr & 0xffff, True)
+                addr += 1
+                instr_str += ("$" + hex(lo)[2:].zfill(2) + ", Y)").ljust(
                     ops_spaces_amt) + "{ZPY}".ljust(ops_spaces_amt)
-            elif instruction.addr_mode == ams.am_izx:
-                lo = self.bus.get_ram().read(addr, True)
-                addr.value += 1
-                hi.value = 0x00
-                instr_str += ("($" + hex(lo.value)[2:].zfill(2) + ", X)").ljust(
+            elif instruction.addr_mode is ams.am_izx:
+                lo = self.read(addr & 0xffff, True)
+                addr += 1
+                instr_str += ("($" + hex(lo)[2:].zfill(2) + ", X)").ljust(
                     ops_spaces_amt) + "{IZX}".ljust(ops_spaces_amt)
-            elif instruction.addr_mode == ams.am_izy:
-                lo = self.bus.get_ram().read(addr, True)
-                addr.value += 1
-                hi.value = 0x00
-                instr_str += ("($" + hex(lo.value)[2:].zfill(2) + ", Y)").ljust(
+            elif instruction.addr_mode is ams.am_izy:
+                lo = self.read(addr & 0xffff, True)
+                addr += 1
+                instr_str += ("($" + hex(lo)[2:].zfill(2) + ", Y)").ljust(
                     ops_spaces_amt) + "{IZY}".ljust(ops_spaces_amt)
-            elif instruction.addr_mode == ams.am_abs:
-                lo = self.bus.get_ram().read(addr, True)
-                addr.value += 1
-                hi = self.bus.get_ram().read(addr, True)
-                addr.value += 1
-                instr_str += ("$" + hex(c_uint16(
-                    (hi.value << 8) | lo.value
-                ).value)[2:].zfill(2)).ljust(ops_spaces_amt) + "{ABS}".ljust(ops_spaces_amt)
-            elif instruction.addr_mode == ams.am_abx:
-                lo = self.bus.get_ram().read(addr, True)
-                addr.value += 1
-                hi = self.bus.get_ram().read(addr, True)
-                addr.value += 1
-                instr_str += ("$" + hex(c_uint16(
-                    (hi.value << 8) | lo.value
-                ).value)[2:].zfill(2)).ljust(ops_spaces_amt) + ", X {ABX}".ljust(ops_spaces_amt)
-            elif instruction.addr_mode == ams.am_aby:
-                lo = self.bus.get_ram().read(addr, True)
-                addr.value += 1
-                hi = self.bus.get_ram().read(addr, True)
-                addr.value += 1
-                instr_str += ("$" + hex(c_uint16(
-                    (hi.value << 8) | lo.value
-                ).value)[2:].zfill(2)).ljust(ops_spaces_amt) + ", X {ABY}".ljust(ops_spaces_amt)
-            elif instruction.addr_mode == ams.am_ind:
-                lo = self.bus.get_ram().read(addr, True)
-                addr.value += 1
-                hi = self.bus.get_ram().read(addr, True)
-                addr.value += 1
-                instr_str += ("($" + hex(c_uint16(
-                    (hi.value << 8) | lo.value
-                ).value)[2:].zfill(2) + ")").ljust(ops_spaces_amt) + "{IND}".ljust(ops_spaces_amt)
-            elif instruction.addr_mode == ams.am_rel:
-                value = self.bus.get_ram().read(addr, True)
-                addr.value += 1
-                instr_str += ("$" + hex(value.value)[2:].zfill(2)).ljust(ops_spaces_amt) + ("[$" + hex(
-                    addr.value + value.value
+            elif instruction.addr_mode is ams.am_abs:
+                lo = self.read(addr & 0xffff, True)
+                addr += 1
+                hi = self.read(addr & 0xffff, True)
+                addr += 1
+                instr_str += ("$" + hex((hi << 8) | lo)[2:].zfill(2)).ljust(
+                    ops_spaces_amt) + "{ABS}".ljust(ops_spaces_amt)
+            elif instruction.addr_mode is ams.am_abx:
+                lo = self.read(addr & 0xffff, True)
+                addr += 1
+                hi = self.read(addr & 0xffff, True)
+                addr += 1
+                instr_str += ("$" + hex((hi << 8) | lo)[2:].zfill(2)).ljust(
+                    ops_spaces_amt) + ", X {ABX}".ljust(ops_spaces_amt)
+            elif instruction.addr_mode is ams.am_aby:
+                lo = self.read(addr & 0xffff, True)
+                addr += 1
+                hi = self.read(addr & 0xffff, True)
+                addr += 1
+                instr_str += ("$" + hex((hi << 8) | lo)[2:].zfill(2)).ljust(
+                    ops_spaces_amt) + ", X {ABY}".ljust(ops_spaces_amt)
+            elif instruction.addr_mode is ams.am_ind:
+                lo = self.read(addr & 0xffff, True)
+                addr += 1
+                hi = self.read(addr & 0xffff, True)
+                addr += 1
+                instr_str += ("($" + hex((hi << 8) | lo)[2:].zfill(2) + ")").ljust(
+                    ops_spaces_amt) + "{IND}".ljust(ops_spaces_amt)
+            elif instruction.addr_mode is ams.am_rel:
+                value = self.read(addr & 0xffff, True)
+                addr += 1
+                instr_str += ("$" + hex(value)[2:].zfill(2)).ljust(ops_spaces_amt) + ("[$" + hex(
+                    addr + value
                 )[2:].zfill(2) + "]").ljust(ops_spaces_amt) + " {REL}".ljust(ops_spaces_amt)
             # add to res
             map_lines.update({line_addr: instr_str})
@@ -214,30 +480,99 @@ class Cpu6502(AbstractDevice):
         return map_lines
 
     def set_flag(self, flag: str, value: bool) -> None:
-        mask = get_mask(flag)
-        self.status.value = self.status.value | mask if value else self.status.value & ~mask
+        mask = FLAG_MASKS[flag]
+        self._status = self._status | mask if value else self._status & ~mask
 
     def get_flag(self, flag: str) -> bool:
-        mask = get_mask(flag)
-        return (self.status.value & mask) > 0
+        return (self._status & FLAG_MASKS[flag]) > 0
+
+    def connect_to_bus(self, bus) -> None:
+        super().connect_to_bus(bus)
+        # bus page tables are mutated in place, so references stay valid on remap
+        self.readers = bus.readers
+        self.writers = bus.writers
+        self.fetchers = bus.fetchers
 
-    def read(self, addr: c_uint16) -> c_uint8:
+    def bus_remapped(self, bus) -> None:
+        if bus is not self.bus:
+            return
+        self.idle_loops.clear()
+        self.flush_blocks()
+        ram = bus.devices.get('Ram')
+        self.ram = ram.data if ram is not None and ram.is_directly_mapped(bus) else None
+        self.select_handlers()
+
+    @property
+    def fuse_instructions(self) -> bool:
+        """
+        Whether common instruction pairs run in one handler (see FUSED_PAIRS),
+        off by default. Fused pairs ending with a branch are not seen by idle
+        loop detection, and no pair is fused while the bus has watchpoints.
+        """
+        return self._fuse_instructions
+
+    @fuse_instructions.setter
+    def fuse_instructions(self, fuse: bool) -> None:
+        self._fuse_instructions = fuse
+        self.select_handlers()
+
+    def select_handlers(self) -> None:
+        # only generated tables are switched, custom ones (e.g. reference handlers) stay
+        if self.is_generated(self.handlers):
+            fuse = self._fuse_instructions and self.bus is not None and not self.bus.watchpoints
+            self.handlers = self.generated_handlers(fuse)
+
+    def generated_handlers(self, fuse: bool) -> List[Handler]:
+        if fuse:
+            return FUSED_HANDLERS if self.ram is None else FUSED_RAM_HANDLERS
+        return HANDLERS if self.ram is None else RAM_HANDLERS
+
+    def is_generated(self, handlers: List[Handler]) -> bool:
+        return any(handlers is table for table in (HANDLERS, RAM_HANDLERS, FUSED_HANDLERS, FUSED_RAM_HANDLERS))
+
+    def unfused_handlers(self) -> List[Handler]:
+        """
+        Current handlers with no instruction pairs fused
+        """
+        return self.generated_handlers(False) if self.is_generated(self.handlers) else self.handlers
+
+    def pages_switching(self, bus, first_page: int, count: int) -> None:
+        if bus is not self.bus:
+            return
+        self.idle_loops.clear()
+        # blocks of switched ROM stay, they are kept by page reader, but
+        # writable memory can change while it is switched out
+        for page in range(first_page, first_page + count):
+            if page in self.code_page_traps:
+                self.drop_blocks(self.page_aliases(page) or [page])
+
+    def read(self, addr: int, read_only: bool = False) -> int:
         if not self.bus:
             raise NoSuchDeviceException()
-        # return self.bus.get_ram().read(addr, False)
-        return self.bus.address_owner(addr).read(addr, False)
+        if read_only:
+            return self.bus.address_owner(addr).read(addr, read_only)
+        return self.readers[addr >> 8](addr)
 
-    def write(self, addr: c_uint16, data: c_uint8) -> None:
+    def write(self, addr: int, data: int) -> None:
         if not self.bus:
             raise NoSuchDeviceException()
-        self.bus.address_owner(addr).write(addr, data)
+        self.writers[addr >> 8](addr, data)
 
-    def fetch(self) -> c_uint8:
-        if not self.lookup.get(self.opcode.value).addr_mode == ams.am_imp:
-            self.fetched.value = self.read(self.addr_abs).value
-        return self.fetched
+    def push(self, data: int) -> None:
+        self.write(0x0100 + self._sp, data)
+        self._sp = (self._sp - 1) & 0xff
 
-    def load_rom(self, rom: List[int], start: int = 0x8000):
-        for addr, opc in enumerate(rom):
-            self.write(c_uint16(start + addr), c_uint8(opc))
-        print()
+    def pull(self) -> int:
+        self._sp = (self._sp + 1) & 0xff
+        return self.read(0x0100 + self._sp)
+
+    def fetch(self) -> int:
+        if self.lookup[self._opcode].addr_mode is not ams.am_imp:
+            self._fetched = self.read(self._addr_abs)
+        return self._fetched
+
+    def load_rom(self, rom: Union[List[int], Block], start: int = 0x8000):
+        if not self.bus:
+            raise NoSuchDeviceException()
+        self.flush_blocks()
+        self.bus.write_block(start, rom if isinstance(rom, (bytes, bytearray, memoryview)) else bytes(rom))
@@ -0,0 +1,475 @@
+"""
+Per-opcode handlers dispatched by Cpu6502.
+
+Every legal opcode gets its own generated function with the addressing mode, the
+operation and the page-cross penalty inlined. A handler is called right after the
+opcode byte is fetched (pc already points to the first operand byte) and returns
+the amount of cycles the instruction took. Memory accesses are inlined as lookups
+into the bus page tables.
+
+With FUSED_HANDLERS the first instruction of a common pair (e.g. DEX/BNE) also
+runs the second one when it follows, see fused_handler_source().
+
+Sources mark zero page and stack accesses with `read_zp`/`write_zp` and
+`read_stack`/`write_stack`. Those pages are known at generation time, so they are
+either looked up by constant index or, in `RAM_HANDLERS`, go straight to the
+internal RAM buffer while it is mapped there with no watch or override on top.
+"""
+import re
+from typing import Callable, Dict, List
+
+from pynes.core.devices.cpu import address_modes as ams
+from pynes.core.devices.cpu.instructions import OPCODE_TABLE, Cpu6502Instruction
+from pynes.core.devices.cpu.utils import FLAG_C, FLAG_Z, FLAG_I, FLAG_D, FLAG_B, FLAG_U, FLAG_V, FLAG_N
+
+Handler = Callable[[object], int]
+
+# N and Z flags for every 8-bit result
+NZ: List[int] = [FLAG_Z] + [FLAG_N if value & 0x80 else 0 for value in range(1, 0x100)]
+
+ADDR_MODE_SOURCES: Dict[Callable, str] = {
+    ams.am_imp: '',
+    ams.am_imm: '''
+addr = pc
+pc = (pc + 1) & 0xffff
+''',
+    ams.am_zp0: '''
+addr = read(pc)
+pc = (pc + 1) & 0xffff
+''',
+    ams.am_zpx: '''
+addr = (read(pc) + cpu._x) & 0xff
+pc = (pc + 1) & 0xffff
+''',
+    ams.am_zpy: '''
+addr = (read(pc) + cpu._y) & 0xff
+pc = (pc + 1) & 0xffff
+''',
+    ams.am_abs: '''
+addr = read(pc) | (read((pc + 1) & 0xffff) << 8)
+pc = (pc + 2) & 0xffff
+''',
+    ams.am_abx: '''
+base = read(pc) | (read((pc + 1) & 0xffff) << 8)
+pc = (pc + 2) & 0xffff
+addr = (base + cpu._x) & 0xffff
+''',
+    ams.am_aby: '''
+base = read(pc) | (read((pc + 1) & 0xffff) << 8)
+pc = (pc + 2) & 0xffff
+addr = (base + cpu._y) & 0xffff
+''',
+    # page boundary hardware bug: high byte never comes from the next page
+    ams.am_ind: '''
+ptr = read(pc) | (read((pc + 1) & 0xffff) << 8)
+pc = (pc + 2) & 0xffff
+addr = read(ptr) | (read((ptr & 0xff00) | ((ptr + 1) & 0x00ff)) << 8)
+''',
+    ams.am_izx: '''
+ptr = (read(pc) + cpu._x) & 0xff
+pc = (pc + 1) & 0xffff
+addr = read_zp(ptr) | (read_zp((ptr + 1) & 0xff) << 8)
+''',
+    ams.am_izy: '''
+ptr = read(pc)
+pc = (pc + 1) & 0xffff
+base = read_zp(ptr) | (read_zp((ptr + 1) & 0xff) << 8)
+addr = (base + cpu._y) & 0xffff
+''',
+    ams.am_rel: '''
+offset = read(pc)
+pc = (pc + 1) & 0xffff
+addr = (pc + offset - ((offset & 0x80) << 1)) & 0xffff
+''',
+}
+
+# addressing modes whose effective address is always on zero page
+ZERO_PAGE_ADDR_MODES = (ams.am_zp0, ams.am_zpx, ams.am_zpy)
+
+# addressing modes which may cross a page while indexing
+PAGE_CROSS_ADDR_MODES = (ams.am_abx, ams.am_aby, ams.am_izy)
+
+# instructions which take an extra cycle when indexing crosses a page
+PAGE_CROSS_PENALTY = ('ADC', 'AND', 'CMP', 'EOR', 'LDA', 'LDX', 'LDY', 'ORA', 'SBC')
+
+_LOAD = '''
+value = read(addr)
+cpu._{reg} = value
+cpu._status = (cpu._status & 0x7d) | NZ[value]
+'''
+_STORE = '''
+write(addr, cpu._{reg})
+'''
+_LOGIC = '''
+value = cpu._a {op} read(addr)
+cpu._a = value
+cpu._status = (cpu._status & 0x7d) | NZ[value]
+'''
+_COMPARE = '''
+value = read(addr)
+reg = cpu._{reg}
+cpu._status = (cpu._status & 0x7c) | NZ[(reg - value) & 0xff] | (reg >= value)
+'''
+_STEP_MEMORY = '''
+value = (read(addr) {op} 1) & 0xff
+write(addr, value)
+cpu._status = (cpu._status & 0x7d) | NZ[value]
+'''
+_STEP_REGISTER = '''
+value = (cpu._{reg} {op} 1) & 0xff
+cpu._{reg} = value
+cpu._status = (cpu._status & 0x7d) | NZ[value]
+'''
+_TRANSFER = '''
+value = cpu._{src}
+cpu._{dst} = value
+cpu._status = (cpu._status & 0x7d) | NZ[value]
+'''
+_BRANCH = '''
+c = 2
+if {neg}cpu._status & {flag}:
+    c += 1 + ((addr ^ pc) > 0xff)
+    pc = addr
+'''
+_SET_FLAG = '''
+cpu._status |= {flag}
+'''
+_CLEAR_FLAG = '''
+cpu._status &= ~{flag}
+'''
+_ADD = '''
+a = cpu._a
+result = a + value + (cpu._status & FLAG_C)
+cpu._status = ((cpu._status & 0x3c) | NZ[result & 0xff] | (result > 0xff)
+               | ((~(a ^ value) & (a ^ result) & 0x80) >> 1))
+cpu._a = result & 0xff
+'''
+# shifts and rotates: {load} gives the operand, {store} puts result back
+_ASL = '''
+value = {load}
+result = (value << 1) & 0xff
+{store}
+cpu._status = (cpu._status & 0x7c) | NZ[result] | (value >> 7)
+'''
+_LSR = '''
+value = {load}
+result = value >> 1
+{store}
+cpu._status = (cpu._status & 0x7c) | NZ[result] | (value & 0x01)
+'''
+_ROL = '''
+value = {load}
+result = ((value << 1) | (cpu._status & FLAG_C)) & 0xff
+{store}
+cpu._status = (cpu._status & 0x7c) | NZ[result] | (value >> 7)
+'''
+_ROR = '''
+value = {load}
+result = (value >> 1) | ((cpu._status & FLAG_C) << 7)
+{store}
+cpu._status = (cpu._status & 0x7c) | NZ[result] | (value & 0x01)
+'''
+_PUSH = '''
+sp = cpu._sp
+write_stack(0x0100 | sp, {value})
+cpu._sp = (sp - 1) & 0xff
+'''
+_PUSH_PC = '''
+sp = cpu._sp
+write_stack(0x0100 | sp, {value} >> 8)
+write_stack(0x0100 | ((sp - 1) & 0xff), {value} & 0xff)
+cpu._sp = (sp - 2) & 0xff
+'''
+_PULL = '''
+sp = (cpu._sp + 1) & 0xff
+cpu._sp = sp
+value = read_stack(0x0100 | sp)
+'''
+_PULL_PC = '''
+sp = cpu._sp
+lo = read_stack(0x0100 | ((sp + 1) & 0xff))
+hi = read_stack(0x0100 | ((sp + 2) & 0xff))
+cpu._sp = (sp + 2) & 0xff
+'''
+
+OPERATION_SOURCES: Dict[str, str] = {
+    'ADC': 'value = read(addr)' + _ADD,
+    'SBC': 'value = read(addr) ^ 0xff' + _ADD,
+    'AND': _LOGIC.format(op='&'),
+    'ORA': _LOGIC.format(op='|'),
+    'EOR': _LOGIC.format(op='^'),
+    'BIT': '''
+value = read(addr)
+cpu._status = (cpu._status & 0x3d) | (value & 0xc0) | (0 if cpu._a & value else FLAG_Z)
+''',
+    'CMP': _COMPARE.format(reg='a'),
+    'CPX': _COMPARE.format(reg='x'),
+    'CPY': _COMPARE.format(reg='y'),
+    'LDA': _LOAD.format(reg='a'),
+    'LDX': _LOAD.format(reg='x'),
+    'LDY': _LOAD.format(reg='y'),
+    'STA': _STORE.format(reg='a'),
+    'STX': _STORE.format(reg='x'),
+    'STY': _STORE.format(reg='y'),
+    'INC': _STEP_MEMORY.format(op='+'),
+    'DEC': _STEP_MEMORY.format(op='-'),
+    'INX': _STEP_REGISTER.format(reg='x', op='+'),
+    'INY': _STEP_REGISTER.format(reg='y', op='+'),
+    'DEX': _STEP_REGISTER.format(reg='x', op='-'),
+    'DEY': _STEP_REGISTER.format(reg='y', op='-'),
+    'TAX': _TRANSFER.format(src='a', dst='x'),
+    'TAY': _TRANSFER.format(src='a', dst='y'),
+    'TXA': _TRANSFER.format(src='x', dst='a'),
+    'TYA': _TRANSFER.format(src='y', dst='a'),
+    'TSX': _TRANSFER.format(src='sp', dst='x'),
+    'TXS': '''
+cpu._sp = cpu._x
+''',
+    'BCC': _BRANCH.format(neg='not ', flag='FLAG_C'),
+    'BCS': _BRANCH.format(neg='', flag='FLAG_C'),
+    'BNE': _BRANCH.format(neg='not ', flag='FLAG_Z'),
+    'BEQ': _BRANCH.format(neg='', flag='FLAG_Z'),
+    'BPL': _BRANCH.format(neg='not ', flag='FLAG_N'),
+    'BMI': _BRANCH.format(neg='', flag='FLAG_N'),
+    'BVC': _BRANCH.format(neg='not ', flag='FLAG_V'),
+    'BVS': _BRANCH.format(neg='', flag='FLAG_V'),
+    'CLC': _CLEAR_FLAG.format(flag='FLAG_C'),
+    'CLD': _CLEAR_FLAG.format(flag='FLAG_D'),
+    'CLI': _CLEAR_FLAG.format(flag='FLAG_I'),
+    'CLV': _CLEAR_FLAG.format(flag='FLAG_V'),
+    'SEC': _SET_FLAG.format(flag='FLAG_C'),
+    'SED': _SET_FLAG.format(flag='FLAG_D'),
+    'SEI': _SET_FLAG.format(flag='FLAG_I'),
+    'JMP': '''
+pc = addr
+''',
+    'JSR': _PUSH_PC.format(value='((pc - 1) & 0xffff)') + '''
+pc = addr
+''',
+    'RTS': _PULL_PC + '''
+pc = (((hi << 8) | lo) + 1) & 0xffff
+''',
+    'RTI': _PULL + '''
+cpu._status = (value & ~FLAG_B) | FLAG_U
+''' + _PULL_PC + '''
+pc = (hi << 8) | lo
+''',
+    'BRK': '''
+pc = (pc + 1) & 0xffff
+''' + _PUSH_PC.format(value='pc') + _PUSH.format(value='(cpu._status | FLAG_B | FLAG_U)') + '''
+cpu._status |= FLAG_I
+pc = read(0xfffe) | (read(0xffff) << 8)
+''',
+    'PHA': _PUSH.format(value='cpu._a'),
+    'PHP': _PUSH.format(value='(cpu._status | FLAG_B | FLAG_U)'),
+    'PLA': _PULL + '''
+cpu._a = value
+cpu._status = (cpu._status & 0x7d) | NZ[value]
+''',
+    'PLP': _PULL + '''
+cpu._status = (value & ~FLAG_B) | FLAG_U
+''',
+    'ASL': _ASL,
+    'LSR': _LSR,
+    'ROL': _ROL,
+    'ROR': _ROR,
+    'NOP': '',
+    'XXX': '',
+}
+
+SHIFT_OPERATIONS = ('ASL', 'LSR', 'ROL', 'ROR')
+
+# instruction pairs common in hot loops, run by one handler in FUSED_HANDLERS
+FUSED_PAIRS: Dict[str, str] = {
+    'DEX': 'BNE',
+    'DEY': 'BNE',
+    'LDA': 'STA',
+    'CMP': 'BEQ',
+    'INX': 'CPX',
+}
+
+HANDLER_NAMESPACE = {
+    'NZ': NZ,
+    'FLAG_C': FLAG_C, 'FLAG_Z': FLAG_Z, 'FLAG_I': FLAG_I, 'FLAG_D': FLAG_D,
+    'FLAG_B': FLAG_B, 'FLAG_U': FLAG_U, 'FLAG_V': FLAG_V, 'FLAG_N': FLAG_N,
+}
+
+
+def operation_source(instruction: Cpu6502Instruction) -> str:
+    source = OPERATION_SOURCES[instruction.name]
+    if instruction.name in SHIFT_OPERATIONS:
+        if instruction.addr_mode is ams.am_imp:
+            source = source.format(load='cpu._a', store='cpu._a = result')
+        else:
+            source = source.format(load='read(addr)', store='write(addr, result)')
+    return source
+
+
+def cycles_source(instruction: Cpu6502Instruction) -> str:
+    if instruction.addr_mode is ams.am_rel:
+        return 'c'
+    if instruction.addr_mode in PAGE_CROSS_ADDR_MODES and instruction.name in PAGE_CROSS_PENALTY:
+        return '{c} + ((addr ^ base) > 0xff)'.format(c=instruction.cycles)
+    return str(instruction.cycles)
+
+
+def body_source(instruction: Cpu6502Instruction) -> str:
+    """
+    Straight-line body of an instruction: works on local `pc` and leaves the
+    amount of taken cycles as `cycles_source(instruction)` expression
+    """
+    source = operation_source(instruction)
+    if instruction.addr_mode in ZERO_PAGE_ADDR_MODES:
+        source = re.sub(r'(?<![\w.])(read|write)\(addr\b', r'\1_zp(addr', source)
+    return ADDR_MODE_SOURCES[instruction.addr_mode] + source
+
+
+def indent(source: str, level: int = 1) -> str:
+    prefix = '    ' * level
+    return ''.join(prefix + line + '\n' for line in source.splitlines() if line.strip())
+
+
+def split_call(source: str, start: int):
+    """
+    Finds arguments of the call whose opening bracket is at `start`,
+    returns them with the index right after the closing bracket
+    """
+    args, depth, arg_start = [], 0, start + 1
+    for i in range(start, len(source)):
+        char = source[i]
+        if char == '(':
+            depth += 1
+        elif char == ')':
+            depth -= 1
+            if depth == 0:
+                args.append(source[arg_start:i].strip())
+                return args, i + 1
+        elif char == ',' and depth == 1:
+            args.append(source[arg_start:i].strip())
+            arg_start = i + 1
+    raise ValueError('unbalanced call in: ' + source)
+
+
+def inline_bus_access(source: str, direct_ram: bool = False) -> str:
+    """
+    Rewrites `read(addr)`/`write(addr, data)` into direct bus page table calls,
+    zero page and stack accesses get a constant page or, with `direct_ram`,
+    index the internal RAM buffer
+    """
+    result, pos = [], 0
+    for match in re.finditer(r'(?<![\w.])(read|write)(_zp|_stack)?\(', source):
+        if match.start() < pos:
+            continue
+        args, end = split_call(source, match.end() - 1)
+        args = [inline_bus_access(arg, direct_ram) for arg in args]
+        addr = args[0] if re.fullmatch(r'\w+', args[0]) else '(' + args[0] + ')'
+        page = {None: addr + ' >> 8', '_zp': '0', '_stack': '1'}[match.group(2)]
+        if match.group(2) and direct_ram:
+            call = 'ram[{a}]'.format(a=args[0]) if match.group(1) == 'read' else \
+                'ram[{a}] = {d}'.format(a=args[0], d=args[1])
+        elif match.group(1) == 'read':
+            call = 'readers[{p}]({a})'.format(p=page, a=addr)
+        else:
+            call = 'writers[{p}]({a}, {d})'.format(p=page, a=addr, d=args[1])
+        result.append(source[pos:match.start()] + call)
+        pos = end
+    result.append(source[pos:])
+    return ''.join(result)
+
+
+def prologue_source(body: str) -> str:
+    """
+    Loads of the bus tables `body` uses into locals
+    """
+    prologue = ''
+    for table in ('readers', 'writers', 'fetchers', 'ram'):
+        if table + '[' in body:
+            prologue += '{t} = cpu.{t}\n'.format(t=table)
+    return prologue
+
+
+def handler_source(opcode: int, instruction: Cpu6502Instruction, direct_ram: bool = False) -> str:
+    body = inline_bus_access(body_source(instruction), direct_ram)
+    prologue = prologue_source(body)
+    if body:
+        prologue += 'pc = cpu._pc\n'
+        body += 'cpu._pc = pc\n'
+    return 'def {name}(cpu):\n{body}'.format(
+        name=handler_name(opcode, instruction),
+        body=indent(prologue + body + 'return ' + cycles_source(instruction)),
+    )
+
+
+_FUSED_FIRST = '''
+cpu._pc = pc
+first_cycles = {cycles}
+# the slice ends (e.g. for an interrupt) in between: no fusion
+if cpu.total_cycles + first_cycles >= cpu.slice_end:
+    return first_cycles
+opcode = fetchers[pc >> 8](pc)
+'''
+_FUSED_SECOND = '''
+cpu.total_cycles += first_cycles
+cpu._opcode = opcode
+pc = (pc + 1) & 0xffff
+cpu._pc = pc
+'''
+
+
+def fused_handler_source(opcode: int, instruction: Cpu6502Instruction, table: List[Cpu6502Instruction],
+                         direct_ram: bool = False) -> str:
+    """
+    Handler of the first instruction of a FUSED_PAIRS pair which, if the
+    second one follows and the slice does not end in between, runs it too.
+    Cycles of the first one are counted before the second one starts, so
+    devices see the time of each, and the second one's are returned.
+    """
+    body = inline_bus_access(body_source(instruction), direct_ram)
+    body += _FUSED_FIRST.format(cycles=cycles_source(instruction))
+    for follow_opcode, follow in enumerate(table):
+        if follow.name == FUSED_PAIRS[instruction.name]:
+            follow_body = _FUSED_SECOND + inline_bus_access(body_source(follow), direct_ram)
+            follow_body += 'cpu._pc = pc\nreturn ' + cycles_source(follow)
+            body += 'if opcode == 0x{op:02x}:\n{body}'.format(op=follow_opcode, body=indent(follow_body))
+    body += 'return first_cycles'
+    return 'def {name}(cpu):\n{body}'.format(
+        name=handler_name(opcode, instruction),
+        body=indent(prologue_source(body) + 'pc = cpu._pc\n' + body),
+    )
+
+
+def handler_name(opcode: int, instruction: Cpu6502Instruction) -> str:
+    return 'op_{opcode:02x}_{name}'.format(opcode=opcode, name=instruction.name.lower())
+
+
+def compile_handlers(table: List[Cpu6502Instruction], direct_ram: bool = False, fuse: bool = False) -> List[Handler]:
+    namespace = dict(HANDLER_NAMESPACE)
+    source = '\n\n'.join(fused_handler_source(opcode, instruction, table, direct_ram)
+                         if fuse and instruction.name in FUSED_PAIRS else
+                         handler_source(opcode, instruction, direct_ram)
+                         for opcode, instruction in enumerate(table))
+    exec(compile(source, '<cpu6502 handlers>', 'exec'), namespace)
+    return [namespace[handler_name(opcode, instruction)] for opcode, instruction in enumerate(table)]
+
+
+def reference_handler(instruction: Cpu6502Instruction) -> Handler:
+    """
+    Wraps instruction class into handler interface, that is the slow, but
+    straightforward, way of executing an opcode
+    """
+
+    def handler(cpu) -> int:
+        cpu._cycles = instruction.cycles
+        add_cycle_1 = instruction.addr_mode(cpu)
+        add_cycle_2 = instruction.operate(cpu)
+        cpu._status |= FLAG_U
+        return cpu._cycles + (add_cycle_1 & add_cycle_2)
+
+    return handler
+
+
+HANDLERS: List[Handler] = compile_handlers(OPCODE_TABLE)
+RAM_HANDLERS: List[Handler] = compile_handlers(OPCODE_TABLE, direct_ram=True)
+FUSED_HANDLERS: List[Handler] = compile_handlers(OPCODE_TABLE, fuse=True)
+FUSED_RAM_HANDLERS: List[Handler] = compile_handlers(OPCODE_TABLE, direct_ram=True, fuse=True)
+REFERENCE_HANDLERS: List[Handler] = [reference_handler(instruction) for instruction in OPCODE_TABLE]
@@ -0,0 +1,76 @@
+"""
+Finding loops which only poll memory, so the CPU can skip their iterations.
+
+An idle loop is a short straight piece of code which only reads (loads, compares,
+BIT, logic with immediate operand) and ends with a conditional branch or JMP back
+to its start, e.g. `LDA $2002; BPL loop`, `LDA $10; BEQ loop` or `JMP *`. Once an
+iteration leaves registers as they were, every next one does the same until one
+of the read values changes, see Cpu6502.skip_idle_loop().
+"""
+from typing import NamedTuple, Optional, Tuple
+
+from pynes.core.devices.cpu import address_modes as ams
+from pynes.core.devices.cpu.instructions import OPCODE_TABLE, OPERAND_SIZES
+
+# loops longer than that are not looked at
+MAX_IDLE_LOOP_SIZE: int = 8
+
+# instructions which may only read inside an idle loop
+POLLING_INSTRUCTIONS = ('LDA', 'LDX', 'LDY', 'BIT', 'CMP', 'CPX', 'CPY', 'AND', 'ORA', 'EOR', 'NOP')
+
+# addressing modes of those, indexed ones could read anywhere
+POLLING_ADDR_MODES = (ams.am_imp, ams.am_imm, ams.am_zp0, ams.am_abs)
+
+JMP_ABS: int = 0x4c
+
+# opcodes which may close an idle loop, indexed by opcode
+LOOP_OPCODES = [instruction.addr_mode is ams.am_rel or opcode == JMP_ABS
+                for opcode, instruction in enumerate(OPCODE_TABLE)]
+NO_LOOP_OPCODES = [False] * len(OPCODE_TABLE)
+
+
+class IdleLoop(NamedTuple):
+    start: int
+    # code bytes, to see the loop is still there before it is skipped again
+    code: bytes
+    instructions: int
+    # addresses read by every iteration
+    reads: Tuple[int, ...]
+
+    def matches(self, cpu) -> bool:
+        return cpu._pc == self.start and read_code(cpu, self.start, len(self.code)) == self.code
+
+
+def read_code(cpu, addr: int, length: int) -> bytes:
+    return bytes(cpu.read((addr + i) & 0xffff, True) for i in range(length))
+
+
+def find_idle_loop(cpu, start: int, end: int) -> Optional[IdleLoop]:
+    """
+    Idle loop from `start` to the branch or jump back at `end`, None if the
+    code in between does anything else than reading
+    """
+    if not 0 <= end - start <= MAX_IDLE_LOOP_SIZE:
+        return None
+    pc, count, reads = start, 0, []
+    while pc < end:
+        instruction = OPCODE_TABLE[cpu.read(pc, True)]
+        if instruction.name not in POLLING_INSTRUCTIONS or instruction.addr_mode not in POLLING_ADDR_MODES:
+            return None
+        size = OPERAND_SIZES[instruction.addr_mode]
+        if instruction.addr_mode is ams.am_zp0:
+            reads.append(cpu.read((pc + 1) & 0xffff, True))
+        elif instruction.addr_mode is ams.am_abs:
+            reads.append(cpu.read((pc + 1) & 0xffff, True) | (cpu.read((pc + 2) & 0xffff, True) << 8))
+        pc += 1 + size
+        count += 1
+    if pc != end:
+        return None
+    opcode = cpu.read(end, True)
+    if OPCODE_TABLE[opcode].addr_mode is ams.am_rel:
+        length = end + 2 - start
+    elif opcode == JMP_ABS:
+        length = end + 3 - start
+    else:
+        return None
+    return IdleLoop(start, read_code(cpu, start, length), count + 1, tuple(reads))
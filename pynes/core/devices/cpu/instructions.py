@@ -1,9 +1,8 @@
 from abc import ABC, abstractmethod
-from ctypes import c_uint8, c_uint16
 from typing import Callable, Dict, Optional, List, Any
 
 import pynes.core.devices.cpu.address_modes as address_modes
-from pynes.core.devices.cpu.utils import get_mask
+from pynes.core.devices.cpu.utils import FLAG_C, FLAG_Z, FLAG_B, FLAG_U, FLAG_V, FLAG_N
 
 
 # http://www.obelisk.me.uk/6502/reference.html was used as instructions reference
@@ -11,10 +10,14 @@ from pynes.core.devices.cpu.utils import get_mask
 
 # instruction template
 class Cpu6502Instruction(ABC):
+    """
+    Stateless description of an opcode: its base cycles amount and addressing mode.
+    The same instance is shared by all Cpu6502 instances, so the cpu to operate on
+    is passed explicitly.
+    """
 
-    def __init__(self, cpu, cycles: Optional[c_uint8],
-                 addr_mode: Optional[Callable[[Any], c_uint8]]):
-        self.cpu = cpu
+    def __init__(self, cycles: Optional[int],
+                 addr_mode: Optional[Callable[[Any], int]]):
         self.cycles = cycles
         self.addr_mode = addr_mode
 
@@ -23,21 +26,20 @@ class Cpu6502Instruction(ABC):
         return type(self).__name__
 
     @abstractmethod
-    def operate(self) -> c_uint8:
+    def operate(self, cpu) -> int:
         pass
 
     @staticmethod
     @abstractmethod
-    def opcodes_mapping(cpu) -> Dict:
+    def opcodes_mapping() -> Dict:
         pass
 
 
-def opcode_instruction_mapping(cpu) -> Dict[int, Cpu6502Instruction]:
+def opcode_instruction_mapping() -> Dict[int, Cpu6502Instruction]:
     mapping = dict()
 
     for instr_cls in Cpu6502Instruction.__subclasses__():
-        foo = instr_cls.opcodes_mapping(cpu)
-        mapping.update(foo)
+        mapping.update(instr_cls.opcodes_mapping())
 
     return mapping
 
@@ -50,31 +52,31 @@ class ADC(Cpu6502Instruction):
     is set, this enables multiple byte addition to be performed.
     """
 
-    def operate(self) -> c_uint8:
-        self.cpu.fetch()
-        tmp = c_uint16(self.cpu.a.value + self.cpu.fetched.value + int(self.cpu.get_flag('c')))
+    def operate(self, cpu) -> int:
+        cpu.fetch()
+        tmp = cpu._a + cpu._fetched + (cpu._status & FLAG_C)
 
-        self.cpu.set_flag('c', tmp.value > 0xff)
-        self.cpu.set_flag('z', (tmp.value & 0xff) == 0)
-        self.cpu.set_flag('n', bool(tmp.value & 0x80))
-        self.cpu.set_flag('v', bool(
-            (~(self.cpu.a.value ^ self.cpu.fetched.value) & (self.cpu.a.value ^ tmp.value)) & 0x0080
+        cpu.set_flag('c', tmp > 0xff)
+        cpu.set_flag('z', (tmp & 0xff) == 0)
+        cpu.set_flag('n', bool(tmp & 0x80))
+        cpu.set_flag('v', bool(
+            (~(cpu._a ^ cpu._fetched) & (cpu._a ^ tmp)) & 0x0080
         ))
 
-        self.cpu.a.value = tmp.value & 0x00ff
-        return c_uint8(1)
+        cpu._a = tmp & 0x00ff
+        return 1
 
     @staticmethod
-    def opcodes_mapping(cpu) -> Dict[int, Cpu6502Instruction]:
+    def opcodes_mapping() -> Dict[int, Cpu6502Instruction]:
         return {
-            0x69: ADC(cpu, cycles=c_uint8(2), addr_mode=address_modes.am_imm),
-            0x65: ADC(cpu, cycles=c_uint8(3), addr_mode=address_modes.am_zp0),
-            0x75: ADC(cpu, cycles=c_uint8(4), addr_mode=address_modes.am_zpx),
-            0x6d: ADC(cpu, cycles=c_uint8(4), addr_mode=address_modes.am_abs),
-            0x7d: ADC(cpu, cycles=c_uint8(4), addr_mode=address_modes.am_abx),
-            0x79: ADC(cpu, cycles=c_uint8(4), addr_mode=address_modes.am_aby),
-            0x61: ADC(cpu, cycles=c_uint8(6), addr_mode=address_modes.am_izx),
-            0x71: ADC(cpu, cycles=c_uint8(5), addr_mode=address_modes.am_izy),
+            0x69: ADC(cycles=2, addr_mode=address_modes.am_imm),
+            0x65: ADC(cycles=3, addr_mode=address_modes.am_zp0),
+            0x75: ADC(cycles=4, addr_mode=address_modes.am_zpx),
+            0x6d: ADC(cycles=4, addr_mode=address_modes.am_abs),
+            0x7d: ADC(cycles=4, addr_mode=address_modes.am_abx),
+            0x79: ADC(cycles=4, addr_mode=address_modes.am_aby),
+            0x61: ADC(cycles=6, addr_mode=address_modes.am_izx),
+            0x71: ADC(cycles=5, addr_mode=address_modes.am_izy),
         }
 
 
@@ -83,25 +85,25 @@ class AND(Cpu6502Instruction):
     Logical AND: performed bit by bit on acc value with fetched from memory byte
     """
 
-    def operate(self) -> c_uint8:
-        self.cpu.fetch()
-        self.cpu.a.value &= self.cpu.fetched.value
+    def operate(self, cpu) -> int:
+        cpu.fetch()
+        cpu._a &= cpu._fetched
 
-        self.cpu.set_flag('z', self.cpu.a.value == 0x00)
-        self.cpu.set_flag('n', bool(self.cpu.a.value & 0x80))
-        return c_uint8(1)
+        cpu.set_flag('z', cpu._a == 0x00)
+        cpu.set_flag('n', bool(cpu._a & 0x80))
+        return 1
 
     @staticmethod
-    def opcodes_mapping(cpu) -> Dict[int, Cpu6502Instruction]:
+    def opcodes_mapping() -> Dict[int, Cpu6502Instruction]:
         return {
-            0x29: AND(cpu, cycles=c_uint8(2), addr_mode=address_modes.am_imm),
-            0x25: AND(cpu, cycles=c_uint8(3), addr_mode=address_modes.am_zp0),
-            0x32: AND(cpu, cycles=c_uint8(4), addr_mode=address_modes.am_zpx),
-            0x2d: AND(cpu, cycles=c_uint8(4), addr_mode=address_modes.am_abs),
-            0x3d: AND(cpu, cycles=c_uint8(4), addr_mode=address_modes.am_abx),
-            0x39: AND(cpu, cycles=c_uint8(4), addr_mode=address_modes.am_aby),
-            0x21: AND(cpu, cycles=c_uint8(6), addr_mode=address_modes.am_izx),
-            0x31: AND(cpu, cycles=c_uint8(5), addr_mode=address_modes.am_izy),
+            0x29: AND(cycles=2, addr_mode=address_modes.am_imm),
+            0x25: AND(cycles=3, addr_mode=address_modes.am_zp0),
+            0x35: AND(cycles=4, addr_mode=address_modes.am_zpx),
+            0x2d: AND(cycles=4, addr_mode=address_modes.am_abs),
+            0x3d: AND(cycles=4, addr_mode=address_modes.am_abx),
+            0x39: AND(cycles=4, addr_mode=address_modes.am_aby),
+            0x21: AND(cycles=6, addr_mode=address_modes.am_izx),
+            0x31: AND(cycles=5, addr_mode=address_modes.am_izy),
         }
 
 
@@ -113,30 +115,30 @@ class ASL(Cpu6502Instruction):
     if the result will not fit in 8 bits.
     """
 
-    def operate(self) -> c_uint8:
-        self.cpu.fetch()
-        tmp = c_uint16(self.cpu.fetched.value << 1)
+    def operate(self, cpu) -> int:
+        cpu.fetch()
+        tmp = cpu._fetched << 1
 
-        self.cpu.set_flag('c', (tmp.value & 0xff00) > 0)
-        self.cpu.set_flag('z', (tmp.value & 0xff) == 0)
-        self.cpu.set_flag('n', bool(tmp.value & 0x80))
+        cpu.set_flag('c', (tmp & 0xff00) > 0)
+        cpu.set_flag('z', (tmp & 0xff) == 0)
+        cpu.set_flag('n', bool(tmp & 0x80))
 
-        result = c_uint8(tmp.value & 0x00ff)
-        if self.cpu.lookup[self.cpu.opcode.value].addr_mode == address_modes.am_imp:
-            self.cpu.a.value = result.value
+        result = tmp & 0x00ff
+        if self.addr_mode is address_modes.am_imp:
+            cpu._a = result
         else:
-            self.cpu.write(self.cpu.addr_abs, result)
+            cpu.write(cpu._addr_abs, result)
 
-        return c_uint8(0)
+        return 0
 
     @staticmethod
-    def opcodes_mapping(cpu) -> Dict[int, Cpu6502Instruction]:
+    def opcodes_mapping() -> Dict[int, Cpu6502Instruction]:
         return {
-            0x0a: ASL(cpu, cycles=c_uint8(2), addr_mode=address_modes.am_imp),
-            0x06: ASL(cpu, cycles=c_uint8(5), addr_mode=address_modes.am_zp0),
-            0x16: ASL(cpu, cycles=c_uint8(6), addr_mode=address_modes.am_zpx),
-            0x0e: ASL(cpu, cycles=c_uint8(6), addr_mode=address_modes.am_abs),
-            0x1e: ASL(cpu, cycles=c_uint8(7), addr_mode=address_modes.am_abx),
+            0x0a: ASL(cycles=2, addr_mode=address_modes.am_imp),
+            0x06: ASL(cycles=5, addr_mode=address_modes.am_zp0),
+            0x16: ASL(cycles=6, addr_mode=address_modes.am_zpx),
+            0x0e: ASL(cycles=6, addr_mode=address_modes.am_abs),
+            0x1e: ASL(cycles=7, addr_mode=address_modes.am_abx),
         }
 
 
@@ -145,22 +147,22 @@ class BCC(Cpu6502Instruction):
     Branch if Carry Clear: if C not set then add relative address to PC to cause a branch to new location
     """
 
-    def operate(self) -> c_uint8:
-        if not self.cpu.get_flag('c'):
-            self.cpu.cycles.value += 1
-            self.cpu.addr_abs.value = self.cpu.pc.value + self.cpu.addr_rel.value
+    def operate(self, cpu) -> int:
+        if not cpu._status & FLAG_C:
+            cpu._cycles += 1
+            cpu._addr_abs = (cpu._pc + cpu._addr_rel) & 0xffff
 
-            cross_page_bound = (self.cpu.addr_abs.value & 0xff00) != (self.cpu.pc.value & 0xff00)
+            cross_page_bound = (cpu._addr_abs & 0xff00) != (cpu._pc & 0xff00)
             if cross_page_bound:
-                self.cpu.cycles.value += 1
+                cpu._cycles += 1
 
-            self.cpu.pc.value = self.cpu.addr_abs.value
-        return c_uint8(0)
+            cpu._pc = cpu._addr_abs
+        return 0
 
     @staticmethod
-    def opcodes_mapping(cpu) -> Dict[int, Cpu6502Instruction]:
+    def opcodes_mapping() -> Dict[int, Cpu6502Instruction]:
         return {
-            0x90: BCC(cpu, cycles=c_uint8(2), addr_mode=address_modes.am_rel)
+            0x90: BCC(cycles=2, addr_mode=address_modes.am_rel)
         }
 
 
@@ -169,22 +171,22 @@ class BCS(Cpu6502Instruction):
     Branch if Carry Set: if C set then add relative address to PC to cause a branch to new location
     """
 
-    def operate(self) -> c_uint8:
-        if self.cpu.get_flag('c'):
-            self.cpu.cycles.value += 1
-            self.cpu.addr_abs.value = self.cpu.pc.value + self.cpu.addr_rel.value
+    def operate(self, cpu) -> int:
+        if cpu._status & FLAG_C:
+            cpu._cycles += 1
+            cpu._addr_abs = (cpu._pc + cpu._addr_rel) & 0xffff
 
-            cross_page_bound = (self.cpu.addr_abs.value & 0xff00) != (self.cpu.pc.value & 0xff00)
+            cross_page_bound = (cpu._addr_abs & 0xff00) != (cpu._pc & 0xff00)
             if cross_page_bound:
-                self.cpu.cycles.value += 1
+                cpu._cycles += 1
 
-            self.cpu.pc.value = self.cpu.addr_abs.value
-        return c_uint8(0)
+            cpu._pc = cpu._addr_abs
+        return 0
 
     @staticmethod
-    def opcodes_mapping(cpu) -> Dict[int, Cpu6502Instruction]:
+    def opcodes_mapping() -> Dict[int, Cpu6502Instruction]:
         return {
-            0xb0: BCS(cpu, cycles=c_uint8(2), addr_mode=address_modes.am_rel)
+            0xb0: BCS(cycles=2, addr_mode=address_modes.am_rel)
         }
 
 
@@ -194,22 +196,22 @@ class BEQ(Cpu6502Instruction):
     to the program counter to cause a branch to a new location.
     """
 
-    def operate(self) -> c_uint8:
-        if self.cpu.get_flag('z'):
-            self.cpu.cycles.value += 1
-            self.cpu.addr_abs.value = self.cpu.pc.value + self.cpu.addr_rel.value
+    def operate(self, cpu) -> int:
+        if cpu._status & FLAG_Z:
+            cpu._cycles += 1
+            cpu._addr_abs = (cpu._pc + cpu._addr_rel) & 0xffff
 
-            cross_page_bound = (self.cpu.addr_abs.value & 0xff00) != (self.cpu.pc.value & 0xff00)
+            cross_page_bound = (cpu._addr_abs & 0xff00) != (cpu._pc & 0xff00)
             if cross_page_bound:
-                self.cpu.cycles.value += 1
+                cpu._cycles += 1
 
-            self.cpu.pc.value = self.cpu.addr_abs.value
-        return c_uint8(0)
+            cpu._pc = cpu._addr_abs
+        return 0
 
     @staticmethod
-    def opcodes_mapping(cpu) -> Dict[int, Cpu6502Instruction]:
+    def opcodes_mapping() -> Dict[int, Cpu6502Instruction]:
         return {
-            0xf0: BEQ(cpu, cycles=c_uint8(2), addr_mode=address_modes.am_rel)
+            0xf0: BEQ(cycles=2, addr_mode=address_modes.am_rel)
         }
 
 
@@ -221,21 +223,21 @@ class BIT(Cpu6502Instruction):
     memory are copied into the N and V flags.
     """
 
-    def operate(self) -> c_uint8:
-        self.cpu.fetch()
-        tmp = self.cpu.a.value & self.cpu.fetched.value
+    def operate(self, cpu) -> int:
+        cpu.fetch()
+        tmp = cpu._a & cpu._fetched
 
-        self.cpu.set_flag('z', (tmp & 0xff) == 0)
-        self.cpu.set_flag('n', bool(self.cpu.fetched.value & (1 << 7)))
-        self.cpu.set_flag('v', bool(self.cpu.fetched.value & (1 << 6)))
+        cpu.set_flag('z', (tmp & 0xff) == 0)
+        cpu.set_flag('n', bool(cpu._fetched & (1 << 7)))
+        cpu.set_flag('v', bool(cpu._fetched & (1 << 6)))
 
-        return c_uint8(0)
+        return 0
 
     @staticmethod
-    def opcodes_mapping(cpu) -> Dict[int, Cpu6502Instruction]:
+    def opcodes_mapping() -> Dict[int, Cpu6502Instruction]:
         return {
-            0x24: BIT(cpu, cycles=c_uint8(3), addr_mode=address_modes.am_zp0),
-            0x2c: BIT(cpu, cycles=c_uint8(4), addr_mode=address_modes.am_abs),
+            0x24: BIT(cycles=3, addr_mode=address_modes.am_zp0),
+            0x2c: BIT(cycles=4, addr_mode=address_modes.am_abs),
         }
 
 
@@ -245,22 +247,22 @@ class BMI(Cpu6502Instruction):
     to the program counter to cause a branch to a new location.
     """
 
-    def operate(self) -> c_uint8:
-        if self.cpu.get_flag('n'):
-            self.cpu.cycles.value += 1
-            self.cpu.addr_abs.value = self.cpu.pc.value + self.cpu.addr_rel.value
+    def operate(self, cpu) -> int:
+        if cpu._status & FLAG_N:
+            cpu._cycles += 1
+            cpu._addr_abs = (cpu._pc + cpu._addr_rel) & 0xffff
 
-            cross_page_bound = (self.cpu.addr_abs.value & 0xff00) != (self.cpu.pc.value & 0xff00)
+            cross_page_bound = (cpu._addr_abs & 0xff00) != (cpu._pc & 0xff00)
             if cross_page_bound:
-                self.cpu.cycles.value += 1
+                cpu._cycles += 1
 
-            self.cpu.pc.value = self.cpu.addr_abs.value
-        return c_uint8(0)
+            cpu._pc = cpu._addr_abs
+        return 0
 
     @staticmethod
-    def opcodes_mapping(cpu) -> Dict[int, Cpu6502Instruction]:
+    def opcodes_mapping() -> Dict[int, Cpu6502Instruction]:
         return {
-            0x30: BMI(cpu, cycles=c_uint8(2), addr_mode=address_modes.am_rel)
+            0x30: BMI(cycles=2, addr_mode=address_modes.am_rel)
         }
 
 
@@ -270,22 +272,22 @@ class BNE(Cpu6502Instruction):
     to the program counter to cause a branch to a new location.
     """
 
-    def operate(self) -> c_uint8:
-        if not self.cpu.get_flag('z'):
-            self.cpu.cycles.value += 1
-            self.cpu.addr_abs.value = self.cpu.pc.value + self.cpu.addr_rel.value
+    def operate(self, cpu) -> int:
+        if not cpu._status & FLAG_Z:
+            cpu._cycles += 1
+            cpu._addr_abs = (cpu._pc + cpu._addr_rel) & 0xffff
 
-            cross_page_bound = (self.cpu.addr_abs.value & 0xff00) != (self.cpu.pc.value & 0xff00)
+            cross_page_bound = (cpu._addr_abs & 0xff00) != (cpu._pc & 0xff00)
             if cross_page_bound:
-                self.cpu.cycles.value += 1
+                cpu._cycles += 1
 
-            self.cpu.pc.value = self.cpu.addr_abs.value
-        return c_uint8(0)
+            cpu._pc = cpu._addr_abs
+        return 0
 
     @staticmethod
-    def opcodes_mapping(cpu) -> Dict[int, Cpu6502Instruction]:
+    def opcodes_mapping() -> Dict[int, Cpu6502Instruction]:
         return {
-            0xd0: BNE(cpu, cycles=c_uint8(2), addr_mode=address_modes.am_rel)
+            0xd0: BNE(cycles=2, addr_mode=address_modes.am_rel)
         }
 
 
@@ -295,22 +297,22 @@ class BPL(Cpu6502Instruction):
     to the program counter to cause a branch to a new location.
     """
 
-    def operate(self) -> c_uint8:
-        if not self.cpu.get_flag('n'):
-            self.cpu.cycles.value += 1
-            self.cpu.addr_abs.value = self.cpu.pc.value + self.cpu.addr_rel.value
+    def operate(self, cpu) -> int:
+        if not cpu._status & FLAG_N:
+            cpu._cycles += 1
+            cpu._addr_abs = (cpu._pc + cpu._addr_rel) & 0xffff
 
-            cross_page_bound = (self.cpu.addr_abs.value & 0xff00) != (self.cpu.pc.value & 0xff00)
+            cross_page_bound = (cpu._addr_abs & 0xff00) != (cpu._pc & 0xff00)
             if cross_page_bound:
-                self.cpu.cycles.value += 1
+                cpu._cycles += 1
 
-            self.cpu.pc.value = self.cpu.addr_abs.value
-        return c_uint8(0)
+            cpu._pc = cpu._addr_abs
+        return 0
 
     @staticmethod
-    def opcodes_mapping(cpu) -> Dict[int, Cpu6502Instruction]:
+    def opcodes_mapping() -> Dict[int, Cpu6502Instruction]:
         return {
-            0x10: BPL(cpu, cycles=c_uint8(2), addr_mode=address_modes.am_rel)
+            0x10: BPL(cycles=2, addr_mode=address_modes.am_rel)
         }
 
 
@@ -321,31 +323,21 @@ class BRK(Cpu6502Instruction):
     vector at $FFFE/F is loaded into the PC and the break flag in the status set to one.
     """
 
-    def operate(self) -> c_uint8:
-        self.cpu.pc.value += 1
-
-        self.cpu.set_flag('i', True)
-        self.cpu.write(c_uint16(0x0100 + self.cpu.sp.value),
-                       c_uint8((self.cpu.pc.value >> 8) & 0x00ff))
-        self.cpu.sp.value -= 1
-        self.cpu.write(c_uint16(0x0100 + self.cpu.sp.value),
-                       c_uint8(self.cpu.pc.value & 0x00ff))
-        self.cpu.sp.value -= 1
+    def operate(self, cpu) -> int:
+        cpu._pc = (cpu._pc + 1) & 0xffff
 
-        self.cpu.set_flag('b', True)
-        self.cpu.write(c_uint16(0x0100 + self.cpu.sp.value), self.cpu.status)
-        self.cpu.sp.value -= 1
-        self.cpu.set_flag('b', False)
+        cpu.push(cpu._pc >> 8)
+        cpu.push(cpu._pc & 0x00ff)
+        cpu.push(cpu._status | FLAG_B | FLAG_U)
+        cpu.set_flag('i', True)
 
-        self.cpu.pc.value = c_uint16(
-            self.cpu.read(c_uint16(0xfffe)).value | (self.cpu.read(c_uint16(0xffff)).value << 8)
-        ).value
-        return c_uint8(0)
+        cpu._pc = cpu.read(0xfffe) | (cpu.read(0xffff) << 8)
+        return 0
 
     @staticmethod
-    def opcodes_mapping(cpu) -> Dict[int, Cpu6502Instruction]:
+    def opcodes_mapping() -> Dict[int, Cpu6502Instruction]:
         return {
-            0x00: BRK(cpu, cycles=c_uint8(7), addr_mode=address_modes.am_imp)
+            0x00: BRK(cycles=7, addr_mode=address_modes.am_imp)
         }
 
 
@@ -355,22 +347,22 @@ class BVC(Cpu6502Instruction):
     to the program counter to cause a branch to a new location.
     """
 
-    def operate(self) -> c_uint8:
-        if not self.cpu.get_flag('v'):
-            self.cpu.cycles.value += 1
-            self.cpu.addr_abs.value = self.cpu.pc.value + self.cpu.addr_rel.value
+    def operate(self, cpu) -> int:
+        if not cpu._status & FLAG_V:
+            cpu._cycles += 1
+            cpu._addr_abs = (cpu._pc + cpu._addr_rel) & 0xffff
 
-            cross_page_bound = (self.cpu.addr_abs.value & 0xff00) != (self.cpu.pc.value & 0xff00)
+            cross_page_bound = (cpu._addr_abs & 0xff00) != (cpu._pc & 0xff00)
             if cross_page_bound:
-                self.cpu.cycles.value += 1
+                cpu._cycles += 1
 
-            self.cpu.pc.value = self.cpu.addr_abs.value
-        return c_uint8(0)
+            cpu._pc = cpu._addr_abs
+        return 0
 
     @staticmethod
-    def opcodes_mapping(cpu) -> Dict[int, Cpu6502Instruction]:
+    def opcodes_mapping() -> Dict[int, Cpu6502Instruction]:
         return {
-            0x50: BVC(cpu, cycles=c_uint8(2), addr_mode=address_modes.am_rel)
+            0x50: BVC(cycles=2, addr_mode=address_modes.am_rel)
         }
 
 
@@ -380,22 +372,22 @@ class BVS(Cpu6502Instruction):
     to the program counter to cause a branch to a new location.
     """
 
-    def operate(self) -> c_uint8:
-        if self.cpu.get_flag('v'):
-            self.cpu.cycles.value += 1
-            self.cpu.addr_abs.value = self.cpu.pc.value + self.cpu.addr_rel.value
+    def operate(self, cpu) -> int:
+        if cpu._status & FLAG_V:
+            cpu._cycles += 1
+            cpu._addr_abs = (cpu._pc + cpu._addr_rel) & 0xffff
 
-            cross_page_bound = (self.cpu.addr_abs.value & 0xff00) != (self.cpu.pc.value & 0xff00)
+            cross_page_bound = (cpu._addr_abs & 0xff00) != (cpu._pc & 0xff00)
             if cross_page_bound:
-                self.cpu.cycles.value += 1
+                cpu._cycles += 1
 
-            self.cpu.pc.value = self.cpu.addr_abs.value
-        return c_uint8(0)
+            cpu._pc = cpu._addr_abs
+        return 0
 
     @staticmethod
-    def opcodes_mapping(cpu) -> Dict[int, Cpu6502Instruction]:
+    def opcodes_mapping() -> Dict[int, Cpu6502Instruction]:
         return {
-            0x70: BVS(cpu, cycles=c_uint8(2), addr_mode=address_modes.am_rel)
+            0x70: BVS(cycles=2, addr_mode=address_modes.am_rel)
         }
 
 
@@ -404,14 +396,14 @@ class CLC(Cpu6502Instruction):
     Clear Carry Flag: Set the carry flag to zero.
     """
 
-    def operate(self) -> c_uint8:
-        self.cpu.set_flag('c', False)
-        return c_uint8(0)
+    def operate(self, cpu) -> int:
+        cpu.set_flag('c', False)
+        return 0
 
     @staticmethod
-    def opcodes_mapping(cpu) -> Dict[int, Cpu6502Instruction]:
+    def opcodes_mapping() -> Dict[int, Cpu6502Instruction]:
         return {
-            0x18: CLC(cpu, cycles=c_uint8(2), addr_mode=address_modes.am_imp)
+            0x18: CLC(cycles=2, addr_mode=address_modes.am_imp)
         }
 
 
@@ -420,14 +412,14 @@ class CLD(Cpu6502Instruction):
     Clear Decimal Mode: Sets the decimal mode flag to zero.
     """
 
-    def operate(self) -> c_uint8:
-        self.cpu.set_flag('d', False)
-        return c_uint8(0)
+    def operate(self, cpu) -> int:
+        cpu.set_flag('d', False)
+        return 0
 
     @staticmethod
-    def opcodes_mapping(cpu) -> Dict[int, Cpu6502Instruction]:
+    def opcodes_mapping() -> Dict[int, Cpu6502Instruction]:
         return {
-            0xd8: CLD(cpu, cycles=c_uint8(2), addr_mode=address_modes.am_imp)
+            0xd8: CLD(cycles=2, addr_mode=address_modes.am_imp)
         }
 
 
@@ -437,14 +429,14 @@ class CLI(Cpu6502Instruction):
     interrupt requests to be serviced.
     """
 
-    def operate(self) -> c_uint8:
-        self.cpu.set_flag('i', False)
-        return c_uint8(0)
+    def operate(self, cpu) -> int:
+        cpu.set_flag('i', False)
+        return 0
 
     @staticmethod
-    def opcodes_mapping(cpu) -> Dict[int, Cpu6502Instruction]:
+    def opcodes_mapping() -> Dict[int, Cpu6502Instruction]:
         return {
-            0x58: CLI(cpu, cycles=c_uint8(2), addr_mode=address_modes.am_imp)
+            0x58: CLI(cycles=2, addr_mode=address_modes.am_imp)
         }
 
 
@@ -453,14 +445,14 @@ class CLV(Cpu6502Instruction):
     Clear Overflow Flag: Clears the overflow flag.
     """
 
-    def operate(self) -> c_uint8:
-        self.cpu.set_flag('v', False)
-        return c_uint8(0)
+    def operate(self, cpu) -> int:
+        cpu.set_flag('v', False)
+        return 0
 
     @staticmethod
-    def opcodes_mapping(cpu) -> Dict[int, Cpu6502Instruction]:
+    def opcodes_mapping() -> Dict[int, Cpu6502Instruction]:
         return {
-            0xb8: CLV(cpu, cycles=c_uint8(2), addr_mode=address_modes.am_imp)
+            0xb8: CLV(cycles=2, addr_mode=address_modes.am_imp)
         }
 
 
@@ -470,27 +462,27 @@ class CMP(Cpu6502Instruction):
     held value and sets the zero and carry flags as appropriate.
     """
 
-    def operate(self) -> c_uint8:
-        self.cpu.fetch()
-        tmp = self.cpu.a.value - self.cpu.fetched.value
+    def operate(self, cpu) -> int:
+        cpu.fetch()
+        tmp = cpu._a - cpu._fetched
 
-        self.cpu.set_flag('c', self.cpu.a.value >= self.cpu.fetched.value)
-        self.cpu.set_flag('z', (tmp & 0xff) == 0x00)
-        self.cpu.set_flag('n', bool(tmp & 0x80))
+        cpu.set_flag('c', cpu._a >= cpu._fetched)
+        cpu.set_flag('z', (tmp & 0xff) == 0x00)
+        cpu.set_flag('n', bool(tmp & 0x80))
 
-        return c_uint8(1)
+        return 1
 
     @staticmethod
-    def opcodes_mapping(cpu) -> Dict[int, Cpu6502Instruction]:
+    def opcodes_mapping() -> Dict[int, Cpu6502Instruction]:
         return {
-            0xc9: CMP(cpu, cycles=c_uint8(2), addr_mode=address_modes.am_imm),
-            0xc5: CMP(cpu, cycles=c_uint8(3), addr_mode=address_modes.am_zp0),
-            0xd5: CMP(cpu, cycles=c_uint8(4), addr_mode=address_modes.am_zpx),
-            0xcd: CMP(cpu, cycles=c_uint8(4), addr_mode=address_modes.am_abs),
-            0xdd: CMP(cpu, cycles=c_uint8(4), addr_mode=address_modes.am_abx),
-            0xd9: CMP(cpu, cycles=c_uint8(4), addr_mode=address_modes.am_aby),
-            0xc1: CMP(cpu, cycles=c_uint8(6), addr_mode=address_modes.am_izx),
-            0xd1: CMP(cpu, cycles=c_uint8(5), addr_mode=address_modes.am_izy),
+            0xc9: CMP(cycles=2, addr_mode=address_modes.am_imm),
+            0xc5: CMP(cycles=3, addr_mode=address_modes.am_zp0),
+            0xd5: CMP(cycles=4, addr_mode=address_modes.am_zpx),
+            0xcd: CMP(cycles=4, addr_mode=address_modes.am_abs),
+            0xdd: CMP(cycles=4, addr_mode=address_modes.am_abx),
+            0xd9: CMP(cycles=4, addr_mode=address_modes.am_aby),
+            0xc1: CMP(cycles=6, addr_mode=address_modes.am_izx),
+            0xd1: CMP(cycles=5, addr_mode=address_modes.am_izy),
         }
 
 
@@ -500,22 +492,22 @@ class CPX(Cpu6502Instruction):
     memory held value and sets the zero and carry flags as appropriate.
     """
 
-    def operate(self) -> c_uint8:
-        self.cpu.fetch()
-        tmp = self.cpu.x.value - self.cpu.fetched.value
+    def operate(self, cpu) -> int:
+        cpu.fetch()
+        tmp = cpu._x - cpu._fetched
 
-        self.cpu.set_flag('c', self.cpu.x.value >= self.cpu.fetched.value)
-        self.cpu.set_flag('z', (tmp & 0xff) == 0x00)
-        self.cpu.set_flag('n', bool(tmp & 0x80))
+        cpu.set_flag('c', cpu._x >= cpu._fetched)
+        cpu.set_flag('z', (tmp & 0xff) == 0x00)
+        cpu.set_flag('n', bool(tmp & 0x80))
 
-        return c_uint8(1)
+        return 1
 
     @staticmethod
-    def opcodes_mapping(cpu) -> Dict[int, Cpu6502Instruction]:
+    def opcodes_mapping() -> Dict[int, Cpu6502Instruction]:
         return {
-            0xe0: CPX(cpu, cycles=c_uint8(2), addr_mode=address_modes.am_imm),
-            0xe4: CPX(cpu, cycles=c_uint8(3), addr_mode=address_modes.am_zp0),
-            0xec: CPX(cpu, cycles=c_uint8(4), addr_mode=address_modes.am_abs),
+            0xe0: CPX(cycles=2, addr_mode=address_modes.am_imm),
+            0xe4: CPX(cycles=3, addr_mode=address_modes.am_zp0),
+            0xec: CPX(cycles=4, addr_mode=address_modes.am_abs),
         }
 
 
@@ -525,22 +517,22 @@ class CPY(Cpu6502Instruction):
     memory held value and sets the zero and carry flags as appropriate.
     """
 
-    def operate(self) -> c_uint8:
-        self.cpu.fetch()
-        tmp = self.cpu.y.value - self.cpu.fetched.value
+    def operate(self, cpu) -> int:
+        cpu.fetch()
+        tmp = cpu._y - cpu._fetched
 
-        self.cpu.set_flag('c', self.cpu.y.value >= self.cpu.fetched.value)
-        self.cpu.set_flag('z', (tmp & 0xff) == 0x00)
-        self.cpu.set_flag('n', bool(tmp & 0x80))
+        cpu.set_flag('c', cpu._y >= cpu._fetched)
+        cpu.set_flag('z', (tmp & 0xff) == 0x00)
+        cpu.set_flag('n', bool(tmp & 0x80))
 
-        return c_uint8(1)
+        return 1
 
     @staticmethod
-    def opcodes_mapping(cpu) -> Dict[int, Cpu6502Instruction]:
+    def opcodes_mapping() -> Dict[int, Cpu6502Instruction]:
         return {
-            0xc0: CPY(cpu, cycles=c_uint8(2), addr_mode=address_modes.am_imm),
-            0xc4: CPY(cpu, cycles=c_uint8(3), addr_mode=address_modes.am_zp0),
-            0xcc: CPY(cpu, cycles=c_uint8(4), addr_mode=address_modes.am_abs),
+            0xc0: CPY(cycles=2, addr_mode=address_modes.am_imm),
+            0xc4: CPY(cycles=3, addr_mode=address_modes.am_zp0),
+            0xcc: CPY(cycles=4, addr_mode=address_modes.am_abs),
         }
 
 
@@ -550,23 +542,23 @@ class DEC(Cpu6502Instruction):
     the zero and negative flags as appropriate.
     """
 
-    def operate(self) -> c_uint8:
-        self.cpu.fetch()
+    def operate(self, cpu) -> int:
+        cpu.fetch()
 
-        tmp = self.cpu.fetched.value - 1
-        self.cpu.write(self.cpu.addr_abs, c_uint8(tmp))
-        self.cpu.set_flag('z', (tmp & 0xff) == 0)
-        self.cpu.set_flag('n', bool(tmp & 0x80))
+        tmp = (cpu._fetched - 1) & 0xff
+        cpu.write(cpu._addr_abs, tmp)
+        cpu.set_flag('z', tmp == 0)
+        cpu.set_flag('n', bool(tmp & 0x80))
 
-        return c_uint8(0)
+        return 0
 
     @staticmethod
-    def opcodes_mapping(cpu) -> Dict[int, Cpu6502Instruction]:
+    def opcodes_mapping() -> Dict[int, Cpu6502Instruction]:
         return {
-            0xc6: DEC(cpu, cycles=c_uint8(5), addr_mode=address_modes.am_zp0),
-            0xd6: DEC(cpu, cycles=c_uint8(6), addr_mode=address_modes.am_zpx),
-            0xce: DEC(cpu, cycles=c_uint8(6), addr_mode=address_modes.am_abs),
-            0xde: DEC(cpu, cycles=c_uint8(7), addr_mode=address_modes.am_abx),
+            0xc6: DEC(cycles=5, addr_mode=address_modes.am_zp0),
+            0xd6: DEC(cycles=6, addr_mode=address_modes.am_zpx),
+            0xce: DEC(cycles=6, addr_mode=address_modes.am_abs),
+            0xde: DEC(cycles=7, addr_mode=address_modes.am_abx),
         }
 
 
@@ -576,16 +568,16 @@ class DEX(Cpu6502Instruction):
     flags as appropriate.
     """
 
-    def operate(self) -> c_uint8:
-        self.cpu.x.value -= 1
-        self.cpu.set_flag('z', (self.cpu.x.value & 0xff) == 0)
-        self.cpu.set_flag('n', bool(self.cpu.x.value & 0x80))
-        return c_uint8(0)
+    def operate(self, cpu) -> int:
+        cpu._x = (cpu._x - 1) & 0xff
+        cpu.set_flag('z', cpu._x == 0)
+        cpu.set_flag('n', bool(cpu._x & 0x80))
+        return 0
 
     @staticmethod
-    def opcodes_mapping(cpu) -> Dict[int, Cpu6502Instruction]:
+    def opcodes_mapping() -> Dict[int, Cpu6502Instruction]:
         return {
-            0xca: DEX(cpu, cycles=c_uint8(2), addr_mode=address_modes.am_imp)
+            0xca: DEX(cycles=2, addr_mode=address_modes.am_imp)
         }
 
 
@@ -595,16 +587,16 @@ class DEY(Cpu6502Instruction):
     flags as appropriate.
     """
 
-    def operate(self) -> c_uint8:
-        self.cpu.y.value -= 1
-        self.cpu.set_flag('z', (self.cpu.y.value & 0xff) == 0)
-        self.cpu.set_flag('n', bool(self.cpu.y.value & 0x80))
-        return c_uint8(0)
+    def operate(self, cpu) -> int:
+        cpu._y = (cpu._y - 1) & 0xff
+        cpu.set_flag('z', cpu._y == 0)
+        cpu.set_flag('n', bool(cpu._y & 0x80))
+        return 0
 
     @staticmethod
-    def opcodes_mapping(cpu) -> Dict[int, Cpu6502Instruction]:
+    def opcodes_mapping() -> Dict[int, Cpu6502Instruction]:
         return {
-            0x88: DEY(cpu, cycles=c_uint8(2), addr_mode=address_modes.am_imp)
+            0x88: DEY(cycles=2, addr_mode=address_modes.am_imp)
         }
 
 
@@ -614,25 +606,25 @@ class EOR(Cpu6502Instruction):
     using the contents of a byte of memory.
     """
 
-    def operate(self) -> c_uint8:
-        self.cpu.fetch()
-        self.cpu.a.value ^= self.cpu.fetched.value
+    def operate(self, cpu) -> int:
+        cpu.fetch()
+        cpu._a ^= cpu._fetched
 
-        self.cpu.set_flag('z', self.cpu.a.value == 0x00)
-        self.cpu.set_flag('n', bool(self.cpu.a.value & 0x80))
-        return c_uint8(1)
+        cpu.set_flag('z', cpu._a == 0x00)
+        cpu.set_flag('n', bool(cpu._a & 0x80))
+        return 1
 
     @staticmethod
-    def opcodes_mapping(cpu) -> Dict[int, Cpu6502Instruction]:
+    def opcodes_mapping() -> Dict[int, Cpu6502Instruction]:
         return {
-            0x49: EOR(cpu, cycles=c_uint8(2), addr_mode=address_modes.am_imm),
-            0x45: EOR(cpu, cycles=c_uint8(3), addr_mode=address_modes.am_zp0),
-            0x55: EOR(cpu, cycles=c_uint8(4), addr_mode=address_modes.am_zpx),
-            0x4d: EOR(cpu, cycles=c_uint8(4), addr_mode=address_modes.am_abs),
-            0x5d: EOR(cpu, cycles=c_uint8(4), addr_mode=address_modes.am_abx),
-            0x59: EOR(cpu, cycles=c_uint8(4), addr_mode=address_modes.am_aby),
-            0x41: EOR(cpu, cycles=c_uint8(6), addr_mode=address_modes.am_izx),
-            0x51: EOR(cpu, cycles=c_uint8(5), addr_mode=address_modes.am_izy),
+            0x49: EOR(cycles=2, addr_mode=address_modes.am_imm),
+            0x45: EOR(cycles=3, addr_mode=address_modes.am_zp0),
+            0x55: EOR(cycles=4, addr_mode=address_modes.am_zpx),
+            0x4d: EOR(cycles=4, addr_mode=address_modes.am_abs),
+            0x5d: EOR(cycles=4, addr_mode=address_modes.am_abx),
+            0x59: EOR(cycles=4, addr_mode=address_modes.am_aby),
+            0x41: EOR(cycles=6, addr_mode=address_modes.am_izx),
+            0x51: EOR(cycles=5, addr_mode=address_modes.am_izy),
         }
 
 
@@ -642,22 +634,22 @@ class INC(Cpu6502Instruction):
     the zero and negative flags as appropriate.
     """
 
-    def operate(self) -> c_uint8:
-        self.cpu.fetch()
+    def operate(self, cpu) -> int:
+        cpu.fetch()
 
-        tmp = self.cpu.fetched.value + 1
-        self.cpu.write(self.cpu.addr_abs, c_uint8(tmp))
-        self.cpu.set_flag('z', (tmp & 0xff) == 0)
-        self.cpu.set_flag('n', bool(tmp & 0x80))
-        return c_uint8(0)
+        tmp = (cpu._fetched + 1) & 0xff
+        cpu.write(cpu._addr_abs, tmp)
+        cpu.set_flag('z', tmp == 0)
+        cpu.set_flag('n', bool(tmp & 0x80))
+        return 0
 
     @staticmethod
-    def opcodes_mapping(cpu) -> Dict[int, Cpu6502Instruction]:
+    def opcodes_mapping() -> Dict[int, Cpu6502Instruction]:
         return {
-            0xe6: INC(cpu, cycles=c_uint8(5), addr_mode=address_modes.am_zp0),
-            0xf6: INC(cpu, cycles=c_uint8(6), addr_mode=address_modes.am_zpx),
-            0xee: INC(cpu, cycles=c_uint8(6), addr_mode=address_modes.am_abs),
-            0xfe: INC(cpu, cycles=c_uint8(7), addr_mode=address_modes.am_abx),
+            0xe6: INC(cycles=5, addr_mode=address_modes.am_zp0),
+            0xf6: INC(cycles=6, addr_mode=address_modes.am_zpx),
+            0xee: INC(cycles=6, addr_mode=address_modes.am_abs),
+            0xfe: INC(cycles=7, addr_mode=address_modes.am_abx),
         }
 
 
@@ -667,16 +659,16 @@ class INX(Cpu6502Instruction):
     as appropriate.
     """
 
-    def operate(self) -> c_uint8:
-        self.cpu.x.value += 1
-        self.cpu.set_flag('z', (self.cpu.x.value & 0xff) == 0)
-        self.cpu.set_flag('n', bool(self.cpu.x.value & 0x80))
-        return c_uint8(0)
+    def operate(self, cpu) -> int:
+        cpu._x = (cpu._x + 1) & 0xff
+        cpu.set_flag('z', cpu._x == 0)
+        cpu.set_flag('n', bool(cpu._x & 0x80))
+        return 0
 
     @staticmethod
-    def opcodes_mapping(cpu) -> Dict[int, Cpu6502Instruction]:
+    def opcodes_mapping() -> Dict[int, Cpu6502Instruction]:
         return {
-            0xe8: INX(cpu, cycles=c_uint8(2), addr_mode=address_modes.am_imp)
+            0xe8: INX(cycles=2, addr_mode=address_modes.am_imp)
         }
 
 
@@ -686,16 +678,16 @@ class INY(Cpu6502Instruction):
     as appropriate.
     """
 
-    def operate(self) -> c_uint8:
-        self.cpu.y.value += 1
-        self.cpu.set_flag('z', (self.cpu.y.value & 0xff) == 0)
-        self.cpu.set_flag('n', bool(self.cpu.y.value & 0x80))
-        return c_uint8(0)
+    def operate(self, cpu) -> int:
+        cpu._y = (cpu._y + 1) & 0xff
+        cpu.set_flag('z', cpu._y == 0)
+        cpu.set_flag('n', bool(cpu._y & 0x80))
+        return 0
 
     @staticmethod
-    def opcodes_mapping(cpu) -> Dict[int, Cpu6502Instruction]:
+    def opcodes_mapping() -> Dict[int, Cpu6502Instruction]:
         return {
-            0xc8: INY(cpu, cycles=c_uint8(2), addr_mode=address_modes.am_imp)
+            0xc8: INY(cycles=2, addr_mode=address_modes.am_imp)
         }
 
 
@@ -710,15 +702,15 @@ class JMP(Cpu6502Instruction):
     is not at the end of the page.
     """
 
-    def operate(self) -> c_uint8:
-        self.cpu.pc.value = self.cpu.addr_abs.value
-        return c_uint8(0)
+    def operate(self, cpu) -> int:
+        cpu._pc = cpu._addr_abs
+        return 0
 
     @staticmethod
-    def opcodes_mapping(cpu) -> Dict[int, Cpu6502Instruction]:
+    def opcodes_mapping() -> Dict[int, Cpu6502Instruction]:
         return {
-            0x4c: JMP(cpu, cycles=c_uint8(3), addr_mode=address_modes.am_abs),
-            0x6c: JMP(cpu, cycles=c_uint8(5), addr_mode=address_modes.am_ind),
+            0x4c: JMP(cycles=3, addr_mode=address_modes.am_abs),
+            0x6c: JMP(cycles=5, addr_mode=address_modes.am_ind),
         }
 
 
@@ -728,23 +720,19 @@ class JSR(Cpu6502Instruction):
     point on to the stack and then sets the program counter to the target memory address.
     """
 
-    def operate(self) -> c_uint8:
-        self.cpu.pc.value -= 1
+    def operate(self, cpu) -> int:
+        cpu._pc = (cpu._pc - 1) & 0xffff
 
-        self.cpu.write(c_uint16(0x0100 + self.cpu.sp.value),
-                       c_uint8((self.cpu.pc.value >> 8) & 0x00ff))
-        self.cpu.sp.value -= 1
-        self.cpu.write(c_uint16(0x0100 + self.cpu.sp.value),
-                       c_uint8(self.cpu.pc.value & 0x00ff))
-        self.cpu.sp.value -= 1
+        cpu.push(cpu._pc >> 8)
+        cpu.push(cpu._pc & 0x00ff)
 
-        self.cpu.pc.value = self.cpu.addr_abs.value
-        return c_uint8(0)
+        cpu._pc = cpu._addr_abs
+        return 0
 
     @staticmethod
-    def opcodes_mapping(cpu) -> Dict[int, Cpu6502Instruction]:
+    def opcodes_mapping() -> Dict[int, Cpu6502Instruction]:
         return {
-            0x20: JSR(cpu, cycles=c_uint8(6), addr_mode=address_modes.am_abs),
+            0x20: JSR(cycles=6, addr_mode=address_modes.am_abs),
         }
 
 
@@ -754,23 +742,23 @@ class LDA(Cpu6502Instruction):
     negative flags as appropriate.
     """
 
-    def operate(self) -> c_uint8:
-        self.cpu.a.value = self.cpu.fetch().value
-        self.cpu.set_flag('z', self.cpu.a.value == 0)
-        self.cpu.set_flag('n', bool(self.cpu.a.value & 0x80))
-        return c_uint8(1)
+    def operate(self, cpu) -> int:
+        cpu._a = cpu.fetch()
+        cpu.set_flag('z', cpu._a == 0)
+        cpu.set_flag('n', bool(cpu._a & 0x80))
+        return 1
 
     @staticmethod
-    def opcodes_mapping(cpu) -> Dict[int, Cpu6502Instruction]:
+    def opcodes_mapping() -> Dict[int, Cpu6502Instruction]:
         return {
-            0xa9: LDA(cpu, cycles=c_uint8(2), addr_mode=address_modes.am_imm),
-            0xa5: LDA(cpu, cycles=c_uint8(3), addr_mode=address_modes.am_zp0),
-            0xb5: LDA(cpu, cycles=c_uint8(4), addr_mode=address_modes.am_zpx),
-            0xad: LDA(cpu, cycles=c_uint8(4), addr_mode=address_modes.am_abs),
-            0xbd: LDA(cpu, cycles=c_uint8(4), addr_mode=address_modes.am_abx),
-            0xb9: LDA(cpu, cycles=c_uint8(4), addr_mode=address_modes.am_aby),
-            0xa1: LDA(cpu, cycles=c_uint8(6), addr_mode=address_modes.am_izx),
-            0xb1: LDA(cpu, cycles=c_uint8(5), addr_mode=address_modes.am_izy),
+            0xa9: LDA(cycles=2, addr_mode=address_modes.am_imm),
+            0xa5: LDA(cycles=3, addr_mode=address_modes.am_zp0),
+            0xb5: LDA(cycles=4, addr_mode=address_modes.am_zpx),
+            0xad: LDA(cycles=4, addr_mode=address_modes.am_abs),
+            0xbd: LDA(cycles=4, addr_mode=address_modes.am_abx),
+            0xb9: LDA(cycles=4, addr_mode=address_modes.am_aby),
+            0xa1: LDA(cycles=6, addr_mode=address_modes.am_izx),
+            0xb1: LDA(cycles=5, addr_mode=address_modes.am_izy),
         }
 
 
@@ -780,22 +768,20 @@ class LDX(Cpu6502Instruction):
     and negative flags as appropriate.
     """
 
-    def operate(self) -> c_uint8:
-        # self.cpu.x.value = self.cpu.fetch().value
-        self.cpu.fetch()
-        self.cpu.x.value = self.cpu.fetched.value
-        self.cpu.set_flag('z', self.cpu.x.value == 0)
-        self.cpu.set_flag('n', bool(self.cpu.x.value & 0x80))
-        return c_uint8(1)
+    def operate(self, cpu) -> int:
+        cpu._x = cpu.fetch()
+        cpu.set_flag('z', cpu._x == 0)
+        cpu.set_flag('n', bool(cpu._x & 0x80))
+        return 1
 
     @staticmethod
-    def opcodes_mapping(cpu) -> Dict[int, Cpu6502Instruction]:
+    def opcodes_mapping() -> Dict[int, Cpu6502Instruction]:
         return {
-            0xa2: LDX(cpu, cycles=c_uint8(2), addr_mode=address_modes.am_imm),
-            0xa6: LDX(cpu, cycles=c_uint8(3), addr_mode=address_modes.am_zp0),
-            0xb6: LDX(cpu, cycles=c_uint8(4), addr_mode=address_modes.am_zpy),
-            0xae: LDX(cpu, cycles=c_uint8(4), addr_mode=address_modes.am_abs),
-            0xbe: LDX(cpu, cycles=c_uint8(4), addr_mode=address_modes.am_aby),
+            0xa2: LDX(cycles=2, addr_mode=address_modes.am_imm),
+            0xa6: LDX(cycles=3, addr_mode=address_modes.am_zp0),
+            0xb6: LDX(cycles=4, addr_mode=address_modes.am_zpy),
+            0xae: LDX(cycles=4, addr_mode=address_modes.am_abs),
+            0xbe: LDX(cycles=4, addr_mode=address_modes.am_aby),
         }
 
 
@@ -805,20 +791,20 @@ class LDY(Cpu6502Instruction):
     and negative flags as appropriate.
     """
 
-    def operate(self) -> c_uint8:
-        self.cpu.y.value = self.cpu.fetch().value
-        self.cpu.set_flag('z', self.cpu.y.value == 0)
-        self.cpu.set_flag('n', bool(self.cpu.y.value & 0x80))
-        return c_uint8(1)
+    def operate(self, cpu) -> int:
+        cpu._y = cpu.fetch()
+        cpu.set_flag('z', cpu._y == 0)
+        cpu.set_flag('n', bool(cpu._y & 0x80))
+        return 1
 
     @staticmethod
-    def opcodes_mapping(cpu) -> Dict[int, Cpu6502Instruction]:
+    def opcodes_mapping() -> Dict[int, Cpu6502Instruction]:
         return {
-            0xa0: LDY(cpu, cycles=c_uint8(2), addr_mode=address_modes.am_imm),
-            0xa4: LDY(cpu, cycles=c_uint8(3), addr_mode=address_modes.am_zp0),
-            0xb4: LDY(cpu, cycles=c_uint8(4), addr_mode=address_modes.am_zpx),
-            0xac: LDY(cpu, cycles=c_uint8(4), addr_mode=address_modes.am_abs),
-            0xbc: LDY(cpu, cycles=c_uint8(4), addr_mode=address_modes.am_abx),
+            0xa0: LDY(cycles=2, addr_mode=address_modes.am_imm),
+            0xa4: LDY(cycles=3, addr_mode=address_modes.am_zp0),
+            0xb4: LDY(cycles=4, addr_mode=address_modes.am_zpx),
+            0xac: LDY(cycles=4, addr_mode=address_modes.am_abs),
+            0xbc: LDY(cycles=4, addr_mode=address_modes.am_abx),
         }
 
 
@@ -828,29 +814,28 @@ class LSR(Cpu6502Instruction):
     The bit that was in bit 0 is shifted into the carry flag. Bit 7 is set to zero.
     """
 
-    def operate(self) -> c_uint8:
-        self.cpu.fetch()
-        self.cpu.set_flag('c', bool(self.cpu.fetched.value & 0x0001))
-        tmp = c_uint16(self.cpu.fetched.value >> 1)
-        self.cpu.set_flag('z', (tmp.value & 0xff) == 0)
-        self.cpu.set_flag('n', bool(tmp.value & 0x80))
-        result = c_uint8(tmp.value & 0x00ff)
+    def operate(self, cpu) -> int:
+        cpu.fetch()
+        cpu.set_flag('c', bool(cpu._fetched & 0x0001))
+        result = cpu._fetched >> 1
+        cpu.set_flag('z', result == 0)
+        cpu.set_flag('n', False)
 
-        if self.cpu.lookup[self.cpu.opcode.value].addr_mode == address_modes.am_imp:
-            self.cpu.a.value = result.value
+        if self.addr_mode is address_modes.am_imp:
+            cpu._a = result
         else:
-            self.cpu.write(self.cpu.addr_abs, result)
+            cpu.write(cpu._addr_abs, result)
 
-        return c_uint8(1)
+        return 0
 
     @staticmethod
-    def opcodes_mapping(cpu) -> Dict[int, Cpu6502Instruction]:
+    def opcodes_mapping() -> Dict[int, Cpu6502Instruction]:
         return {
-            0x4a: LSR(cpu, cycles=c_uint8(2), addr_mode=address_modes.am_imm),
-            0x46: LSR(cpu, cycles=c_uint8(5), addr_mode=address_modes.am_zp0),
-            0x56: LSR(cpu, cycles=c_uint8(6), addr_mode=address_modes.am_zpx),
-            0x4e: LSR(cpu, cycles=c_uint8(6), addr_mode=address_modes.am_abs),
-            0x5e: LSR(cpu, cycles=c_uint8(7), addr_mode=address_modes.am_abx),
+            0x4a: LSR(cycles=2, addr_mode=address_modes.am_imp),
+            0x46: LSR(cycles=5, addr_mode=address_modes.am_zp0),
+            0x56: LSR(cycles=6, addr_mode=address_modes.am_zpx),
+            0x4e: LSR(cycles=6, addr_mode=address_modes.am_abs),
+            0x5e: LSR(cycles=7, addr_mode=address_modes.am_abx),
         }
 
 
@@ -860,13 +845,13 @@ class NOP(Cpu6502Instruction):
     than the normal incrementing of the program counter to the next instruction.
     """
 
-    def operate(self) -> c_uint8:
-        return c_uint8(1) if self.cpu.opcode.value in NOP.illegal_opcodes() else c_uint8(0)
+    def operate(self, cpu) -> int:
+        return 1 if cpu._opcode in NOP.illegal_opcodes() else 0
 
     @staticmethod
-    def opcodes_mapping(cpu) -> Dict[int, Cpu6502Instruction]:
+    def opcodes_mapping() -> Dict[int, Cpu6502Instruction]:
         return {
-            0xea: NOP(cpu, cycles=c_uint8(2), addr_mode=address_modes.am_imp)
+            0xea: NOP(cycles=2, addr_mode=address_modes.am_imp)
         }
 
     @staticmethod
@@ -880,24 +865,24 @@ class ORA(Cpu6502Instruction):
     accumulator contents using the contents of a byte of memory.
     """
 
-    def operate(self) -> c_uint8:
-        self.cpu.fetch()
-        self.cpu.a.value |= self.cpu.fetched.value
-        self.cpu.set_flag('z', self.cpu.a.value == 0)
-        self.cpu.set_flag('n', bool(self.cpu.a.value & 0x80))
-        return c_uint8(1)
+    def operate(self, cpu) -> int:
+        cpu.fetch()
+        cpu._a |= cpu._fetched
+        cpu.set_flag('z', cpu._a == 0)
+        cpu.set_flag('n', bool(cpu._a & 0x80))
+        return 1
 
     @staticmethod
-    def opcodes_mapping(cpu) -> Dict[int, Cpu6502Instruction]:
+    def opcodes_mapping() -> Dict[int, Cpu6502Instruction]:
         return {
-            0x09: ORA(cpu, cycles=c_uint8(2), addr_mode=address_modes.am_imm),
-            0x05: ORA(cpu, cycles=c_uint8(3), addr_mode=address_modes.am_zp0),
-            0x15: ORA(cpu, cycles=c_uint8(4), addr_mode=address_modes.am_zpx),
-            0x0d: ORA(cpu, cycles=c_uint8(4), addr_mode=address_modes.am_abs),
-            0x1d: ORA(cpu, cycles=c_uint8(4), addr_mode=address_modes.am_abx),
-            0x19: ORA(cpu, cycles=c_uint8(4), addr_mode=address_modes.am_aby),
-            0x01: ORA(cpu, cycles=c_uint8(6), addr_mode=address_modes.am_izx),
-            0x11: ORA(cpu, cycles=c_uint8(5), addr_mode=address_modes.am_izy),
+            0x09: ORA(cycles=2, addr_mode=address_modes.am_imm),
+            0x05: ORA(cycles=3, addr_mode=address_modes.am_zp0),
+            0x15: ORA(cycles=4, addr_mode=address_modes.am_zpx),
+            0x0d: ORA(cycles=4, addr_mode=address_modes.am_abs),
+            0x1d: ORA(cycles=4, addr_mode=address_modes.am_abx),
+            0x19: ORA(cycles=4, addr_mode=address_modes.am_aby),
+            0x01: ORA(cycles=6, addr_mode=address_modes.am_izx),
+            0x11: ORA(cycles=5, addr_mode=address_modes.am_izy),
         }
 
 
@@ -906,15 +891,14 @@ class PHA(Cpu6502Instruction):
     Push Accumulator: Pushes a copy of the accumulator on to the stack.
     """
 
-    def operate(self) -> c_uint8:
-        self.cpu.write(c_uint16(0x0100 + self.cpu.sp.value), self.cpu.a)
-        self.cpu.sp.value -= 1
-        return c_uint8(0)
+    def operate(self, cpu) -> int:
+        cpu.push(cpu._a)
+        return 0
 
     @staticmethod
-    def opcodes_mapping(cpu) -> Dict[int, Cpu6502Instruction]:
+    def opcodes_mapping() -> Dict[int, Cpu6502Instruction]:
         return {
-            0x48: PHA(cpu, cycles=c_uint8(3), addr_mode=address_modes.am_imp)
+            0x48: PHA(cycles=3, addr_mode=address_modes.am_imp)
         }
 
 
@@ -923,18 +907,14 @@ class PHP(Cpu6502Instruction):
     Push Processor Status: Pushes a copy of the status flags on to the stack.
     """
 
-    def operate(self) -> c_uint8:
-        b = get_mask('b')
-        u = get_mask('u')
-        self.cpu.write(c_uint16(0x0100 + self.cpu.sp.value), c_uint8(self.cpu.status.value | b | u))
-        self.cpu.set_flag('b', False)
-        self.cpu.set_flag('u', False)
-        return c_uint8(0)
+    def operate(self, cpu) -> int:
+        cpu.push(cpu._status | FLAG_B | FLAG_U)
+        return 0
 
     @staticmethod
-    def opcodes_mapping(cpu) -> Dict[int, Cpu6502Instruction]:
+    def opcodes_mapping() -> Dict[int, Cpu6502Instruction]:
         return {
-            0x08: PHP(cpu, cycles=c_uint8(3), addr_mode=address_modes.am_imp)
+            0x08: PHP(cycles=3, addr_mode=address_modes.am_imp)
         }
 
 
@@ -944,17 +924,16 @@ class PLA(Cpu6502Instruction):
     The zero and negative flags are set as appropriate.
     """
 
-    def operate(self) -> c_uint8:
-        self.cpu.sp.value += 1
-        self.cpu.a.value = self.cpu.read(c_uint16(0x0100 + self.cpu.sp.value)).value
-        self.cpu.set_flag('z', self.cpu.a.value == 0x00)
-        self.cpu.set_flag('n', bool(self.cpu.a.value & 0x80))
-        return c_uint8(0)
+    def operate(self, cpu) -> int:
+        cpu._a = cpu.pull()
+        cpu.set_flag('z', cpu._a == 0x00)
+        cpu.set_flag('n', bool(cpu._a & 0x80))
+        return 0
 
     @staticmethod
-    def opcodes_mapping(cpu) -> Dict[int, Cpu6502Instruction]:
+    def opcodes_mapping() -> Dict[int, Cpu6502Instruction]:
         return {
-            0x68: PLA(cpu, cycles=c_uint8(4), addr_mode=address_modes.am_imp)
+            0x68: PLA(cycles=4, addr_mode=address_modes.am_imp)
         }
 
 
@@ -964,16 +943,14 @@ class PLP(Cpu6502Instruction):
     flags. The flags will take on new states as determined by the value pulled.
     """
 
-    def operate(self) -> c_uint8:
-        self.cpu.sp.value += 1
-        self.cpu.status.value = self.cpu.read(c_uint16(0x0100 + self.cpu.sp.value))
-        self.cpu.set_flag('u', True)
-        return c_uint8(0)
+    def operate(self, cpu) -> int:
+        cpu._status = (cpu.pull() & ~FLAG_B) | FLAG_U
+        return 0
 
     @staticmethod
-    def opcodes_mapping(cpu) -> Dict[int, Cpu6502Instruction]:
+    def opcodes_mapping() -> Dict[int, Cpu6502Instruction]:
         return {
-            0x28: PLP(cpu, cycles=c_uint8(4), addr_mode=address_modes.am_imp)
+            0x28: PLP(cycles=4, addr_mode=address_modes.am_imp)
         }
 
 
@@ -984,30 +961,30 @@ class ROL(Cpu6502Instruction):
     becomes the new carry flag value.
     """
 
-    def operate(self) -> c_uint8:
-        self.cpu.fetch()
-        tmp = c_uint16((self.cpu.fetched.value << 1) | self.cpu.get_flag('c'))
+    def operate(self, cpu) -> int:
+        cpu.fetch()
+        tmp = (cpu._fetched << 1) | (cpu._status & FLAG_C)
 
-        self.cpu.set_flag('c', tmp.value & 0xff00)
-        self.cpu.set_flag('z', (tmp.value & 0xff) == 0)
-        self.cpu.set_flag('n', bool(tmp.value & 0x80))
+        cpu.set_flag('c', bool(tmp & 0xff00))
+        cpu.set_flag('z', (tmp & 0xff) == 0)
+        cpu.set_flag('n', bool(tmp & 0x80))
 
-        result = c_uint8(tmp.value & 0x00ff)
-        if self.cpu.lookup[self.cpu.opcode.value].addr_mode == address_modes.am_imp:
-            self.cpu.a.value = result.value
+        result = tmp & 0x00ff
+        if self.addr_mode is address_modes.am_imp:
+            cpu._a = result
         else:
-            self.cpu.write(self.cpu.addr_abs, result)
+            cpu.write(cpu._addr_abs, result)
 
-        return c_uint8(0)
+        return 0
 
     @staticmethod
-    def opcodes_mapping(cpu) -> Dict[int, Cpu6502Instruction]:
+    def opcodes_mapping() -> Dict[int, Cpu6502Instruction]:
         return {
-            0x2a: ROL(cpu, cycles=c_uint8(2), addr_mode=address_modes.am_imm),
-            0x26: ROL(cpu, cycles=c_uint8(5), addr_mode=address_modes.am_zp0),
-            0x36: ROL(cpu, cycles=c_uint8(6), addr_mode=address_modes.am_zpx),
-            0x2e: ROL(cpu, cycles=c_uint8(6), addr_mode=address_modes.am_abs),
-            0x3e: ROL(cpu, cycles=c_uint8(7), addr_mode=address_modes.am_abx),
+            0x2a: ROL(cycles=2, addr_mode=address_modes.am_imp),
+            0x26: ROL(cycles=5, addr_mode=address_modes.am_zp0),
+            0x36: ROL(cycles=6, addr_mode=address_modes.am_zpx),
+            0x2e: ROL(cycles=6, addr_mode=address_modes.am_abs),
+            0x3e: ROL(cycles=7, addr_mode=address_modes.am_abx),
         }
 
 
@@ -1018,30 +995,29 @@ class ROR(Cpu6502Instruction):
     new carry flag value.
     """
 
-    def operate(self):
-        self.cpu.fetch()
-        tmp = c_uint16((self.cpu.get_flag('c') << 7) | (self.cpu.fetched.value >> 1))
+    def operate(self, cpu) -> int:
+        cpu.fetch()
+        result = ((cpu._status & FLAG_C) << 7) | (cpu._fetched >> 1)
 
-        self.cpu.set_flag('c', self.cpu.fetched.value & 0x01)
-        self.cpu.set_flag('z', (tmp.value & 0xff) == 0)
-        self.cpu.set_flag('n', bool(tmp.value & 0x80))
+        cpu.set_flag('c', bool(cpu._fetched & 0x01))
+        cpu.set_flag('z', result == 0)
+        cpu.set_flag('n', bool(result & 0x80))
 
-        result = c_uint8(tmp.value & 0x00ff)
-        if self.cpu.lookup[self.cpu.opcode.value].addr_mode == address_modes.am_imp:
-            self.cpu.a.value = result.value
+        if self.addr_mode is address_modes.am_imp:
+            cpu._a = result
         else:
-            self.cpu.write(self.cpu.addr_abs, result)
+            cpu.write(cpu._addr_abs, result)
 
-        return c_uint8(0)
+        return 0
 
     @staticmethod
-    def opcodes_mapping(cpu) -> Dict[int, Cpu6502Instruction]:
+    def opcodes_mapping() -> Dict[int, Cpu6502Instruction]:
         return {
-            0x6a: ROR(cpu, cycles=c_uint8(2), addr_mode=address_modes.am_imm),
-            0x66: ROR(cpu, cycles=c_uint8(5), addr_mode=address_modes.am_zp0),
-            0x76: ROR(cpu, cycles=c_uint8(6), addr_mode=address_modes.am_zpx),
-            0x6e: ROR(cpu, cycles=c_uint8(6), addr_mode=address_modes.am_abs),
-            0x7e: ROR(cpu, cycles=c_uint8(7), addr_mode=address_modes.am_abx),
+            0x6a: ROR(cycles=2, addr_mode=address_modes.am_imp),
+            0x66: ROR(cycles=5, addr_mode=address_modes.am_zp0),
+            0x76: ROR(cycles=6, addr_mode=address_modes.am_zpx),
+            0x6e: ROR(cycles=6, addr_mode=address_modes.am_abs),
+            0x7e: ROR(cycles=7, addr_mode=address_modes.am_abx),
         }
 
 
@@ -1051,22 +1027,18 @@ class RTI(Cpu6502Instruction):
     It pulls the processor flags from the stack followed by the program counter.
     """
 
-    def operate(self) -> c_uint8:
-        self.cpu.sp.value += 1
-        self.cpu.status.value = self.cpu.read(c_uint16(0x0100 + self.cpu.sp.value)).value
-        self.cpu.status.value &= ~self.cpu.get_flag('b')
-        self.cpu.status.value &= ~self.cpu.get_flag('u')
+    def operate(self, cpu) -> int:
+        cpu._status = (cpu.pull() & ~FLAG_B) | FLAG_U
 
-        self.cpu.sp.value += 1
-        self.cpu.pc.value = self.cpu.read(c_uint16(0x0100 + self.cpu.sp.value)).value
-        self.cpu.sp.value += 1
-        self.cpu.pc.value |= self.cpu.read(c_uint16((0x0100 + self.cpu.sp.value) << 8)).value
-        return c_uint8(0)
+        lo = cpu.pull()
+        hi = cpu.pull()
+        cpu._pc = (hi << 8) | lo
+        return 0
 
     @staticmethod
-    def opcodes_mapping(cpu) -> Dict[int, Cpu6502Instruction]:
+    def opcodes_mapping() -> Dict[int, Cpu6502Instruction]:
         return {
-            0x40: RTI(cpu, cycles=c_uint8(6), addr_mode=address_modes.am_imp)
+            0x40: RTI(cycles=6, addr_mode=address_modes.am_imp)
         }
 
 
@@ -1077,18 +1049,16 @@ class RTS(Cpu6502Instruction):
     the stack.
     """
 
-    def operate(self) -> c_uint8:
-        self.cpu.sp.value += 1
-        self.cpu.pc.value = self.cpu.read(c_uint16(0x0100 + self.cpu.sp.value)).value
-        self.cpu.sp.value += 1
-        self.cpu.pc.value |= self.cpu.read(c_uint16((0x0100 + self.cpu.sp.value) << 8)).value
-        self.cpu.pc.value += 1
-        return c_uint8(0)
+    def operate(self, cpu) -> int:
+        lo = cpu.pull()
+        hi = cpu.pull()
+        cpu._pc = (((hi << 8) | lo) + 1) & 0xffff
+        return 0
 
     @staticmethod
-    def opcodes_mapping(cpu) -> Dict[int, Cpu6502Instruction]:
+    def opcodes_mapping() -> Dict[int, Cpu6502Instruction]:
         return {
-            0x60: RTS(cpu, cycles=c_uint8(6), addr_mode=address_modes.am_imp)
+            0x60: RTS(cycles=6, addr_mode=address_modes.am_imp)
         }
 
 
@@ -1099,30 +1069,30 @@ class SBC(Cpu6502Instruction):
     carry bit is clear, this enables multiple byte subtraction to be performed.
     """
 
-    def operate(self) -> c_uint8:
-        self.cpu.fetch()
-        neg_fetch = c_uint16(self.cpu.fetched.value ^ 0x00ff)
-        tmp = c_uint16(self.cpu.a.value + neg_fetch.value + int(self.cpu.get_flag('c')))
+    def operate(self, cpu) -> int:
+        cpu.fetch()
+        neg_fetch = cpu._fetched ^ 0x00ff
+        tmp = cpu._a + neg_fetch + (cpu._status & FLAG_C)
 
-        self.cpu.set_flag('c', tmp.value > 0xff)
-        self.cpu.set_flag('z', (tmp.value & 0xff) == 0)
-        self.cpu.set_flag('n', bool(tmp.value & 0x80))
-        self.cpu.set_flag('v', bool((self.cpu.a.value ^ neg_fetch.value) & (self.cpu.a.value ^ tmp.value) & 0x0080))
+        cpu.set_flag('c', tmp > 0xff)
+        cpu.set_flag('z', (tmp & 0xff) == 0)
+        cpu.set_flag('n', bool(tmp & 0x80))
+        cpu.set_flag('v', bool((tmp ^ cpu._a) & (tmp ^ neg_fetch) & 0x0080))
 
-        self.cpu.a.value = tmp.value & 0x00ff
-        return c_uint8(1)
+        cpu._a = tmp & 0x00ff
+        return 1
 
     @staticmethod
-    def opcodes_mapping(cpu) -> Dict[int, Cpu6502Instruction]:
+    def opcodes_mapping() -> Dict[int, Cpu6502Instruction]:
         return {
-            0xe9: SBC(cpu, cycles=c_uint8(2), addr_mode=address_modes.am_imm),
-            0xe5: SBC(cpu, cycles=c_uint8(3), addr_mode=address_modes.am_zp0),
-            0xf5: SBC(cpu, cycles=c_uint8(4), addr_mode=address_modes.am_zpx),
-            0xed: SBC(cpu, cycles=c_uint8(4), addr_mode=address_modes.am_abs),
-            0xfd: SBC(cpu, cycles=c_uint8(4), addr_mode=address_modes.am_abx),
-            0xf9: SBC(cpu, cycles=c_uint8(4), addr_mode=address_modes.am_aby),
-            0xe1: SBC(cpu, cycles=c_uint8(6), addr_mode=address_modes.am_izx),
-            0xf1: SBC(cpu, cycles=c_uint8(5), addr_mode=address_modes.am_izy),
+            0xe9: SBC(cycles=2, addr_mode=address_modes.am_imm),
+            0xe5: SBC(cycles=3, addr_mode=address_modes.am_zp0),
+            0xf5: SBC(cycles=4, addr_mode=address_modes.am_zpx),
+            0xed: SBC(cycles=4, addr_mode=address_modes.am_abs),
+            0xfd: SBC(cycles=4, addr_mode=address_modes.am_abx),
+            0xf9: SBC(cycles=4, addr_mode=address_modes.am_aby),
+            0xe1: SBC(cycles=6, addr_mode=address_modes.am_izx),
+            0xf1: SBC(cycles=5, addr_mode=address_modes.am_izy),
         }
 
 
@@ -1131,15 +1101,14 @@ class SEC(Cpu6502Instruction):
     Set Carry Flag: Set the carry flag to one.
     """
 
-    def operate(self) -> c_uint8:
-        # self.cpu.c.value = True
-        self.cpu.set_flag('c', True)
-        return c_uint8(0)
+    def operate(self, cpu) -> int:
+        cpu.set_flag('c', True)
+        return 0
 
     @staticmethod
-    def opcodes_mapping(cpu) -> Dict[int, Cpu6502Instruction]:
+    def opcodes_mapping() -> Dict[int, Cpu6502Instruction]:
         return {
-            0x38: SEC(cpu, cycles=c_uint8(2), addr_mode=address_modes.am_imp)
+            0x38: SEC(cycles=2, addr_mode=address_modes.am_imp)
         }
 
 
@@ -1148,14 +1117,14 @@ class SED(Cpu6502Instruction):
     Set Decimal Flag: Set the decimal mode flag to one.
     """
 
-    def operate(self) -> c_uint8:
-        self.cpu.set_flag('d', True)
-        return c_uint8(0)
+    def operate(self, cpu) -> int:
+        cpu.set_flag('d', True)
+        return 0
 
     @staticmethod
-    def opcodes_mapping(cpu) -> Dict[int, Cpu6502Instruction]:
+    def opcodes_mapping() -> Dict[int, Cpu6502Instruction]:
         return {
-            0xf8: SED(cpu, cycles=c_uint8(2), addr_mode=address_modes.am_imp)
+            0xf8: SED(cycles=2, addr_mode=address_modes.am_imp)
         }
 
 
@@ -1164,14 +1133,14 @@ class SEI(Cpu6502Instruction):
     Set Interrupt Disable: Set the interrupt disable flag to one.
     """
 
-    def operate(self) -> c_uint8:
-        self.cpu.set_flag('i', True)
-        return c_uint8(0)
+    def operate(self, cpu) -> int:
+        cpu.set_flag('i', True)
+        return 0
 
     @staticmethod
-    def opcodes_mapping(cpu) -> Dict[int, Cpu6502Instruction]:
+    def opcodes_mapping() -> Dict[int, Cpu6502Instruction]:
         return {
-            0x78: SEI(cpu, cycles=c_uint8(2), addr_mode=address_modes.am_imp)
+            0x78: SEI(cycles=2, addr_mode=address_modes.am_imp)
         }
 
 
@@ -1180,20 +1149,20 @@ class STA(Cpu6502Instruction):
     Store Accumulator: Stores the contents of the accumulator into memory.
     """
 
-    def operate(self) -> c_uint8:
-        self.cpu.write(self.cpu.addr_abs, self.cpu.a)
-        return c_uint8(0)
+    def operate(self, cpu) -> int:
+        cpu.write(cpu._addr_abs, cpu._a)
+        return 0
 
     @staticmethod
-    def opcodes_mapping(cpu) -> Dict[int, Cpu6502Instruction]:
+    def opcodes_mapping() -> Dict[int, Cpu6502Instruction]:
         return {
-            0x85: STA(cpu, cycles=c_uint8(3), addr_mode=address_modes.am_zp0),
-            0x95: STA(cpu, cycles=c_uint8(4), addr_mode=address_modes.am_zpx),
-            0x8d: STA(cpu, cycles=c_uint8(4), addr_mode=address_modes.am_abs),
-            0x9d: STA(cpu, cycles=c_uint8(5), addr_mode=address_modes.am_abx),
-            0x99: STA(cpu, cycles=c_uint8(5), addr_mode=address_modes.am_aby),
-            0x81: STA(cpu, cycles=c_uint8(6), addr_mode=address_modes.am_izx),
-            0x91: STA(cpu, cycles=c_uint8(6), addr_mode=address_modes.am_izy),
+            0x85: STA(cycles=3, addr_mode=address_modes.am_zp0),
+            0x95: STA(cycles=4, addr_mode=address_modes.am_zpx),
+            0x8d: STA(cycles=4, addr_mode=address_modes.am_abs),
+            0x9d: STA(cycles=5, addr_mode=address_modes.am_abx),
+            0x99: STA(cycles=5, addr_mode=address_modes.am_aby),
+            0x81: STA(cycles=6, addr_mode=address_modes.am_izx),
+            0x91: STA(cycles=6, addr_mode=address_modes.am_izy),
         }
 
 
@@ -1202,16 +1171,16 @@ class STX(Cpu6502Instruction):
     Store X Register: Stores the contents of the X register into memory.
     """
 
-    def operate(self) -> c_uint8:
-        self.cpu.write(self.cpu.addr_abs, self.cpu.x)
-        return c_uint8(0)
+    def operate(self, cpu) -> int:
+        cpu.write(cpu._addr_abs, cpu._x)
+        return 0
 
     @staticmethod
-    def opcodes_mapping(cpu) -> Dict[int, Cpu6502Instruction]:
+    def opcodes_mapping() -> Dict[int, Cpu6502Instruction]:
         return {
-            0x86: STX(cpu, cycles=c_uint8(3), addr_mode=address_modes.am_zp0),
-            0x96: STX(cpu, cycles=c_uint8(4), addr_mode=address_modes.am_zpy),
-            0x8e: STX(cpu, cycles=c_uint8(4), addr_mode=address_modes.am_abs),
+            0x86: STX(cycles=3, addr_mode=address_modes.am_zp0),
+            0x96: STX(cycles=4, addr_mode=address_modes.am_zpy),
+            0x8e: STX(cycles=4, addr_mode=address_modes.am_abs),
         }
 
 
@@ -1220,16 +1189,16 @@ class STY(Cpu6502Instruction):
     Store Y Register: Stores the contents of the Y register into memory.
     """
 
-    def operate(self) -> c_uint8:
-        self.cpu.write(self.cpu.addr_abs, self.cpu.y)
-        return c_uint8(0)
+    def operate(self, cpu) -> int:
+        cpu.write(cpu._addr_abs, cpu._y)
+        return 0
 
     @staticmethod
-    def opcodes_mapping(cpu) -> Dict[int, Cpu6502Instruction]:
+    def opcodes_mapping() -> Dict[int, Cpu6502Instruction]:
         return {
-            0x84: STY(cpu, cycles=c_uint8(3), addr_mode=address_modes.am_zp0),
-            0x94: STY(cpu, cycles=c_uint8(4), addr_mode=address_modes.am_zpx),
-            0x8c: STY(cpu, cycles=c_uint8(4), addr_mode=address_modes.am_abs),
+            0x84: STY(cycles=3, addr_mode=address_modes.am_zp0),
+            0x94: STY(cycles=4, addr_mode=address_modes.am_zpx),
+            0x8c: STY(cycles=4, addr_mode=address_modes.am_abs),
         }
 
 
@@ -1239,16 +1208,16 @@ class TAX(Cpu6502Instruction):
     into the X register and sets the zero and negative flags as appropriate.
     """
 
-    def operate(self) -> c_uint8:
-        self.cpu.x.value = self.cpu.a.value
-        self.cpu.set_flag('z', self.cpu.x.value == 0)
-        self.cpu.set_flag('n', bool(self.cpu.x.value & 0x80))
-        return c_uint8(0)
+    def operate(self, cpu) -> int:
+        cpu._x = cpu._a
+        cpu.set_flag('z', cpu._x == 0)
+        cpu.set_flag('n', bool(cpu._x & 0x80))
+        return 0
 
     @staticmethod
-    def opcodes_mapping(cpu) -> Dict[int, Cpu6502Instruction]:
+    def opcodes_mapping() -> Dict[int, Cpu6502Instruction]:
         return {
-            0xaa: TAX(cpu, cycles=c_uint8(2), addr_mode=address_modes.am_imp)
+            0xaa: TAX(cycles=2, addr_mode=address_modes.am_imp)
         }
 
 
@@ -1258,16 +1227,16 @@ class TAY(Cpu6502Instruction):
     into the Y register and sets the zero and negative flags as appropriate.
     """
 
-    def operate(self) -> c_uint8:
-        self.cpu.y.value = self.cpu.a.value
-        self.cpu.set_flag('z', self.cpu.y.value == 0)
-        self.cpu.set_flag('n', bool(self.cpu.y.value & 0x80))
-        return c_uint8(0)
+    def operate(self, cpu) -> int:
+        cpu._y = cpu._a
+        cpu.set_flag('z', cpu._y == 0)
+        cpu.set_flag('n', bool(cpu._y & 0x80))
+        return 0
 
     @staticmethod
-    def opcodes_mapping(cpu) -> Dict[int, Cpu6502Instruction]:
+    def opcodes_mapping() -> Dict[int, Cpu6502Instruction]:
         return {
-            0xa8: TAY(cpu, cycles=c_uint8(2), addr_mode=address_modes.am_imp)
+            0xa8: TAY(cycles=2, addr_mode=address_modes.am_imp)
         }
 
 
@@ -1278,16 +1247,16 @@ class TSX(Cpu6502Instruction):
     appropriate.
     """
 
-    def operate(self) -> c_uint8:
-        self.cpu.x.value = self.cpu.sp.value
-        self.cpu.set_flag('z', self.cpu.x.value == 0)
-        self.cpu.set_flag('n', bool(self.cpu.x.value & 0x80))
-        return c_uint8(0)
+    def operate(self, cpu) -> int:
+        cpu._x = cpu._sp
+        cpu.set_flag('z', cpu._x == 0)
+        cpu.set_flag('n', bool(cpu._x & 0x80))
+        return 0
 
     @staticmethod
-    def opcodes_mapping(cpu) -> Dict[int, Cpu6502Instruction]:
+    def opcodes_mapping() -> Dict[int, Cpu6502Instruction]:
         return {
-            0xba: TSX(cpu, cycles=c_uint8(2), addr_mode=address_modes.am_imp)
+            0xba: TSX(cycles=2, addr_mode=address_modes.am_imp)
         }
 
 
@@ -1297,16 +1266,16 @@ class TXA(Cpu6502Instruction):
     into the accumulator and sets the zero and negative flags as appropriate.
     """
 
-    def operate(self) -> c_uint8:
-        self.cpu.a.value = self.cpu.x.value
-        self.cpu.set_flag('z', self.cpu.a.value == 0)
-        self.cpu.set_flag('n', bool(self.cpu.a.value & 0x80))
-        return c_uint8(0)
+    def operate(self, cpu) -> int:
+        cpu._a = cpu._x
+        cpu.set_flag('z', cpu._a == 0)
+        cpu.set_flag('n', bool(cpu._a & 0x80))
+        return 0
 
     @staticmethod
-    def opcodes_mapping(cpu) -> Dict[int, Cpu6502Instruction]:
+    def opcodes_mapping() -> Dict[int, Cpu6502Instruction]:
         return {
-            0x8a: TXA(cpu, cycles=c_uint8(2), addr_mode=address_modes.am_imp)
+            0x8a: TXA(cycles=2, addr_mode=address_modes.am_imp)
         }
 
 
@@ -1316,14 +1285,14 @@ class TXS(Cpu6502Instruction):
     into the stack register.
     """
 
-    def operate(self) -> c_uint8:
-        self.cpu.sp.value = self.cpu.x.value
-        return c_uint8(0)
+    def operate(self, cpu) -> int:
+        cpu._sp = cpu._x
+        return 0
 
     @staticmethod
-    def opcodes_mapping(cpu) -> Dict[int, Cpu6502Instruction]:
+    def opcodes_mapping() -> Dict[int, Cpu6502Instruction]:
         return {
-            0x9a: TXS(cpu, cycles=c_uint8(2), addr_mode=address_modes.am_imp)
+            0x9a: TXS(cycles=2, addr_mode=address_modes.am_imp)
         }
 
 
@@ -1333,16 +1302,16 @@ class TYA(Cpu6502Instruction):
     into the accumulator and sets the zero and negative flags as appropriate.
     """
 
-    def operate(self) -> c_uint8:
-        self.cpu.a.value = self.cpu.y.value
-        self.cpu.set_flag('z', self.cpu.a.value == 0)
-        self.cpu.set_flag('n', bool(self.cpu.a.value & 0x80))
-        return c_uint8(0)
+    def operate(self, cpu) -> int:
+        cpu._a = cpu._y
+        cpu.set_flag('z', cpu._a == 0)
+        cpu.set_flag('n', bool(cpu._a & 0x80))
+        return 0
 
     @staticmethod
-    def opcodes_mapping(cpu) -> Dict[int, Cpu6502Instruction]:
+    def opcodes_mapping() -> Dict[int, Cpu6502Instruction]:
         return {
-            0x98: TYA(cpu, cycles=c_uint8(2), addr_mode=address_modes.am_imp)
+            0x98: TYA(cycles=2, addr_mode=address_modes.am_imp)
         }
 
 
@@ -1351,13 +1320,34 @@ class XXX(Cpu6502Instruction):
     For illegal opcodes
     """
 
-    def operate(self) -> c_uint8:
-        return c_uint8(0)
+    def operate(self, cpu) -> int:
+        return 0
 
     @staticmethod
-    def opcodes_mapping(cpu) -> Dict[int, Cpu6502Instruction]:
+    def opcodes_mapping() -> Dict[int, Cpu6502Instruction]:
         return {}
 
 
-def instruction_by_opcode(opcode: int, cpu=None) -> Cpu6502Instruction:
-    return opcode_instruction_mapping(cpu).get(opcode, XXX(cpu, cycles=c_uint8(0), addr_mode=address_modes.am_imp))
+def build_opcode_table() -> List[Cpu6502Instruction]:
+    """
+    Builds flat 256-entry opcode table, unknown opcodes are mapped to XXX
+    """
+    mapping = opcode_instruction_mapping()
+    illegal = XXX(cycles=2, addr_mode=address_modes.am_imp)
+    return [mapping.get(opcode, illegal) for opcode in range(0x100)]
+
+
+# built once on import and shared by all Cpu6502 instances
+OPCODE_TABLE: List[Cpu6502Instruction] = build_opcode_table()
+
+# operand bytes following the opcode, by addressing mode
+OPERAND_SIZES: Dict[Callable, int] = {
+    address_modes.am_imp: 0, address_modes.am_imm: 1, address_modes.am_rel: 1,
+    address_modes.am_zp0: 1, address_modes.am_zpx: 1, address_modes.am_zpy: 1,
+    address_modes.am_izx: 1, address_modes.am_izy: 1,
+    address_modes.am_abs: 2, address_modes.am_abx: 2, address_modes.am_aby: 2, address_modes.am_ind: 2,
+}
+
+
+def instruction_by_opcode(opcode: int) -> Cpu6502Instruction:
+    return OPCODE_TABLE[opcode]
@@ -0,0 +1,39 @@
+class Register:
+    """
+    ctypes-like view over an integer register of Cpu6502. Cpu6502 keeps its
+    registers as plain masked ints, this wrapper is only kept for the code
+    which still uses `.value` access.
+    """
+    __slots__ = ('_cpu', '_slot', '_mask')
+
+    def __init__(self, cpu, slot: str, mask: int):
+        self._cpu = cpu
+        self._slot = slot
+        self._mask = mask
+
+    @property
+    def value(self) -> int:
+        return getattr(self._cpu, self._slot)
+
+    @value.setter
+    def value(self, value: int) -> None:
+        setattr(self._cpu, self._slot, value & self._mask)
+
+    def __repr__(self) -> str:
+        return "Register({n}={v})".format(n=self._slot.lstrip('_'),
+                                          v=hex(self.value))
+
+
+def register_property(slot: str, mask: int) -> property:
+    """
+    Makes a property of Cpu6502 which gives `.value` compatible access to the
+    integer register stored in `slot`
+    """
+
+    def getter(cpu) -> Register:
+        return Register(cpu, slot, mask)
+
+    def setter(cpu, value) -> None:
+        setattr(cpu, slot, getattr(value, 'value', value) & mask)
+
+    return property(getter, setter)
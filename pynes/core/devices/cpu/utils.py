@@ -11,10 +11,20 @@ def get_mask(flag: str) -> int:
     return 1 << shift_amt
 
 
+FLAG_MASKS = {flag: get_mask(flag) for flag in FLAGS}
+
+FLAG_C = FLAG_MASKS['c']  # carry
+FLAG_Z = FLAG_MASKS['z']  # zero
+FLAG_I = FLAG_MASKS['i']  # interrupt disable
+FLAG_D = FLAG_MASKS['d']  # decimal mode
+FLAG_B = FLAG_MASKS['b']  # break
+FLAG_U = FLAG_MASKS['u']  # unused
+FLAG_V = FLAG_MASKS['v']  # overflow
+FLAG_N = FLAG_MASKS['n']  # negative
+
+
 def instructions_list_from_nes_io(nesfile_io: BinaryIO) -> List[int]:
-    instrs = []
-    byte = nesfile_io.read(1)
-    while byte:
-        instrs.append(int(byte.hex(), 16))
-        byte = nesfile_io.read(1)
-    return instrs
+    """
+    Whole file as list of byte values, see Cartridge.from_file() to load a .nes file
+    """
+    return list(nesfile_io.read())
@@ -0,0 +1,91 @@
+"""
+iNES and NES 2.0 file header, see https://www.nesdev.org/wiki/INES and
+https://www.nesdev.org/wiki/NES_2.0
+"""
+from typing import NamedTuple
+
+from pynes.core.devices.ppu.nametable import Mirroring
+from pynes.core.exceptions import InvalidRomException
+
+HEADER_SIZE:   int = 0x10
+TRAINER_SIZE:  int = 0x200
+PRG_UNIT_SIZE: int = 0x4000
+CHR_UNIT_SIZE: int = 0x2000
+MAGIC: bytes = b'NES\x1a'
+
+
+class INesHeader(NamedTuple):
+    mapper: int
+    submapper: int
+    prg_rom_size: int
+    chr_rom_size: int
+    prg_ram_size: int
+    prg_nvram_size: int
+    chr_ram_size: int
+    chr_nvram_size: int
+    mirroring: Mirroring
+    battery: bool
+    trainer: bool
+    nes2: bool
+
+    @property
+    def trainer_size(self) -> int:
+        return TRAINER_SIZE if self.trainer else 0
+
+    @property
+    def file_size(self) -> int:
+        return HEADER_SIZE + self.trainer_size + self.prg_rom_size + self.chr_rom_size
+
+
+def rom_size(lsb: int, msb: int, unit: int) -> int:
+    """
+    ROM size from NES 2.0 size bytes, msb of 0xf selects exponent-multiplier notation
+    """
+    if msb == 0x0f:
+        return (1 << (lsb >> 2)) * ((lsb & 0x03) * 2 + 1)
+    return ((msb << 8) | lsb) * unit
+
+
+def ram_size(shift: int) -> int:
+    return 64 << shift if shift else 0
+
+
+def parse_header(data: bytes) -> INesHeader:
+    if len(data) < HEADER_SIZE or bytes(data[:4]) != MAGIC:
+        raise InvalidRomException('not an iNES file')
+    flags6, flags7 = data[6], data[7]
+    if flags6 & 0x08:
+        mirroring = Mirroring.FOUR_SCREEN
+    else:
+        mirroring = Mirroring.VERTICAL if flags6 & 0x01 else Mirroring.HORIZONTAL
+    battery = bool(flags6 & 0x02)
+    trainer = bool(flags6 & 0x04)
+
+    if flags7 & 0x0c == 0x08:
+        return INesHeader(
+            mapper=((data[8] & 0x0f) << 8) | (flags7 & 0xf0) | (flags6 >> 4),
+            submapper=data[8] >> 4,
+            prg_rom_size=rom_size(data[4], data[9] & 0x0f, PRG_UNIT_SIZE),
+            chr_rom_size=rom_size(data[5], data[9] >> 4, CHR_UNIT_SIZE),
+            prg_ram_size=ram_size(data[10] & 0x0f),
+            prg_nvram_size=ram_size(data[10] >> 4),
+            chr_ram_size=ram_size(data[11] & 0x0f),
+            chr_nvram_size=ram_size(data[11] >> 4),
+            mirroring=mirroring, battery=battery, trainer=trainer, nes2=True,
+        )
+
+    # garbage in bytes 12-15 (e.g. 'DiskDude!') means flags 7 can't be trusted
+    mapper_hi = flags7 & 0xf0 if not any(data[12:16]) else 0
+    prg_ram_size = (data[8] or 1) * 0x2000
+    chr_rom_size = data[5] * CHR_UNIT_SIZE
+    return INesHeader(
+        mapper=mapper_hi | (flags6 >> 4),
+        submapper=0,
+        prg_rom_size=data[4] * PRG_UNIT_SIZE,
+        chr_rom_size=chr_rom_size,
+        prg_ram_size=0 if battery else prg_ram_size,
+        prg_nvram_size=prg_ram_size if battery else 0,
+        chr_ram_size=0 if chr_rom_size else CHR_UNIT_SIZE,
+        chr_nvram_size=0,
+        mirroring=mirroring, battery=battery, trainer=trainer, nes2=False,
+    )
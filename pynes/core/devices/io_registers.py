@@ -0,0 +1,106 @@
+from typing import Callable, List, Optional
+
+from pynes.core.devices import AbstractDevice
+from pynes.core.devices.abstract_device import MemoryRange
+
+OAM_DMA_ADDRESS: int = 0x4014
+# one halt cycle plus 256 read/write pairs, one more for alignment on odd cycle
+OAM_DMA_CYCLES:  int = 513
+
+APU_STATUS_ADDRESS:    int = 0x4015
+FRAME_COUNTER_ADDRESS: int = 0x4017
+# 4-step sequence of the APU frame counter in CPU cycles, IRQ is raised at its end
+FRAME_COUNTER_PERIOD:  int = 29830
+FRAME_IRQ_CYCLE:       int = 29829
+FRAME_MODE_5_STEP:     int = 0x80
+FRAME_IRQ_INHIBIT:     int = 0x40
+STATUS_FRAME_IRQ:      int = 0x40
+
+
+class IoRegisters(AbstractDevice):
+    """
+    APU and I/O registers at $4000-$401f. Implemented are OAM DMA ($4014) and
+    the frame counter IRQ ($4015/$4017), other writes are latched and reads
+    give 0.
+
+    Frame counter timing is left to the system: next_frame_irq() tells when the
+    next IRQ is due and frame_counter_irq() raises it.
+    """
+    min_address = 0x4000
+    max_address = 0x401f
+
+    def __init__(self):
+        super().__init__()
+        self.registers = bytearray(self.max_address - self.min_address + 1)
+        self.frame_irq = False
+        # CPU cycle of the last frame counter reset ($4017 write)
+        self.frame_counter_start = 0
+        # called on $4017 write, as the next frame IRQ moves
+        self.frame_counter_callback: Optional[Callable[[], None]] = None
+        # with it set DMA only stalls the CPU, dma_callback(page, end cycle) is
+        # expected to copy the page once the transfer ends
+        self.dma_callback: Optional[Callable[[int, int], None]] = None
+
+    def read(self, addr: int, read_only: bool = False) -> int:
+        if addr == APU_STATUS_ADDRESS:
+            status = STATUS_FRAME_IRQ if self.frame_irq else 0x00
+            if not read_only:
+                self.frame_irq = False
+            return status
+        return 0x00
+
+    def write(self, addr: int, data: int) -> None:
+        self.registers[addr - self.min_address] = data
+        if addr == FRAME_COUNTER_ADDRESS:
+            if data & FRAME_IRQ_INHIBIT:
+                self.frame_irq = False
+            cpu = self.bus.devices.get('Cpu6502') if self.bus is not None else None
+            self.frame_counter_start = cpu.total_cycles if cpu is not None else 0
+            if self.frame_counter_callback is not None:
+                self.frame_counter_callback()
+
+    def next_frame_irq(self, cycle: int) -> Optional[int]:
+        """
+        CPU cycle of the first frame IRQ after `cycle`, None if it is disabled
+        """
+        mode = self.registers[FRAME_COUNTER_ADDRESS - self.min_address]
+        if mode & (FRAME_MODE_5_STEP | FRAME_IRQ_INHIBIT):
+            return None
+        first = self.frame_counter_start + FRAME_IRQ_CYCLE
+        return first + max(0, (cycle - first) // FRAME_COUNTER_PERIOD + 1) * FRAME_COUNTER_PERIOD
+
+    def frame_counter_irq(self) -> None:
+        self.frame_irq = True
+
+    def stable_until(self, addr: int) -> Optional[float]:
+        # frame IRQ flag is only set by frame_counter_irq(), on a scheduled event
+        if addr == APU_STATUS_ADDRESS:
+            return float('inf')
+        # controller ports follow input
+        return None
+
+    def oam_dma(self, addr: int, page: int) -> None:
+        """
+        Copies CPU page `page` into PPU OAM as one block (or leaves it to
+        `dma_callback`) and stalls the CPU for the whole transfer at once
+        """
+        self.write(addr, page)
+        cpu = self.bus.get_cpu6502()
+        # handlers run before their cycles are counted: the transfer starts after the write cycle
+        started = cpu.total_cycles + cpu.lookup[cpu._opcode].cycles
+        cycles = OAM_DMA_CYCLES + (started & 1)
+        if self.dma_callback is None:
+            self.copy_page_to_oam(page)
+        else:
+            self.dma_callback(page, started + cycles)
+        cpu.stall(cycles)
+
+    def copy_page_to_oam(self, page: int) -> None:
+        self.bus.get_ppu2C02().write_oam_block(self.bus.read_block(page << 8, 0x100))
+
+    def memory_map(self, bus) -> List[MemoryRange]:
+        return [
+            MemoryRange(self.min_address, OAM_DMA_ADDRESS - 1, self.read, self.write, self),
+            MemoryRange(OAM_DMA_ADDRESS, OAM_DMA_ADDRESS, self.read, self.oam_dma, self),
+            MemoryRange(OAM_DMA_ADDRESS + 1, self.max_address, self.read, self.write, self),
+        ]
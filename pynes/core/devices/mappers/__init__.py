@@ -0,0 +1,19 @@
+from typing import Dict, Type
+
+from .mapper import Mapper
+from .nrom import Nrom
+from .mmc1 import Mmc1
+from .uxrom import Uxrom
+from .cnrom import Cnrom
+from .mmc3 import Mmc3
+
+from pynes.core.exceptions import InvalidRomException
+
+MAPPERS: Dict[int, Type[Mapper]] = {mapper.number: mapper for mapper in (Nrom, Mmc1, Uxrom, Cnrom, Mmc3)}
+
+
+def mapper_for(cartridge) -> Mapper:
+    mapper = MAPPERS.get(cartridge.header.mapper)
+    if mapper is None:
+        raise InvalidRomException(f'mapper {cartridge.header.mapper} is not supported')
+    return mapper(cartridge)
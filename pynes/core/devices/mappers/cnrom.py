@@ -0,0 +1,11 @@
+from pynes.core.devices.mappers.mapper import Mapper
+
+
+class Cnrom(Mapper):
+    """
+    Mapper 3: fixed PRG as NROM, switchable 8 KB CHR bank
+    """
+    number = 3
+
+    def write_register(self, addr: int, data: int) -> None:
+        self.switch_chr(0, data)
@@ -0,0 +1,136 @@
+from typing import List, Tuple
+
+from pynes.core.devices.abstract_device import MemoryRange
+from pynes.core.devices.ines import CHR_UNIT_SIZE
+from pynes.core.devices.ppu.nametable import Mirroring
+
+PRG_ADDRESS: int = 0x8000
+PRG_SIZE:    int = 0x8000
+CHR_ADDRESS: int = 0x0000
+CHR_SIZE:    int = 0x2000
+
+# prebuilt (readers, writers) page handlers of a bank mapped into a window
+PageHandlers = Tuple[list, list]
+
+
+def ignore_write(addr: int, data: int) -> None:
+    pass
+
+
+def slice_banks(memory: memoryview, size: int) -> List[memoryview]:
+    return [memory[offset:offset + size] for offset in range(0, len(memory), size)] or [memory]
+
+
+def bank_page_handlers(bank: memoryview, base: int, size: int, writable: bool) -> PageHandlers:
+    """
+    Page handlers serving `bank` at `base`, the same for every page of the window
+    """
+
+    def read(addr: int) -> int:
+        return bank[addr - base]
+
+    def write(addr: int, data: int) -> None:
+        bank[addr - base] = data
+
+    pages = size >> 8
+    return [read] * pages, [write if writable else ignore_write] * pages
+
+
+class Mapper:
+    """
+    CPU $8000-$ffff and PPU $0000-$1fff are split into equal windows. Banks are
+    memoryview slices of PRG/CHR made once, and page handlers for every
+    (window, bank) pair are prebuilt too, so a switch is one slice assignment
+    into the bus page table. Writes to $8000-$ffff go to write_register().
+    """
+    number: int = -1
+    prg_window_size: int = 0x4000
+    chr_window_size: int = 0x2000
+
+    def __init__(self, cartridge):
+        self.cartridge = cartridge
+        header = cartridge.header
+        self.mirroring: Mirroring = header.mirroring
+
+        self.chr_writable = not len(cartridge.chr_rom)
+        if self.chr_writable:
+            chr_memory = memoryview(bytearray(header.chr_ram_size + header.chr_nvram_size or CHR_UNIT_SIZE))
+        else:
+            chr_memory = cartridge.chr_rom
+        self.prg_banks = slice_banks(cartridge.prg_rom, self.prg_window_size)
+        self.chr_banks = slice_banks(chr_memory, self.chr_window_size)
+
+        prg_windows = range(PRG_SIZE // self.prg_window_size)
+        chr_windows = range(CHR_SIZE // self.chr_window_size)
+        self.prg_pages: List[List[PageHandlers]] = [
+            [bank_page_handlers(bank, self.prg_base(w), self.prg_window_size, False) for bank in self.prg_banks]
+            for w in prg_windows
+        ]
+        self.chr_pages: List[List[PageHandlers]] = [
+            [bank_page_handlers(bank, self.chr_base(w), self.chr_window_size, self.chr_writable)
+             for bank in self.chr_banks]
+            for w in chr_windows
+        ]
+        # bank mapped into each window, last PRG bank is fixed at the top by default
+        self.prg_bank: List[int] = [0 for _ in prg_windows]
+        self.prg_bank[-1] = len(self.prg_banks) - 1
+        self.chr_bank: List[int] = [w % len(self.chr_banks) for w in chr_windows]
+
+    def prg_base(self, window: int) -> int:
+        return PRG_ADDRESS + window * self.prg_window_size
+
+    def chr_base(self, window: int) -> int:
+        return CHR_ADDRESS + window * self.chr_window_size
+
+    def switch_prg(self, window: int, bank: int) -> None:
+        bank %= len(self.prg_banks)
+        if self.prg_bank[window] == bank:
+            return
+        self.prg_bank[window] = bank
+        bus = self.cartridge.bus
+        if bus is not None:
+            bus.set_pages(self.prg_base(window) >> 8, self.prg_pages[window][bank][0])
+
+    def switch_chr(self, window: int, bank: int) -> None:
+        bank %= len(self.chr_banks)
+        if self.chr_bank[window] == bank:
+            return
+        self.chr_bank[window] = bank
+        bus = self.cartridge.ppu_bus
+        if bus is not None:
+            bus.set_pages(self.chr_base(window) >> 8, *self.chr_pages[window][bank])
+
+    def set_mirroring(self, mirroring: Mirroring) -> None:
+        if self.mirroring is mirroring:
+            return
+        self.mirroring = mirroring
+        nametable = self.cartridge.nametable()
+        if nametable is not None:
+            nametable.set_mirroring(mirroring)
+
+    def prg_view(self, addr: int) -> Tuple[memoryview, int]:
+        """
+        PRG bank mapped at `addr` with offset of `addr` into it
+        """
+        window, offset = divmod(addr - PRG_ADDRESS, self.prg_window_size)
+        return self.prg_banks[self.prg_bank[window]], offset
+
+    def chr_view(self, addr: int) -> Tuple[memoryview, int]:
+        window, offset = divmod(addr - CHR_ADDRESS, self.chr_window_size)
+        return self.chr_banks[self.chr_bank[window]], offset
+
+    def write_register(self, addr: int, data: int) -> None:
+        pass
+
+    def cpu_ranges(self) -> List[MemoryRange]:
+        return [MemoryRange(self.prg_base(w), self.prg_base(w) + self.prg_window_size - 1,
+                            self.prg_pages[w][bank][0][0], self.write_register, self.cartridge)
+                for w, bank in enumerate(self.prg_bank)]
+
+    def ppu_ranges(self) -> List[MemoryRange]:
+        ranges = []
+        for w, bank in enumerate(self.chr_bank):
+            readers, writers = self.chr_pages[w][bank]
+            ranges.append(MemoryRange(self.chr_base(w), self.chr_base(w) + self.chr_window_size - 1,
+                                      readers[0], writers[0], self.cartridge))
+        return ranges
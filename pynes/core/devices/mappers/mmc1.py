@@ -0,0 +1,64 @@
+from pynes.core.devices.mappers.mapper import Mapper
+from pynes.core.devices.ppu.nametable import Mirroring
+
+MIRRORING = (Mirroring.SINGLE_LO, Mirroring.SINGLE_HI, Mirroring.VERTICAL, Mirroring.HORIZONTAL)
+
+
+class Mmc1(Mapper):
+    """
+    Mapper 1: registers are loaded serially, one bit per write, the fifth write
+    commits value into the register selected by address bits 13-14
+    """
+    number = 1
+    prg_window_size = 0x4000
+    chr_window_size = 0x1000
+
+    def __init__(self, cartridge):
+        super().__init__(cartridge)
+        self.shift = 0x10
+        # power up: PRG mode 3, last bank fixed at $c000
+        self.control = 0x0c
+        self.chr_0 = 0
+        self.chr_1 = 0
+        self.prg = 0
+
+    def write_register(self, addr: int, data: int) -> None:
+        if data & 0x80:
+            self.shift = 0x10
+            self.control |= 0x0c
+            self.update_banks()
+            return
+        complete = self.shift & 0x01
+        self.shift = (self.shift >> 1) | ((data & 0x01) << 4)
+        if not complete:
+            return
+        value, self.shift = self.shift, 0x10
+        register = (addr >> 13) & 0x03
+        if register == 0:
+            self.control = value
+        elif register == 1:
+            self.chr_0 = value
+        elif register == 2:
+            self.chr_1 = value
+        else:
+            self.prg = value & 0x0f
+        self.update_banks()
+
+    def update_banks(self) -> None:
+        self.set_mirroring(MIRRORING[self.control & 0x03])
+        prg_mode = (self.control >> 2) & 0x03
+        if prg_mode < 2:
+            self.switch_prg(0, self.prg & ~1)
+            self.switch_prg(1, self.prg | 1)
+        elif prg_mode == 2:
+            self.switch_prg(0, 0)
+            self.switch_prg(1, self.prg)
+        else:
+            self.switch_prg(0, self.prg)
+            self.switch_prg(1, len(self.prg_banks) - 1)
+        if self.control & 0x10:
+            self.switch_chr(0, self.chr_0)
+            self.switch_chr(1, self.chr_1)
+        else:
+            self.switch_chr(0, self.chr_0 & ~1)
+            self.switch_chr(1, self.chr_0 | 1)
@@ -0,0 +1,78 @@
+from pynes.core.devices.mappers.mapper import Mapper
+from pynes.core.devices.ppu.nametable import Mirroring
+
+
+class Mmc3(Mapper):
+    """
+    Mapper 4: four 8 KB PRG windows, eight 1 KB CHR windows and scanline
+    counter IRQ. scanline() is expected to be called once per rendered scanline.
+    """
+    number = 4
+    prg_window_size = 0x2000
+    chr_window_size = 0x0400
+
+    def __init__(self, cartridge):
+        super().__init__(cartridge)
+        self.bank_select = 0x00
+        # R0-R7 bank registers
+        self.registers = [0, 2, 4, 5, 6, 7, 0, 1]
+        self.irq_latch = 0
+        self.irq_counter = 0
+        self.irq_reload = False
+        self.irq_enabled = False
+        self.irq_pending = False
+        self.update_banks()
+
+    def write_register(self, addr: int, data: int) -> None:
+        even = not addr & 0x01
+        group = addr & 0xe000
+        if group == 0x8000:
+            if even:
+                self.bank_select = data
+            else:
+                self.registers[self.bank_select & 0x07] = data
+            self.update_banks()
+        elif group == 0xa000:
+            if even and self.mirroring is not Mirroring.FOUR_SCREEN:
+                self.set_mirroring(Mirroring.HORIZONTAL if data & 0x01 else Mirroring.VERTICAL)
+        elif group == 0xc000:
+            if even:
+                self.irq_latch = data
+            else:
+                self.irq_counter = 0
+                self.irq_reload = True
+        elif even:
+            self.irq_enabled = False
+            self.irq_pending = False
+        else:
+            self.irq_enabled = True
+
+    def update_banks(self) -> None:
+        r = self.registers
+        second_last = len(self.prg_banks) - 2
+        if self.bank_select & 0x40:
+            self.switch_prg(0, second_last)
+            self.switch_prg(2, r[6])
+        else:
+            self.switch_prg(0, r[6])
+            self.switch_prg(2, second_last)
+        self.switch_prg(1, r[7])
+        self.switch_prg(3, len(self.prg_banks) - 1)
+
+        # A12 inversion swaps 2 KB and 1 KB halves of the pattern tables
+        inverted = 4 if self.bank_select & 0x80 else 0
+        self.switch_chr(0 ^ inverted, r[0] & ~1)
+        self.switch_chr(1 ^ inverted, r[0] | 1)
+        self.switch_chr(2 ^ inverted, r[1] & ~1)
+        self.switch_chr(3 ^ inverted, r[1] | 1)
+        for i in range(4):
+            self.switch_chr((4 + i) ^ inverted, r[2 + i])
+
+    def scanline(self) -> None:
+        if self.irq_counter == 0 or self.irq_reload:
+            self.irq_counter = self.irq_latch
+            self.irq_reload = False
+        else:
+            self.irq_counter -= 1
+        if self.irq_counter == 0 and self.irq_enabled:
+            self.irq_pending = True
@@ -0,0 +1,8 @@
+from pynes.core.devices.mappers.mapper import Mapper
+
+
+class Nrom(Mapper):
+    """
+    Mapper 0: 16 or 32 KB PRG (16 KB one is mirrored), 8 KB CHR, no registers
+    """
+    number = 0
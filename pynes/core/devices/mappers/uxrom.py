@@ -0,0 +1,11 @@
+from pynes.core.devices.mappers.mapper import Mapper
+
+
+class Uxrom(Mapper):
+    """
+    Mapper 2: switchable 16 KB PRG bank at $8000, last one fixed at $c000
+    """
+    number = 2
+
+    def write_register(self, addr: int, data: int) -> None:
+        self.switch_prg(0, data)
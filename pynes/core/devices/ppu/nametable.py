@@ -1,6 +1,135 @@
+from enum import Enum
+from typing import List, Tuple
+
 from pynes.core.devices import AbstractMemoryDevice
+from pynes.core.devices.abstract_device import MemoryRange
+from pynes.core.devices.abstract_memory_device import Block
+from pynes.core.exceptions import OutOfRangeMemoryException
+
+
+class Mirroring(Enum):
+    HORIZONTAL  = 'horizontal'
+    VERTICAL    = 'vertical'
+    SINGLE_LO   = 'single_lo'
+    SINGLE_HI   = 'single_hi'
+    FOUR_SCREEN = 'four_screen'
+
+
+TABLE_SIZE: int = 0x0400
+
+# physical buffer behind each of the four logical nametables
+LAYOUTS = {
+    Mirroring.HORIZONTAL:  (0, 0, 1, 1),
+    Mirroring.VERTICAL:    (0, 1, 0, 1),
+    Mirroring.SINGLE_LO:   (0, 0, 0, 0),
+    Mirroring.SINGLE_HI:   (1, 1, 1, 1),
+    Mirroring.FOUR_SCREEN: (0, 1, 2, 3),
+}
 
 
 class PpuNametable(AbstractMemoryDevice):
+    """
+    2 KB of VRAM as two physical 1 KB buffers, the four logical nametables at
+    $2000-$2fff are views of them chosen by mirroring (set by the mapper). Every
+    buffer has prebuilt page handlers, so set_mirroring() only re-points the 16
+    pages of the bus. Four-screen cartridges bring 2 KB of their own, kept as
+    buffers 2 and 3.
+    """
     min_address = 0x2000
     max_address = 0x2fff
+    size_memory = 0x0800
+
+    def __init__(self, mirroring: Mirroring = Mirroring.HORIZONTAL):
+        super().__init__()
+        self.buffers: List[memoryview] = [self.memory[:TABLE_SIZE], self.memory[TABLE_SIZE:]]
+        self.handlers = [self.buffer_handlers(buffer) for buffer in self.buffers]
+        self.mirroring = mirroring
+        self.layout: Tuple[int, ...] = LAYOUTS[mirroring]
+        if mirroring is Mirroring.FOUR_SCREEN:
+            self.add_four_screen_buffers()
+
+    @staticmethod
+    def buffer_handlers(buffer: memoryview):
+
+        def read(addr: int) -> int:
+            return buffer[addr & (TABLE_SIZE - 1)]
+
+        def write(addr: int, data: int) -> None:
+            buffer[addr & (TABLE_SIZE - 1)] = data
+
+        return read, write
+
+    def add_four_screen_buffers(self) -> None:
+        if len(self.buffers) == 2:
+            extra = memoryview(bytearray(2 * TABLE_SIZE))
+            self.buffers += [extra[:TABLE_SIZE], extra[TABLE_SIZE:]]
+            self.handlers += [self.buffer_handlers(buffer) for buffer in self.buffers[2:]]
+
+    def set_mirroring(self, mirroring: Mirroring) -> None:
+        if mirroring is self.mirroring:
+            return
+        if mirroring is Mirroring.FOUR_SCREEN:
+            self.add_four_screen_buffers()
+        self.mirroring = mirroring
+        self.layout = LAYOUTS[mirroring]
+        if self.bus is not None:
+            pages = TABLE_SIZE >> 8
+            readers = [self.handlers[b][0] for b in self.layout for _ in range(pages)]
+            writers = [self.handlers[b][1] for b in self.layout for _ in range(pages)]
+            self.bus.set_pages(self.min_address >> 8, readers, writers)
+
+    def table_view(self, addr: int) -> Tuple[memoryview, int]:
+        """
+        Physical buffer behind `addr` and offset into it
+        """
+        table, offset = divmod(addr - self.min_address, TABLE_SIZE)
+        return self.buffers[self.layout[table]], offset
+
+    def write(self, addr: int, data: int) -> None:
+        if self.is_address_valid(addr):
+            buffer, offset = self.table_view(addr)
+            buffer[offset] = data
+
+    def read(self, addr: int, read_only: bool = False) -> int:
+        if self.is_address_valid(addr):
+            buffer, offset = self.table_view(addr)
+            return buffer[offset]
+        return AbstractMemoryDevice.INIT_VALUE
+
+    def read_block(self, addr: int, length: int) -> Block:
+        self.block_offset(addr, length)
+        buffer, offset = self.table_view(addr)
+        if offset + length <= TABLE_SIZE:
+            return buffer[offset:offset + length]
+        head = TABLE_SIZE - offset
+        return bytes(buffer[offset:]) + bytes(self.read_block(addr + head, length - head))
+
+    def write_block(self, addr: int, data: Block) -> None:
+        self.block_offset(addr, len(data))
+        buffer, offset = self.table_view(addr)
+        head = min(len(data), TABLE_SIZE - offset)
+        buffer[offset:offset + head] = data[:head]
+        if head < len(data):
+            self.write_block(addr + head, data[head:])
+
+    def block_offset(self, addr: int, length: int) -> int:
+        if length < 0 or not self.is_address_valid(addr) or not self.is_address_valid(addr + max(length - 1, 0)):
+            raise OutOfRangeMemoryException(f'block {hex(addr)}+{hex(length)} in {type(self).__name__}')
+        return addr - self.min_address
+
+    def snapshot(self) -> bytes:
+        return b''.join(bytes(buffer) for buffer in self.buffers)
+
+    def restore(self, snapshot: bytes) -> None:
+        if len(snapshot) > len(self.data):
+            self.add_four_screen_buffers()
+        for i, buffer in enumerate(self.buffers):
+            buffer[:] = snapshot[i * TABLE_SIZE:(i + 1) * TABLE_SIZE] or bytes(TABLE_SIZE)
+
+    def memory_map(self, bus) -> List[MemoryRange]:
+        ranges = []
+        for table, buffer in enumerate(self.layout):
+            lo = self.min_address + table * TABLE_SIZE
+            read, write = self.handlers[buffer]
+            ranges.append(MemoryRange(lo, lo + TABLE_SIZE - 1, read, write, self))
+        return ranges
@@ -1,6 +1,47 @@
+from typing import List
+
 from pynes.core.devices import AbstractMemoryDevice
+from pynes.core.devices.abstract_device import MemoryRange
+from pynes.core.devices.abstract_memory_device import Block
+
+# palette RAM index of every address in 32-byte mirror, backdrop entries of
+# sprite palettes ($3f10/$3f14/$3f18/$3f1c) are shared with background ones
+PALETTE_INDEX: List[int] = [i & 0x0f if i & 0x13 == 0x10 else i for i in range(0x20)]
 
 
 class PpuPalettes(AbstractMemoryDevice):
+    """
+    32 bytes of palette RAM mirrored over $3f00-$3fff
+    """
     min_address = 0x3f00
     max_address = 0x3fff
+    size_memory = 0x20
+
+    def read(self, addr: int, read_only: bool = False) -> int:
+        if self.is_address_valid(addr):
+            return self.data[PALETTE_INDEX[addr & 0x1f]]
+        return AbstractMemoryDevice.INIT_VALUE
+
+    def write(self, addr: int, data: int) -> None:
+        if self.is_address_valid(addr):
+            self.data[PALETTE_INDEX[addr & 0x1f]] = data & 0x3f
+
+    def read_block(self, addr: int, length: int) -> Block:
+        self.block_offset(addr, length)
+        return bytes(self.read(a) for a in range(addr, addr + length))
+
+    def write_block(self, addr: int, data: Block) -> None:
+        self.block_offset(addr, len(data))
+        for a, value in enumerate(data, addr):
+            self.write(a, value)
+
+    def memory_map(self, bus) -> List[MemoryRange]:
+        data = self.data
+
+        def read(addr: int) -> int:
+            return data[PALETTE_INDEX[addr & 0x1f]]
+
+        def write(addr: int, value: int) -> None:
+            data[PALETTE_INDEX[addr & 0x1f]] = value & 0x3f
+
+        return [MemoryRange(self.min_address, self.max_address, read, write, self)]
@@ -1,15 +1,607 @@
+from typing import Callable, List, Optional, Tuple
+
+import numpy as np
+
 from pynes.core.devices import Bus, AbstractDevice
+from pynes.core.devices.abstract_device import MemoryRange
+from pynes.core.devices.abstract_memory_device import Block
 from pynes.core.devices.ppu.nametable import PpuNametable
 from pynes.core.devices.ppu.palettes import PpuPalettes
 from pynes.core.devices.ppu.pattern import PpuPattern
+from pynes.core.devices.ppu.tile_cache import PATTERN_SIZE, TileCache
+
+SCREEN_WIDTH:  int = 256
+SCREEN_HEIGHT: int = 240
+
+DOTS_PER_SCANLINE:   int = 341
+SCANLINES_PER_FRAME: int = 262
+DOTS_PER_FRAME:      int = DOTS_PER_SCANLINE * SCANLINES_PER_FRAME
+VBLANK_SCANLINE:     int = 241
+PRE_RENDER_SCANLINE: int = 261
+
+REGISTERS_ADDRESS:   int = 0x2000
+REGISTERS_MIRRORED: int = 0x3fff
+
+PPUCTRL:   int = 0x00
+PPUMASK:   int = 0x01
+PPUSTATUS: int = 0x02
+OAMADDR:   int = 0x03
+OAMDATA:   int = 0x04
+PPUSCROLL: int = 0x05
+PPUADDR:   int = 0x06
+PPUDATA:   int = 0x07
+
+CTRL_INCREMENT_32:  int = 0x04
+CTRL_SPRITE_TABLE:  int = 0x08
+CTRL_BG_TABLE:      int = 0x10
+CTRL_SPRITE_8X16:   int = 0x20
+CTRL_NMI:           int = 0x80
+
+MASK_GRAYSCALE:     int = 0x01
+MASK_BG_LEFT:       int = 0x02
+MASK_SPRITES_LEFT:  int = 0x04
+MASK_BG:            int = 0x08
+MASK_SPRITES:       int = 0x10
+MASK_RENDERING:     int = MASK_BG | MASK_SPRITES
+
+STATUS_OVERFLOW:    int = 0x20
+STATUS_SPRITE_0:    int = 0x40
+STATUS_VBLANK:      int = 0x80
+
+SPRITES:            int = 64
+SPRITES_PER_LINE:   int = 8
+SPRITE_COLUMNS:     np.ndarray = np.arange(8)
+
+# whether the CPU has to be in sync with the PPU when an event happens: never
+# (only visible through registers), always (NMI, end of frame) or when a mapper
+# counts scanlines (its IRQ)
+SYNC_NONE:    int = 0
+SYNC_ALWAYS:  int = 1
+SYNC_COUNTER: int = 2
+
+
+def increment_vertical(v: int) -> int:
+    """
+    Moves loopy address `v` one pixel row down, wrapping into the vertical nametable
+    """
+    if v & 0x7000 != 0x7000:
+        return v + 0x1000
+    v &= ~0x7000
+    coarse_y = (v & 0x03e0) >> 5
+    if coarse_y == 29:
+        coarse_y = 0
+        v ^= 0x0800
+    elif coarse_y == 31:
+        coarse_y = 0
+    else:
+        coarse_y += 1
+    return (v & ~0x03e0) | (coarse_y << 5)
+
+
+def frame_events(ppu) -> List[Tuple[int, Callable[[], None], int]]:
+    """
+    (dot offset in frame, handler, sync) of everything happening in a frame,
+    dots in between are only counted
+    """
+    events = []
+    for scanline in range(SCREEN_HEIGHT):
+        events.append((scanline * DOTS_PER_SCANLINE + 256, ppu.render_scanline, SYNC_NONE))
+        events.append((scanline * DOTS_PER_SCANLINE + 260, ppu.clock_scanline_counter, SYNC_COUNTER))
+    pre_render = PRE_RENDER_SCANLINE * DOTS_PER_SCANLINE
+    events += [
+        (VBLANK_SCANLINE * DOTS_PER_SCANLINE + 1, ppu.start_vblank, SYNC_ALWAYS),
+        (pre_render + 1, ppu.end_vblank, SYNC_NONE),
+        (pre_render + 256, ppu.pre_render_scanline, SYNC_NONE),
+        (pre_render + 260, ppu.clock_scanline_counter, SYNC_COUNTER),
+        (pre_render + 280, ppu.copy_vertical, SYNC_NONE),
+        (pre_render + 339, ppu.end_frame, SYNC_ALWAYS),
+    ]
+    return events
 
 
 class Ppu2C02(AbstractDevice):
+    """
+    Registers are mapped at $2000-$2007 of the CPU bus and mirrored up to $3fff.
+
+    Time is kept in PPU dots since power up (`dots`, three per CPU cycle). A
+    frame is a fixed list of events at known dots, so run_dots() jumps from one
+    event to the next and clock() just counts. Every visible scanline is drawn
+    at once at its dot 256: rows of tiles and sprites of the line are taken from
+    the pre-decoded pattern tables (see TileCache), combined into palette RAM
+    addresses and then looked up into `frame`, a 240x256 array of NES color
+    indices (RgbPalette turns it into RGB).
+
+    When a frame is complete (start of vblank) `frame_complete` is set and
+    `frame_callback(frame)` is called; NMI is delivered through `nmi_callback`.
+
+    With `cpu` set the PPU is run lazily (catch-up): it stays behind until the
+    CPU touches $2000-$2007, then catches up to the CPU time of the access.
+    Events the CPU could notice otherwise (NMI, scanline IRQ, end of frame) are
+    announced by next_sync_dot(), so the CPU can run in slices up to them (see
+    Nes). Sprite 0 hit is predicted from OAM, scroll and patterns ahead
+    of drawing (next_sprite_0_dot()), so a $2002 read sees it at its exact dot.
+    """
 
     def __init__(self):
         super().__init__()
+        self.registers = bytearray(8)
         self.internal_bus = Bus()
+        # decoded pattern tables, kept up to date through bus_remapped/pages_switching
+        self.tile_cache = TileCache(self.internal_bus)
         self.connect_to_bus(self.internal_bus)
         PpuPattern().connect_to_bus(self.internal_bus)
         PpuNametable().connect_to_bus(self.internal_bus)
         PpuPalettes().connect_to_bus(self.internal_bus)
+        self.ppu_readers = self.internal_bus.readers
+        self.ppu_writers = self.internal_bus.writers
+        # zero-copy view of palette RAM for per-scanline lookups
+        self.palette = np.frombuffer(self.internal_bus.devices['PpuPalettes'].data, dtype=np.uint8)
+        # object attribute memory: (y, tile, attributes, x) of 64 sprites, oam
+        # is a flat view of the same 256 bytes
+        self.sprites = np.zeros((SPRITES, 4), np.uint8)
+        self.oam = self.sprites.reshape(-1)
+        self.oam_addr = 0x00
+
+        self.ctrl = 0x00
+        self.mask = 0x00
+        self.status = 0x00
+        # loopy registers: current and temporary VRAM address, fine x scroll, write toggle
+        self.v = 0x0000
+        self.t = 0x0000
+        self.fine_x = 0
+        self.w = 0
+        self.data_buffer = 0x00
+        # open bus: last value written to any register, seen in reads of unused bits
+        self.io_latch = 0x00
+
+        self.frame = np.zeros((SCREEN_HEIGHT, SCREEN_WIDTH), dtype=np.uint8)
+        # PPUMASK color emphasis bits each scanline was drawn with, see RgbPalette
+        self.emphasis = np.zeros(SCREEN_HEIGHT, dtype=np.uint8)
+        self.frame_complete = False
+        self.frame_callback: Optional[Callable[[np.ndarray], None]] = None
+        self.nmi_callback: Optional[Callable[[], None]] = None
+        # clocked once per rendered scanline (e.g. MMC3 IRQ counter)
+        self.scanline_callback: Optional[Callable[[], None]] = None
+
+        self.dots = 0
+        # CPU to catch up with, dots = 3 * cpu.total_cycles + dot_offset
+        self.cpu = None
+        self.dot_offset = 0
+        self.frame_count = 0
+        self.frame_start = 0
+        self.events = frame_events(self)
+        self.event_index = 0
+        self.next_event = self.events[0][0]
+        # predicted dot of the next sprite 0 hit, None until asked for again
+        # after a write that may move it
+        self.sprite_0_dot: Optional[float] = None
+
+        # per-scanline work buffers
+        self.line = np.zeros(SCREEN_WIDTH, dtype=np.uint8)
+        self.predicted_line = np.zeros(SCREEN_WIDTH, dtype=np.uint8)
+        self.tile_index = [0] * 33
+        self.tile_attr = [0] * 33
+
+    # timing
+
+    @property
+    def scanline(self) -> int:
+        offset = self.dots - self.frame_start
+        return offset // DOTS_PER_SCANLINE if offset >= 0 else PRE_RENDER_SCANLINE
+
+    @property
+    def dot(self) -> int:
+        offset = self.dots - self.frame_start
+        return offset % DOTS_PER_SCANLINE if offset >= 0 else DOTS_PER_SCANLINE - 1
+
+    @property
+    def rendering(self) -> bool:
+        return bool(self.mask & MASK_RENDERING)
+
+    def clock(self) -> None:
+        self.dots += 1
+        if self.dots >= self.next_event:
+            self.run_events(self.dots)
+
+    def run_dots(self, dots: int) -> None:
+        self.run_events(self.dots + dots)
+
+    def run_events(self, until: int) -> None:
+        """
+        Handles every event up to dot `until` (inclusive) and moves time there
+        """
+        while self.next_event <= until:
+            self.dots = self.next_event
+            handler = self.events[self.event_index][1]
+            self.event_index += 1
+            if self.event_index < len(self.events):
+                self.next_event = self.frame_start + self.events[self.event_index][0]
+            handler()
+        self.dots = until
+
+    def catch_up(self) -> None:
+        """
+        Runs up to the current CPU time
+        """
+        target = 3 * self.cpu.total_cycles + self.dot_offset
+        if target > self.dots:
+            self.run_events(target)
+
+    def next_sync_dot(self) -> int:
+        """
+        Dot of the next event the CPU has to see on time
+        """
+        counter = self.scanline_callback is not None
+        for offset, _, sync in self.events[self.event_index:]:
+            if sync == SYNC_ALWAYS or sync == SYNC_COUNTER and counter:
+                return self.frame_start + offset
+        # end of frame is always a sync event, so it is never reached
+        return self.frame_start + DOTS_PER_FRAME
+
+    def next_sprite_0_dot(self) -> float:
+        """
+        Dot sprite 0 hit is set at next, inf if it is not going to happen before
+        the end of the next frame
+        """
+        if self.sprite_0_dot is None:
+            self.sprite_0_dot = self.predict_sprite_0_hit()
+        return self.sprite_0_dot
+
+    def update_sprite_0_hit(self) -> None:
+        """
+        Sets sprite 0 hit flag once the predicted dot is reached, before the
+        line is drawn at its dot 256
+        """
+        if self.next_sprite_0_dot() <= self.dots:
+            self.status |= STATUS_SPRITE_0
+            self.sprite_0_dot = None
+
+    def predict_sprite_0_hit(self) -> float:
+        """
+        Walks the events up to the end of the next frame, moving v the way
+        rendering does, and tests sprite 0 against the background of every
+        line it is on. Holds as long as nothing is written to the PPU.
+        """
+        if self.mask & MASK_RENDERING != MASK_RENDERING:
+            return float('inf')
+        top, height = int(self.sprites[0, 0]) + 1, self.sprite_height()
+        hit = bool(self.status & STATUS_SPRITE_0)
+        v, start, frame_count = self.v, self.frame_start, self.frame_count
+        events = self.events[self.event_index:]
+        for _ in range(2):
+            for offset, handler, _ in events:
+                if handler == self.render_scanline:
+                    y = offset // DOTS_PER_SCANLINE
+                    x = self.sprite_0_hit_x(y, v) if not hit and top <= y < top + height else None
+                    if x is not None:
+                        # pixel x is output at dot x + 1
+                        return start + y * DOTS_PER_SCANLINE + x + 1
+                    v = (increment_vertical(v) & ~0x041f) | (self.t & 0x041f)
+                elif handler == self.pre_render_scanline:
+                    v = (increment_vertical(v) & ~0x041f) | (self.t & 0x041f)
+                elif handler == self.copy_vertical:
+                    v = (v & ~0x7be0) | (self.t & 0x7be0)
+                elif handler == self.end_vblank:
+                    hit = False
+            # rendering is on, so odd frames are one dot shorter
+            start += DOTS_PER_FRAME - 1 if frame_count & 1 else DOTS_PER_FRAME
+            frame_count += 1
+            events = self.events
+        return float('inf')
+
+    def sprite_0_hit_x(self, y: int, v: int) -> Optional[int]:
+        """
+        First x on scanline `y` where sprite 0 would hit the background
+        fetched from `v`
+        """
+        line = self.predicted_line
+        self.tile_cache.update()
+        self.background_line(line, v)
+        pixels, _, x = self.sprite_pixels(np.zeros(1, dtype=np.intp), y)
+        positions = x[0] + SPRITE_COLUMNS
+        # no hit at x=255
+        hits = (pixels[0] != 0) & (positions < SCREEN_WIDTH - 1)
+        if not self.mask & MASK_SPRITES_LEFT:
+            hits &= positions >= 8
+        hits &= (line[np.minimum(positions, SCREEN_WIDTH - 1)] & 0x03) != 0
+        found = np.flatnonzero(hits)
+        return int(positions[found[0]]) if len(found) else None
+
+    def next_status_change_dot(self) -> float:
+        """
+        Dot PPUSTATUS may read differently from (vblank start or end, sprite 0
+        hit, overflow), as long as nothing is written to the PPU
+        """
+        overflow_lines = ()
+        if self.rendering and not self.status & STATUS_OVERFLOW:
+            rows = np.arange(SCREEN_HEIGHT)[:, None] - 1 - self.sprites[:, 0].astype(np.int16)
+            in_range = (rows >= 0) & (rows < self.sprite_height())
+            # hardware only sets overflow on lines with 8 sprites at least
+            overflow_lines = set(np.flatnonzero(in_range.sum(axis=1) >= SPRITES_PER_LINE).tolist())
+        changes = (self.start_vblank, self.end_vblank)
+        start, events = self.frame_start, self.events[self.event_index:]
+        for _ in range(2):
+            for offset, handler, _ in events:
+                overflow = handler == self.render_scanline and offset // DOTS_PER_SCANLINE in overflow_lines
+                if overflow or handler in changes:
+                    return min(start + offset, self.next_sprite_0_dot())
+            start += DOTS_PER_FRAME - 1 if self.frame_count & 1 and self.rendering else DOTS_PER_FRAME
+            events = self.events
+        return self.next_sprite_0_dot()
+
+    def stable_until(self, addr: int) -> Optional[float]:
+        register = addr & 0x07
+        if self.cpu is None or register == PPUDATA:
+            # time is not known, or reads move v
+            return None
+        if register != PPUSTATUS:
+            return float('inf')
+        self.catch_up()
+        return (self.next_status_change_dot() - self.dot_offset + 2) // 3
+
+    def end_frame(self) -> None:
+        # odd frames are one dot shorter while rendering
+        skip = self.frame_count & 1 and self.rendering
+        self.frame_start += DOTS_PER_FRAME - 1 if skip else DOTS_PER_FRAME
+        self.frame_count += 1
+        self.event_index = 0
+        self.next_event = self.frame_start + self.events[0][0]
+
+    def start_vblank(self) -> None:
+        self.status |= STATUS_VBLANK
+        self.frame_complete = True
+        if self.frame_callback is not None:
+            self.frame_callback(self.frame)
+        if self.ctrl & CTRL_NMI and self.nmi_callback is not None:
+            self.nmi_callback()
+
+    def end_vblank(self) -> None:
+        self.status &= ~(STATUS_VBLANK | STATUS_SPRITE_0 | STATUS_OVERFLOW)
+        self.sprite_0_dot = None
+
+    def clock_scanline_counter(self) -> None:
+        if self.rendering and self.scanline_callback is not None:
+            self.scanline_callback()
+
+    # loopy address updates
+
+    def increment_vertical(self) -> None:
+        self.v = increment_vertical(self.v)
+
+    def copy_horizontal(self) -> None:
+        self.v = (self.v & ~0x041f) | (self.t & 0x041f)
+
+    def copy_vertical(self) -> None:
+        if self.rendering:
+            self.v = (self.v & ~0x7be0) | (self.t & 0x7be0)
+
+    def pre_render_scanline(self) -> None:
+        if self.rendering:
+            self.increment_vertical()
+            self.copy_horizontal()
+
+    # rendering
+
+    def render_scanline(self) -> None:
+        y = self.scanline
+        self.emphasis[y] = self.mask >> 5
+        if not self.rendering:
+            # backdrop color, or the palette entry v points to
+            v = self.v
+            self.frame[y] = self.palette[v & 0x1f if v & 0x3f00 == 0x3f00 else 0]
+            return
+        line = self.line
+        self.tile_cache.update()
+        if self.mask & MASK_BG:
+            self.background_line(line, self.v)
+        else:
+            line.fill(0)
+        if self.mask & MASK_SPRITES:
+            self.composite_sprites(line, y)
+        palette = self.palette & 0x30 if self.mask & MASK_GRAYSCALE else self.palette
+        np.take(palette, line, out=self.frame[y])
+        self.increment_vertical()
+        self.copy_horizontal()
+
+    def background_line(self, line: np.ndarray, v: int) -> None:
+        """
+        Palette RAM addresses of background pixels of the line `v` points to, 0
+        for transparent
+        """
+        read = self.ppu_readers
+        fine_y = (v >> 12) & 0x07
+        table = (self.ctrl & CTRL_BG_TABLE) << 4
+        indices, attrs = self.tile_index, self.tile_attr
+        for i in range(33):
+            addr = 0x2000 | (v & 0x0fff)
+            indices[i] = table | read[addr >> 8](addr)
+            addr = 0x23c0 | (v & 0x0c00) | ((v >> 4) & 0x38) | ((v >> 2) & 0x07)
+            attrs[i] = ((read[addr >> 8](addr) >> (((v >> 4) & 0x04) | (v & 0x02))) & 0x03) << 2
+            if v & 0x001f == 0x001f:
+                v = (v & ~0x001f) ^ 0x0400
+            else:
+                v += 1
+        pixels = self.tile_cache.tiles[indices, fine_y]
+        pixels |= np.where(pixels, np.array(attrs, dtype=np.uint8)[:, None], 0).astype(np.uint8)
+        line[:] = pixels.ravel()[self.fine_x:self.fine_x + SCREEN_WIDTH]
+        if not self.mask & MASK_BG_LEFT:
+            line[:8] = 0
+
+    def sprite_height(self) -> int:
+        return 16 if self.ctrl & CTRL_SPRITE_8X16 else 8
+
+    def sprite_rows(self, tiles: np.ndarray, attrs: np.ndarray, rows: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Tile cache indices and rows of the given lines of sprites
+        """
+        height = self.sprite_height()
+        rows = np.where(attrs & 0x80, height - 1 - rows, rows)
+        if height == 16:
+            return ((tiles & 0x01) << 8) | (tiles & 0xfe) | (rows >> 3), rows & 0x07
+        return ((self.ctrl & CTRL_SPRITE_TABLE) << 5) | tiles, rows
+
+    def sprite_pixels(self, found: np.ndarray, y: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Rows of pixels on scanline `y`, attributes and x of sprites `found`
+        """
+        sprite_y, tile, attr, x = self.sprites[found].astype(np.int16).T
+        index, row = self.sprite_rows(tile, attr, y - 1 - sprite_y)
+        pixels = self.tile_cache.tiles[index, row]
+        return np.where((attr & 0x40)[:, None] != 0, pixels[:, ::-1], pixels), attr, x
+
+    def evaluate_sprites(self, y: int) -> np.ndarray:
+        """
+        OAM indices of the first 8 sprites on scanline `y`. Sets overflow flag
+        the way hardware does: after the 8th sprite it keeps comparing, but
+        takes byte m of sprite n as Y, m going up with every miss.
+        """
+        rows = y - 1 - self.sprites[:, 0].astype(np.int16)
+        found = np.flatnonzero((rows >= 0) & (rows < self.sprite_height()))
+        if len(found) >= SPRITES_PER_LINE:
+            last = found[SPRITES_PER_LINE - 1]
+            misses = np.arange(SPRITES - 1 - last)
+            compared = self.oam[(last + 1 + misses) * 4 + (misses & 0x03)].astype(np.int16)
+            if np.any((y - 1 - compared >= 0) & (y - 1 - compared < self.sprite_height())):
+                self.status |= STATUS_OVERFLOW
+            found = found[:SPRITES_PER_LINE]
+        return found
+
+    def composite_sprites(self, line: np.ndarray, y: int) -> None:
+        """
+        Blends sprites of scanline `y` into `line` of background palette addresses
+        """
+        found = self.evaluate_sprites(y)
+        if not len(found):
+            return
+        pixels, attr, x = self.sprite_pixels(found, y)
+        # opaque pixels of all sprites in OAM order, lower index wins on overlap
+        opaque = pixels != 0
+        positions = (x[:, None] + SPRITE_COLUMNS)[opaque]
+        colors = (0x10 | ((attr & 0x03) << 2)[:, None] | pixels)[opaque]
+        behind = np.broadcast_to((attr & 0x20)[:, None] != 0, opaque.shape)[opaque]
+        sprite_0 = np.broadcast_to((found == 0)[:, None], opaque.shape)[opaque]
+        visible = positions < SCREEN_WIDTH
+        if not self.mask & MASK_SPRITES_LEFT:
+            visible &= positions >= 8
+        positions, first = np.unique(positions[visible], return_index=True)
+        colors, behind, sprite_0 = colors[visible][first], behind[visible][first], sprite_0[visible][first]
+        opaque_bg = (line[positions] & 0x03) != 0
+        # no hit at x=255
+        if found[0] == 0 and np.any(sprite_0 & opaque_bg & (positions < SCREEN_WIDTH - 1)):
+            self.status |= STATUS_SPRITE_0
+        shown = ~(behind & opaque_bg)
+        line[positions[shown]] = colors[shown]
+
+    # CPU side registers
+
+    def ppu_read(self, addr: int) -> int:
+        addr &= 0x3fff
+        if 0x3000 <= addr < 0x3f00:
+            addr -= 0x1000
+        return self.ppu_readers[addr >> 8](addr)
+
+    def ppu_write(self, addr: int, data: int) -> None:
+        addr &= 0x3fff
+        if 0x3000 <= addr < 0x3f00:
+            addr -= 0x1000
+        self.ppu_writers[addr >> 8](addr, data)
+        if addr < PATTERN_SIZE:
+            self.tile_cache.invalidate(addr)
+
+    def cpu_read(self, addr: int) -> int:
+        if self.cpu is not None:
+            self.catch_up()
+        register = addr & 0x07
+        if register == PPUSTATUS:
+            self.update_sprite_0_hit()
+            status = self.status | (self.io_latch & 0x1f)
+            self.status &= ~STATUS_VBLANK
+            self.w = 0
+            return status
+        if register == OAMDATA:
+            return int(self.oam[self.oam_addr])
+        if register == PPUDATA:
+            v = self.v
+            value = self.ppu_read(v)
+            if v & 0x3f00 == 0x3f00:
+                # palette is not buffered, buffer gets the nametable byte underneath
+                self.data_buffer = self.ppu_read(v - 0x1000)
+            else:
+                value, self.data_buffer = self.data_buffer, value
+            self.v = (v + (32 if self.ctrl & CTRL_INCREMENT_32 else 1)) & 0x7fff
+            return value
+        # write-only registers
+        return self.io_latch
+
+    def cpu_write(self, addr: int, data: int) -> None:
+        if self.cpu is not None:
+            self.catch_up()
+        register = addr & 0x07
+        self.registers[register] = data
+        self.io_latch = data
+        self.sprite_0_dot = None
+        if register == PPUCTRL:
+            nmi_enabled = self.ctrl & CTRL_NMI
+            self.ctrl = data
+            self.t = (self.t & ~0x0c00) | ((data & 0x03) << 10)
+            if not nmi_enabled and data & CTRL_NMI and self.status & STATUS_VBLANK and self.nmi_callback:
+                self.nmi_callback()
+        elif register == PPUMASK:
+            self.mask = data
+        elif register == OAMADDR:
+            self.oam_addr = data
+        elif register == OAMDATA:
+            self.oam[self.oam_addr] = data
+            self.oam_addr = (self.oam_addr + 1) & 0xff
+        elif register == PPUSCROLL:
+            if self.w == 0:
+                self.t = (self.t & ~0x001f) | (data >> 3)
+                self.fine_x = data & 0x07
+            else:
+                self.t = (self.t & ~0x73e0) | ((data & 0x07) << 12) | ((data & 0xf8) << 2)
+            self.w ^= 1
+        elif register == PPUADDR:
+            if self.w == 0:
+                self.t = (self.t & 0x00ff) | ((data & 0x3f) << 8)
+            else:
+                self.t = (self.t & 0x7f00) | data
+                self.v = self.t
+            self.w ^= 1
+        elif register == PPUDATA:
+            self.ppu_write(self.v, data)
+            self.v = (self.v + (32 if self.ctrl & CTRL_INCREMENT_32 else 1)) & 0x7fff
+
+    def read(self, addr: int, read_only: bool = False) -> int:
+        if read_only:
+            return self.registers[addr & 0x07]
+        return self.cpu_read(addr)
+
+    def memory_map(self, bus) -> List[MemoryRange]:
+        if bus is self.internal_bus:
+            return []
+        return [MemoryRange(REGISTERS_ADDRESS, REGISTERS_MIRRORED, self.cpu_read, self.cpu_write, self)]
+
+    def bus_remapped(self, bus) -> None:
+        if bus is self.internal_bus:
+            self.tile_cache.invalidate_all()
+            self.sprite_0_dot = None
+
+    def pages_switching(self, bus, first_page: int, count: int) -> None:
+        if bus is not self.internal_bus:
+            return
+        # bank or mirroring switch is seen from the current CPU time on
+        if self.cpu is not None:
+            self.catch_up()
+        if first_page < PATTERN_SIZE >> 8:
+            self.tile_cache.invalidate_pages(first_page, count)
+        self.sprite_0_dot = None
+
+    def write_oam_block(self, data: Block) -> None:
+        """
+        Writes 256 bytes into OAM starting at OAMADDR and wrapping around, as
+        256 writes to OAMDATA would
+        """
+        if self.cpu is not None:
+            self.catch_up()
+        self.sprite_0_dot = None
+        self.oam[:] = np.roll(np.frombuffer(bytes(data), np.uint8), self.oam_addr)
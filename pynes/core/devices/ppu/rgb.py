@@ -0,0 +1,93 @@
+from os import PathLike
+from typing import Optional, Union
+
+import numpy as np
+
+from pynes.core.devices.ppu.palettes import PpuPalettes
+from pynes.core.devices.ppu.ppu2C02 import SCREEN_HEIGHT, SCREEN_WIDTH
+
+COLORS:          int = 0x40
+EMPHASIS_COLORS: int = 8 * COLORS
+# non-emphasized channels are dimmed to this when any emphasis bit is set
+EMPHASIS_DIM:  float = 0.816
+
+# RGB of the 64 NES colors a palette RAM entry can hold
+DEFAULT_COLORS = np.array([
+    (84, 84, 84), (0, 30, 116), (8, 16, 144), (48, 0, 136), (68, 0, 100), (92, 0, 48), (84, 4, 0), (60, 24, 0),
+    (32, 42, 0), (8, 58, 0), (0, 64, 0), (0, 60, 0), (0, 50, 60), (0, 0, 0), (0, 0, 0), (0, 0, 0),
+    (152, 150, 152), (8, 76, 196), (48, 50, 236), (92, 30, 228), (136, 20, 176), (160, 20, 100), (152, 34, 32),
+    (120, 60, 0), (84, 90, 0), (40, 114, 0), (8, 124, 0), (0, 118, 40), (0, 102, 120), (0, 0, 0), (0, 0, 0),
+    (0, 0, 0),
+    (236, 238, 236), (76, 154, 236), (120, 124, 236), (176, 98, 236), (228, 84, 236), (236, 88, 180),
+    (236, 106, 100), (212, 136, 32), (160, 170, 0), (116, 196, 0), (76, 208, 32), (56, 204, 108), (56, 180, 204),
+    (60, 60, 60), (0, 0, 0), (0, 0, 0),
+    (236, 238, 236), (168, 204, 236), (188, 188, 236), (212, 178, 236), (236, 174, 236), (236, 174, 212),
+    (236, 180, 176), (228, 196, 144), (204, 210, 120), (180, 222, 120), (168, 226, 144), (152, 226, 180),
+    (160, 214, 228), (160, 162, 160), (0, 0, 0), (0, 0, 0),
+], dtype=np.uint8)
+
+
+def with_emphasis(colors: np.ndarray) -> np.ndarray:
+    """
+    512-entry table out of 64 colors: entry (emphasis << 6) | color, emphasis
+    being PPUMASK bits 5-7 (red, green, blue)
+    """
+    table = np.empty((EMPHASIS_COLORS, 3), dtype=np.uint8)
+    for emphasis in range(8):
+        # channels of the emphasis bits keep their level, others are dimmed
+        scale = np.array([1.0 if emphasis & (1 << c) or not emphasis else EMPHASIS_DIM for c in range(3)])
+        table[emphasis * COLORS:(emphasis + 1) * COLORS] = np.round(colors * scale).astype(np.uint8)
+    return table
+
+
+def load_pal(path: Union[str, PathLike]) -> np.ndarray:
+    """
+    Colors of a .pal file: 64 RGB triplets, or 512 with emphasis variants
+    """
+    with open(path, 'rb') as pal_io:
+        data = pal_io.read()
+    if len(data) not in (COLORS * 3, EMPHASIS_COLORS * 3):
+        raise ValueError(f'{path}: .pal file is {len(data)} bytes, expected {COLORS * 3} or {EMPHASIS_COLORS * 3}')
+    return np.frombuffer(data, dtype=np.uint8).reshape(-1, 3).copy()
+
+
+class RgbPalette:
+    """
+    Converts frames of NES color indices (as PPU palette RAM holds them) to RGB
+    with one lookup into a 512-entry table. Output is a reused (256, 240, 3)
+    array in x, y order, ready for pygame.surfarray.blit_array().
+    """
+
+    def __init__(self, colors: Optional[np.ndarray] = None):
+        colors = DEFAULT_COLORS if colors is None else colors
+        self.table = with_emphasis(colors) if len(colors) == COLORS else np.ascontiguousarray(colors, dtype=np.uint8)
+        self.output = np.zeros((SCREEN_WIDTH, SCREEN_HEIGHT, 3), dtype=np.uint8)
+
+    @classmethod
+    def from_file(cls, path: Union[str, PathLike]) -> 'RgbPalette':
+        return cls(load_pal(path))
+
+    def convert(self, frame: np.ndarray, emphasis: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        RGB of `frame` (240x256 color indices), `emphasis` gives PPUMASK
+        emphasis bits per scanline
+        """
+        indices = frame.T
+        if emphasis is not None and emphasis.any():
+            indices = indices | (emphasis.astype(np.uint16) << 6)
+        np.take(self.table, indices, axis=0, out=self.output)
+        return self.output
+
+    def entries(self, palettes: PpuPalettes) -> np.ndarray:
+        """
+        RGB of the 32 palette RAM entries, e.g. for palette viewers
+        """
+        return self.table[np.frombuffer(palettes.data, dtype=np.uint8)]
+
+    def save_ppm(self, path: Union[str, PathLike]) -> None:
+        """
+        Writes the last converted frame as binary PPM image
+        """
+        with open(path, 'wb') as ppm_io:
+            ppm_io.write(b'P6 %d %d 255\n' % (SCREEN_WIDTH, SCREEN_HEIGHT))
+            ppm_io.write(self.output.transpose(1, 0, 2).tobytes())
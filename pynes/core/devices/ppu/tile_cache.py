@@ -0,0 +1,60 @@
+from typing import Set
+
+import numpy as np
+
+PATTERN_SIZE: int = 0x2000
+TILE_SIZE:    int = 0x10
+TILES:        int = PATTERN_SIZE // TILE_SIZE
+
+
+def decode_tiles(data) -> np.ndarray:
+    """
+    2-bit pixels (N, 8, 8) of N tiles given as 16-byte bitplane pairs
+    """
+    planes = np.frombuffer(data, dtype=np.uint8).reshape(-1, 2, 8, 1)
+    bits = np.unpackbits(planes, axis=3)
+    return bits[:, 0] | (bits[:, 1] << 1)
+
+
+class TileCache:
+    """
+    Both pattern tables ($0000-$1fff of the PPU bus) decoded once into
+    `tiles[tile, row, column]` 2-bit pixels, tile 256 being the first one of
+    the right table.
+
+    Tiles are only marked stale on CHR-RAM writes and bank switches, update()
+    decodes them again from whatever the bus serves there now, one block read
+    per run of consecutive stale tiles.
+    """
+
+    def __init__(self, bus):
+        self.bus = bus
+        self.tiles = np.zeros((TILES, 8, 8), dtype=np.uint8)
+        self.stale: Set[int] = set(range(TILES))
+
+    def invalidate(self, addr: int) -> None:
+        if addr < PATTERN_SIZE:
+            self.stale.add(addr // TILE_SIZE)
+
+    def invalidate_pages(self, first_page: int, count: int) -> None:
+        first_tile = (first_page << 8) // TILE_SIZE
+        self.stale.update(range(first_tile, min(first_tile + (count << 8) // TILE_SIZE, TILES)))
+
+    def invalidate_all(self) -> None:
+        self.stale.update(range(TILES))
+
+    def update(self) -> None:
+        if not self.stale:
+            return
+        stale = sorted(self.stale)
+        self.stale.clear()
+        start = end = stale[0]
+        for tile in stale[1:]:
+            if tile != end + 1:
+                self.decode(start, end + 1)
+                start = tile
+            end = tile
+        self.decode(start, end + 1)
+
+    def decode(self, start: int, end: int) -> None:
+        self.tiles[start:end] = decode_tiles(self.bus.read_block(start * TILE_SIZE, (end - start) * TILE_SIZE))
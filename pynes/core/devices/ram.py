@@ -1,6 +1,77 @@
+from typing import List, Optional
+
 from pynes.core.devices import AbstractMemoryDevice
+from pynes.core.devices.abstract_device import MemoryRange
+from pynes.core.devices.abstract_memory_device import Block
+from pynes.core.exceptions import OutOfRangeMemoryException
 
 
 class Ram(AbstractMemoryDevice):
+    """
+    2 KB of internal RAM, mirrored four times over $0000-$1fff. Mirroring is
+    resolved by the bus page table: every mirror is a separate range with its
+    own precomputed offset into the same buffer.
+    """
     min_address = 0x0000
     max_address = 0x1fff
+    size_memory = 0x0800
+
+    def __init__(self):
+        super().__init__()
+        self.mirrors = [self.mirror_range(base) for base in range(self.min_address, self.max_address, self.size_memory)]
+
+    def write(self, addr: int, data: int) -> None:
+        if self.is_address_valid(addr):
+            self.data[addr & (self.size_memory - 1)] = data
+
+    def read(self, addr: int, read_only: bool = False) -> int:
+        if self.is_address_valid(addr):
+            return self.data[addr & (self.size_memory - 1)]
+        return AbstractMemoryDevice.INIT_VALUE
+
+    def read_block(self, addr: int, length: int) -> Block:
+        offset = self.block_offset(addr, length) & (self.size_memory - 1)
+        if offset + length <= self.size_memory:
+            return self.memory[offset:offset + length]
+        # block crosses a mirror boundary and wraps around the buffer
+        return bytes(self.memory[offset:]) + bytes(self.memory[:offset + length - self.size_memory])
+
+    def write_block(self, addr: int, data: Block) -> None:
+        offset = self.block_offset(addr, len(data)) & (self.size_memory - 1)
+        head = min(len(data), self.size_memory - offset)
+        self.memory[offset:offset + head] = data[:head]
+        if head < len(data):
+            self.memory[:len(data) - head] = data[head:]
+
+    def block_offset(self, addr: int, length: int) -> int:
+        if length > self.size_memory:
+            raise OutOfRangeMemoryException(f'block {hex(addr)}+{hex(length)} in {type(self).__name__}')
+        return super().block_offset(addr, length)
+
+    def mirror_range(self, base: int) -> MemoryRange:
+        data = self.data
+
+        def read(addr: int) -> int:
+            return data[addr - base]
+
+        def write(addr: int, value: int) -> None:
+            data[addr - base] = value
+
+        return MemoryRange(base, base + self.size_memory - 1, read, write, self)
+
+    def memory_map(self, bus) -> List[MemoryRange]:
+        return self.mirrors
+
+    def stable_until(self, addr: int) -> Optional[float]:
+        # only the CPU writes here, interrupt handlers included
+        return float('inf')
+
+    def is_directly_mapped(self, bus) -> bool:
+        """
+        True when zero page and stack of `bus` are served by plain handlers of this
+        ram, so they may be accessed straight through `data`
+        """
+        zero_page = self.mirrors[0]
+        readers_direct = bus.readers[0] is bus.readers[1] is zero_page.read
+        writers_direct = bus.writers[0] is bus.writers[1] is zero_page.write
+        return readers_direct and writers_direct
@@ -0,0 +1,52 @@
+import mmap
+import os
+import time
+from os import PathLike
+from typing import Optional, Union
+
+
+class SaveRam:
+    """
+    Battery-backed RAM living in a memory-mapped save file: stores go straight
+    into the mapping and reach the disk on flush(), or on maybe_flush() once
+    `flush_interval` seconds have passed since the previous one.
+    """
+
+    def __init__(self, path: Union[str, PathLike], size: int, flush_interval: float = 1.0):
+        self.path = path
+        self.flush_interval = flush_interval
+        with open(path, 'ab'):
+            pass
+        with open(path, 'r+b') as save_io:
+            if os.fstat(save_io.fileno()).st_size < size:
+                save_io.truncate(size)
+            self.mapping = mmap.mmap(save_io.fileno(), size)
+        self.memory = memoryview(self.mapping)
+        self.last_flush = time.monotonic()
+
+    def flush(self) -> None:
+        self.mapping.flush()
+        self.last_flush = time.monotonic()
+
+    def close(self) -> None:
+        """
+        Flushes and unmaps the save file, `memory` can't be used afterwards.
+        Views of it from elsewhere (e.g. kept Bus.read_block() results) have to
+        be dropped first, else the file stays mapped until they are gone.
+        """
+        if self.mapping.closed:
+            return
+        self.flush()
+        self.memory.release()
+        try:
+            self.mapping.close()
+        except BufferError:
+            # still exported, it is unmapped once the last view is collected
+            pass
+
+    def maybe_flush(self, now: Optional[float] = None) -> bool:
+        now = time.monotonic() if now is None else now
+        if now - self.last_flush < self.flush_interval:
+            return False
+        self.flush()
+        return True
@@ -0,0 +1,62 @@
+from typing import Callable, List, NamedTuple, Optional
+
+# callback(addr, value, pc), pc is None when there is no cpu on the bus
+WatchCallback = Callable[[int, int, Optional[int]], None]
+
+WATCH_KINDS = ('read', 'write', 'execute')
+
+
+class Watchpoint(NamedTuple):
+    lo: int
+    hi: int
+    kind: str
+    callback: WatchCallback
+
+    def pages(self) -> range:
+        return range(self.lo >> 8, (self.hi >> 8) + 1)
+
+
+def watched_reader(read, watchpoints: List[Watchpoint], current_pc: Callable[[], Optional[int]]):
+    """
+    Wraps page reader so that accesses within `watchpoints` are reported after
+    the value is read
+    """
+
+    def reader(addr: int) -> int:
+        value = read(addr)
+        for watchpoint in watchpoints:
+            if watchpoint.lo <= addr <= watchpoint.hi:
+                watchpoint.callback(addr, value, current_pc())
+        return value
+
+    return reader
+
+
+def watched_fetcher(read, watchpoints: List[Watchpoint]):
+    """
+    Wraps page reader used for opcode fetches, the reported pc is the fetched address
+    """
+
+    def fetcher(addr: int) -> int:
+        value = read(addr)
+        for watchpoint in watchpoints:
+            if watchpoint.lo <= addr <= watchpoint.hi:
+                watchpoint.callback(addr, value, addr)
+        return value
+
+    return fetcher
+
+
+def watched_writer(write, watchpoints: List[Watchpoint], current_pc: Callable[[], Optional[int]]):
+    """
+    Wraps page writer so that accesses within `watchpoints` are reported after
+    the value is written
+    """
+
+    def writer(addr: int, data: int) -> None:
+        write(addr, data)
+        for watchpoint in watchpoints:
+            if watchpoint.lo <= addr <= watchpoint.hi:
+                watchpoint.callback(addr, data, current_pc())
+
+    return writer
@@ -4,3 +4,7 @@ class NoSuchDeviceException(Exception):
 
 class OutOfRangeMemoryException(Exception):
     pass
+
+
+class InvalidRomException(Exception):
+    pass
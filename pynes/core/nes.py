@@ -0,0 +1,226 @@
+"""
+The console: all devices on one bus, run off one master clock.
+"""
+import heapq
+from typing import Callable, Dict, List, Optional, Tuple
+
+from pynes.core.devices import Bus, Cpu6502, Ppu2C02, Ram, Cartridge, IoRegisters
+
+# kinds of scheduled events
+PPU_SYNC:      str = 'ppu_sync'
+DMA_END:       str = 'dma_end'
+FRAME_COUNTER: str = 'frame_counter'
+SPRITE_0_HIT:  str = 'sprite_0_hit'
+
+
+class Nes:
+    """
+    Owns the bus with CPU, PPU, RAM, I/O registers and the cartridge.
+
+    Time is counted in CPU cycles. Upcoming events are kept in a heap of
+    (cycle, order, kind): the next PPU sync dot (vblank NMI, scanline counter
+    for mapper IRQ, end of frame), the predicted sprite 0 hit, end of OAM DMA
+    and APU frame counter IRQ.
+    The CPU runs in one slice up to the earliest of them, then the PPU catches
+    up and the due events are handled. Events scheduled while the CPU runs
+    (e.g. by a DMA) cut the current slice short, rescheduling a kind replaces
+    its pending event. Within a slice the CPU skips iterations of loops that
+    only poll memory (`cpu.skip_idle_loops`), the devices tell until when the
+    polled values hold. Hot code runs as translated basic blocks
+    (`cpu.translate_blocks`), the rest with common instruction pairs fused
+    (`cpu.fuse_instructions`).
+
+    NMI raised by the PPU (also in the middle of an instruction, by a PPUCTRL
+    write during vblank) and IRQ (`irq_line()`) are taken between instructions.
+
+    With `lockstep` the CPU runs one instruction at a time instead, which gives
+    the same results and is kept to check the scheduler against.
+    """
+
+    def __init__(self, cartridge: Optional[Cartridge] = None, lockstep: bool = False):
+        self.bus = Bus()
+        self.cpu = Cpu6502()
+        self.cpu.connect_to_bus(self.bus)
+        self.ppu = Ppu2C02()
+        self.ppu.connect_to_bus(self.bus)
+        self.ram = Ram()
+        self.ram.connect_to_bus(self.bus)
+        self.io = IoRegisters()
+        self.io.connect_to_bus(self.bus)
+        self.cartridge = cartridge or Cartridge()
+        self.cartridge.connect_to_bus(self.bus)
+        if self.cartridge.mapper is not None:
+            self.cartridge.connect_to_ppu(self.ppu)
+        self.lockstep = lockstep
+        self.cpu.translate_blocks = not lockstep
+        self.cpu.fuse_instructions = not lockstep
+
+        self.events: List[Tuple[int, int, str]] = []
+        # cycle every kind is pending at, heap entries not matching it are stale
+        self.pending: Dict[str, int] = {}
+        self.order = 0
+        self.handlers: Dict[str, Callable[[], None]] = {
+            PPU_SYNC: self.ppu_sync,
+            DMA_END: self.dma_end,
+            FRAME_COUNTER: self.frame_counter,
+            SPRITE_0_HIT: self.sprite_0_hit,
+        }
+        self.dma_page = 0
+        self.nmi_pending = False
+
+        self.ppu.cpu = self.cpu
+        self.ppu.dot_offset = self.ppu.dots - 3 * self.cpu.total_cycles
+        self.ppu.nmi_callback = self.raise_nmi
+        self.io.dma_callback = self.start_dma
+        self.io.frame_counter_callback = self.schedule_frame_counter
+        self.reset()
+
+    @classmethod
+    def from_file(cls, path, lockstep: bool = False) -> 'Nes':
+        return cls(Cartridge.from_file(path), lockstep)
+
+    def close(self) -> None:
+        """
+        Closes the cartridge, see Cartridge.close()
+        """
+        self.cartridge.close()
+
+    def reset(self) -> None:
+        self.cpu.reset()
+        self.nmi_pending = False
+        self.schedule_ppu_sync()
+        self.schedule_sprite_0_hit()
+        self.schedule_frame_counter()
+
+    # scheduler
+
+    def schedule(self, kind: str, cycle: Optional[int]) -> None:
+        """
+        Moves event `kind` to CPU cycle `cycle`, None cancels it
+        """
+        if cycle is None:
+            self.pending.pop(kind, None)
+            return
+        self.pending[kind] = cycle
+        self.order += 1
+        heapq.heappush(self.events, (cycle, self.order, kind))
+        if cycle < self.cpu.slice_end:
+            self.cpu.slice_end = cycle
+
+    def next_event_cycle(self) -> float:
+        events, pending = self.events, self.pending
+        while events and pending.get(events[0][2]) != events[0][0]:
+            heapq.heappop(events)
+        return events[0][0] if events else float('inf')
+
+    def handle_events(self) -> None:
+        now = self.cpu.total_cycles
+        while self.next_event_cycle() <= now:
+            _, _, kind = heapq.heappop(self.events)
+            del self.pending[kind]
+            self.handlers[kind]()
+
+    # event sources
+
+    def schedule_ppu_sync(self) -> None:
+        ppu = self.ppu
+        self.schedule(PPU_SYNC, (ppu.next_sync_dot() - ppu.dot_offset + 2) // 3)
+
+    def ppu_sync(self) -> None:
+        # PPU has already caught up, NMI or scanline IRQ came with it
+        self.schedule_ppu_sync()
+        # a new frame or vblank writes may have moved the hit
+        self.schedule_sprite_0_hit()
+
+    def schedule_sprite_0_hit(self) -> None:
+        ppu = self.ppu
+        dot = ppu.next_sprite_0_dot()
+        self.schedule(SPRITE_0_HIT, None if dot == float('inf') else (dot - ppu.dot_offset + 2) // 3)
+
+    def sprite_0_hit(self) -> None:
+        self.ppu.update_sprite_0_hit()
+        self.schedule_sprite_0_hit()
+
+    def start_dma(self, page: int, end: int) -> None:
+        self.dma_page = page
+        self.schedule(DMA_END, end)
+
+    def dma_end(self) -> None:
+        self.io.copy_page_to_oam(self.dma_page)
+
+    def schedule_frame_counter(self) -> None:
+        self.schedule(FRAME_COUNTER, self.io.next_frame_irq(self.cpu.total_cycles))
+
+    def frame_counter(self) -> None:
+        self.io.frame_counter_irq()
+        self.schedule_frame_counter()
+
+    # interrupts
+
+    def raise_nmi(self) -> None:
+        self.nmi_pending = True
+        self.cpu.end_slice()
+
+    def irq_line(self) -> bool:
+        mapper = self.cartridge.mapper
+        return self.io.frame_irq or getattr(mapper, 'irq_pending', False)
+
+    def take_interrupts(self) -> None:
+        if self.nmi_pending:
+            self.nmi_pending = False
+            self.cpu.nmi()
+        elif self.irq_line():
+            # masked by the I flag inside Cpu6502.irq()
+            self.cpu.irq()
+
+    # running
+
+    def run_slice(self, end: float) -> None:
+        """
+        Runs the CPU up to the next event (one instruction in lockstep, or
+        while IRQ is asserted), `end` at most, then everything that is due
+        """
+        cpu = self.cpu
+        if self.lockstep or self.irq_line():
+            cpu.step()
+        else:
+            deadline = min(end, self.next_event_cycle())
+            cpu.run_until(max_cycles=max(deadline - cpu.total_cycles, 1))
+        self.sync()
+
+    def sync(self) -> None:
+        """
+        Brings the PPU up to the CPU, handles due events and takes interrupts
+        """
+        self.ppu.catch_up()
+        self.handle_events()
+        self.take_interrupts()
+
+    def step(self) -> int:
+        """
+        Runs one instruction, returns the amount of spent cycles
+        """
+        cycles = self.cpu.step()
+        self.sync()
+        return cycles
+
+    def run_cycles(self, cycles: int) -> int:
+        """
+        Runs whole instructions until at least `cycles` CPU cycles are spent,
+        returns the actual amount
+        """
+        start = self.cpu.total_cycles
+        end = start + cycles
+        while self.cpu.total_cycles < end:
+            self.run_slice(end)
+        return self.cpu.total_cycles - start
+
+    def run_frame(self):
+        """
+        Runs until the PPU completes a frame (vblank starts), returns the frame
+        """
+        self.ppu.frame_complete = False
+        while not self.ppu.frame_complete:
+            self.run_slice(float('inf'))
+        self.cartridge.maybe_flush()
+        return self.ppu.frame
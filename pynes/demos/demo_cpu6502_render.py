@@ -1,12 +1,12 @@
 import pathlib
-from ctypes import c_uint16
 from enum import Enum
-from typing import List, Tuple
+from typing import List, Optional, Tuple
 
 import pygame as pg
 
-from pynes.core.devices import Bus, Cpu6502, Ppu2C02, Ram, Cartridge
+from pynes.core.devices import Cartridge
 from pynes.core.devices.cpu.utils import FLAGS
+from pynes.core.nes import Nes
 
 
 def sample_6502_program() -> List[int]:
@@ -29,19 +29,23 @@ class DemoCpu6502Render:
     DEFAULT_HEIGHT: int = 480
     DEFAULT_FPS:    int = 60
 
-    def __init__(self):
+    def __init__(self, rom_path: Optional[pathlib.Path] = None):
         self.width = DemoCpu6502Render.DEFAULT_WIDTH
         self.height = DemoCpu6502Render.DEFAULT_HEIGHT
         self.fps = DemoCpu6502Render.DEFAULT_FPS
 
-        self.bus = self.get_prepared_bus()
-        self.bus.get_cpu6502().reset()
-        # nestest_rom = pathlib.Path(__file__).parent / '..' / '..' / 'tests' / 'nestest.nes'
-        # raw_rom = []
-        # with open(nestest_rom, 'rb') as nestest_io:
-        #     raw_rom = instructions_list_from_nes_io(nestest_io)
-        # self.bus.get_cpu6502().load_rom(raw_rom)
-        self.bus.get_cpu6502().pc.value = 0x8000
+        # e.g. pathlib.Path(__file__).parent / '..' / '..' / 'tests' / 'nestest.nes'
+        self.rom_path = rom_path
+        cartridge = Cartridge.from_file(rom_path) if rom_path else Cartridge()
+        self.nes = Nes(cartridge)
+        self.bus = self.nes.bus
+        self.reset()
+
+    def reset(self) -> None:
+        self.nes.reset()
+        if not self.rom_path:
+            # blank cartridge has no reset vector, programs are loaded to $8000
+            self.bus.get_cpu6502().pc.value = 0x8000
 
     def setup(self, width: int = DEFAULT_WIDTH, height: int = DEFAULT_HEIGHT, fps: int = DEFAULT_FPS) -> None:
         self.width = width
@@ -92,12 +96,11 @@ class DemoCpu6502Render:
                 running = False
             if event.type == pg.KEYDOWN:
                 if event.key == pg.K_SPACE:
-                    self.bus.get_cpu6502().clock()
-                    while not self.bus.get_cpu6502().complete():
-                        self.bus.get_cpu6502().clock()
+                    self.nes.step()
+                elif event.key == pg.K_f:
+                    self.nes.run_frame()
                 elif event.key == pg.K_r:
-                    self.bus.get_cpu6502().reset()
-                    self.bus.get_cpu6502().pc.value = 0x8000
+                    self.reset()
                 elif event.key == pg.K_i:
                     self.bus.get_cpu6502().irq()
                 elif event.key == pg.K_n:
@@ -112,6 +115,7 @@ class DemoCpu6502Render:
             _lo = _page_num * 0x100
             _hi = (_page_num + 1) * 0x100
             _step = 0x10
+            _page = self.bus.read_block(_lo, _hi - _lo)
             for _i, _addr_row in enumerate(range(_lo, _hi, _step)):
                 line = '$' + hex(_addr_row)[2:].zfill(4) + ': '
                 if self.bus.get_cpu6502().pc.value in range(_addr_row, _addr_row + _step):
@@ -122,8 +126,8 @@ class DemoCpu6502Render:
                 screen.blit(addr_label, (_pos[0], _pos[1] + _i * 15))
 
                 for _j, _addr in enumerate(range(_addr_row, _addr_row + _step)):
-                    cell = self.bus.get_cpu6502().read(c_uint16(_addr))
-                    cell_text = hex(cell.value)[2:].zfill(2) + ' '
+                    cell = _page[_addr - _lo]
+                    cell_text = hex(cell)[2:].zfill(2) + ' '
                     # TODO: now only first uint16 is highlighting with no args -- fix it (when refactor addr modes)
                     color = Colors.BLUE.value if _addr == self.bus.get_cpu6502().pc.value else Colors.WHITE.value
                     cell_label = font.render(cell_text, False, color)
@@ -195,18 +199,8 @@ class DemoCpu6502Render:
         screen.blit(sp_label, (self.width - 280, 85))
 
     def render_info(self, screen: pg.display, font: pg.font.Font) -> None:
-        info_label = font.render("SPACE = Step Instruction    R = RESET    "
+        info_label = font.render("SPACE = Step    F = Frame    R = RESET    "
                                  "I = IRQ    N = NMI", False, Colors.WHITE.value)
         q_label = font.render("Q = Quit", False, Colors.RED.value)
         screen.blit(info_label, (10, 550))
         screen.blit(q_label, (self.width - 75, 550))
-
-    @staticmethod
-    def get_prepared_bus() -> Bus:
-        bus = Bus()
-        Cpu6502().connect_to_bus(bus)
-        Ppu2C02().connect_to_bus(bus)
-        Ram().connect_to_bus(bus)
-        Cartridge().connect_to_bus(bus)
-        bus.get_cartridge().connect_to_bus(bus.get_ppu2C02().internal_bus)
-        return bus
@@ -0,0 +1,198 @@
+"""
+ROM library index: headers and PRG/CHR hashes of .nes files kept in SQLite.
+Files are re-hashed only when their size or mtime changed since the last scan.
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from pynes.core.devices.ines import HEADER_SIZE, parse_header
+from pynes.core.exceptions import InvalidRomException
+
+DEFAULT_DB_PATH: str = os.path.join(os.path.expanduser('~'), '.pynes', 'library.sqlite3')
+ROM_EXTENSIONS = ('.nes',)
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS roms (
+    path TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    prg_crc32 TEXT,
+    prg_sha1 TEXT,
+    chr_crc32 TEXT,
+    chr_sha1 TEXT,
+    rom_crc32 TEXT,
+    rom_sha1 TEXT,
+    mapper INTEGER,
+    submapper INTEGER,
+    mirroring TEXT,
+    battery INTEGER,
+    prg_rom_size INTEGER,
+    chr_rom_size INTEGER,
+    nes2 INTEGER,
+    error TEXT
+);
+CREATE INDEX IF NOT EXISTS roms_rom_crc32 ON roms (rom_crc32);
+CREATE INDEX IF NOT EXISTS roms_rom_sha1 ON roms (rom_sha1);
+CREATE TABLE IF NOT EXISTS overrides (
+    rom_sha1 TEXT PRIMARY KEY,
+    data TEXT NOT NULL
+);
+'''
+
+
+class RomRecord(NamedTuple):
+    path: str
+    size: int
+    mtime_ns: int
+    prg_crc32: Optional[str] = None
+    prg_sha1: Optional[str] = None
+    chr_crc32: Optional[str] = None
+    chr_sha1: Optional[str] = None
+    # hashes of PRG and CHR together, that is the key of ROM databases
+    rom_crc32: Optional[str] = None
+    rom_sha1: Optional[str] = None
+    mapper: Optional[int] = None
+    submapper: Optional[int] = None
+    mirroring: Optional[str] = None
+    battery: Optional[bool] = None
+    prg_rom_size: Optional[int] = None
+    chr_rom_size: Optional[int] = None
+    nes2: Optional[bool] = None
+    error: Optional[str] = None
+
+
+class ScanResult(NamedTuple):
+    hashed: int
+    unchanged: int
+    removed: int
+    failed: int
+
+
+def hash_rom(path: str) -> RomRecord:
+    """
+    Parses header of `path` and hashes its PRG/CHR, runs in worker processes
+    """
+    stat = None
+    try:
+        # the file may be gone or unreadable by now, that is an error of its record
+        stat = os.stat(path)
+        with open(path, 'rb') as rom_io:
+            return hash_image(path, stat, rom_io.read())
+    except (InvalidRomException, OSError) as e:
+        size, mtime_ns = (stat.st_size, stat.st_mtime_ns) if stat is not None else (0, 0)
+        return RomRecord(path, size, mtime_ns, error=str(e) or type(e).__name__)
+
+
+def hash_image(path: str, stat: os.stat_result, image: bytes) -> RomRecord:
+    header = parse_header(image[:HEADER_SIZE])
+    if len(image) < header.file_size:
+        raise InvalidRomException(f'file is {len(image)} bytes, header needs {header.file_size}')
+    # hashed through views, so PRG/CHR are never copied out of the image
+    prg_start = HEADER_SIZE + header.trainer_size
+    rom = memoryview(image)[prg_start:prg_start + header.prg_rom_size + header.chr_rom_size]
+    prg, chr_ = rom[:header.prg_rom_size], rom[header.prg_rom_size:]
+    return RomRecord(
+        path, stat.st_size, stat.st_mtime_ns,
+        prg_crc32=crc32(prg), prg_sha1=hashlib.sha1(prg).hexdigest(),
+        chr_crc32=crc32(chr_), chr_sha1=hashlib.sha1(chr_).hexdigest(),
+        rom_crc32=crc32(rom), rom_sha1=hashlib.sha1(rom).hexdigest(),
+        mapper=header.mapper, submapper=header.submapper, mirroring=header.mirroring.value,
+        battery=header.battery, prg_rom_size=header.prg_rom_size, chr_rom_size=header.chr_rom_size,
+        nes2=header.nes2,
+    )
+
+
+def crc32(data) -> str:
+    return '{:08x}'.format(zlib.crc32(data))
+
+
+def find_roms(directory: str) -> Iterable[str]:
+    for root, _, files in os.walk(directory):
+        for name in files:
+            if name.lower().endswith(ROM_EXTENSIONS):
+                yield os.path.abspath(os.path.join(root, name))
+
+
+class RomLibrary:
+
+    def __init__(self, db_path: str = DEFAULT_DB_PATH):
+        if db_path != ':memory:':
+            os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        self.connection = sqlite3.connect(db_path)
+        self.connection.executescript(SCHEMA)
+
+    def close(self) -> None:
+        self.connection.close()
+
+    def scan(self, directory: str, jobs: Optional[int] = None) -> ScanResult:
+        """
+        Indexes .nes files under `directory` with `jobs` worker processes (all
+        cores by default, 1 hashes in this process), drops vanished ones
+        """
+        known: Dict[str, Tuple[int, int]] = {
+            path: (size, mtime_ns)
+            for path, size, mtime_ns in self.connection.execute('SELECT path, size, mtime_ns FROM roms')
+        }
+        found, stale = set(), []
+        for path in find_roms(directory):
+            found.add(path)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                # gone or unreadable since the walk, hash_rom() records the error
+                stale.append(path)
+                continue
+            if known.get(path) != (stat.st_size, stat.st_mtime_ns):
+                stale.append(path)
+
+        if jobs == 1 or len(stale) < 2:
+            records = [hash_rom(path) for path in stale]
+        else:
+            with ProcessPoolExecutor(max_workers=jobs) as pool:
+                records = list(pool.map(hash_rom, stale, chunksize=max(1, len(stale) // 64)))
+
+        root = os.path.join(os.path.abspath(directory), '')
+        removed = [(path,) for path in known if path.startswith(root) and path not in found]
+        with self.connection:
+            self.connection.executemany(
+                'INSERT OR REPLACE INTO roms ({c}) VALUES ({p})'.format(
+                    c=', '.join(RomRecord._fields), p=', '.join('?' * len(RomRecord._fields))),
+                records,
+            )
+            self.connection.executemany('DELETE FROM roms WHERE path = ?', removed)
+        return ScanResult(
+            hashed=len(records),
+            unchanged=len(found) - len(stale),
+            removed=len(removed),
+            failed=sum(1 for record in records if record.error),
+        )
+
+    def records(self, where: str = '', *args) -> List[RomRecord]:
+        query = 'SELECT {c} FROM roms {w} ORDER BY path'.format(c=', '.join(RomRecord._fields), w=where)
+        records = [RomRecord(*row) for row in self.connection.execute(query, args)]
+        # sqlite gives flags back as ints
+        return [r._replace(battery=bool(r.battery), nes2=bool(r.nes2)) if r.error is None else r for r in records]
+
+    def lookup(self, key: str) -> List[RomRecord]:
+        """
+        Records by path, CRC32 or SHA-1 of the whole ROM
+        """
+        path = os.path.abspath(key)
+        return self.records('WHERE path = ? OR rom_crc32 = ? OR rom_sha1 = ?', path, key.lower(), key.lower())
+
+    def set_override(self, rom_sha1: str, **data) -> None:
+        """
+        Stores per-game data (e.g. mapper or mirroring fix-ups) keyed by ROM SHA-1
+        """
+        with self.connection:
+            self.connection.execute('INSERT OR REPLACE INTO overrides (rom_sha1, data) VALUES (?, ?)',
+                                    (rom_sha1, json.dumps(data, sort_keys=True)))
+
+    def override(self, rom_sha1: str) -> dict:
+        row = self.connection.execute('SELECT data FROM overrides WHERE rom_sha1 = ?', (rom_sha1,)).fetchone()
+        return json.loads(row[0]) if row else {}
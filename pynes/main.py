@@ -1,13 +1,17 @@
+import pathlib
 import sys
 
 from pynes.demos.demo_cpu6502_render import DemoCpu6502Render
 
 
 def main():
-    my_demo = DemoCpu6502Render()
+    # optional argument: path to .nes file, e.g. tests/nestest.nes
+    rom_path = pathlib.Path(sys.argv[1]) if len(sys.argv) > 1 else None
+    my_demo = DemoCpu6502Render(rom_path)
     my_demo.setup(width=800, height=600)
-    # my_demo.load_rom(start=0x4020)
-    my_demo.load_rom()
+    if not rom_path:
+        # my_demo.load_rom(start=0x4020)
+        my_demo.load_rom()
     my_demo.run()
 
 
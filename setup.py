@@ -12,4 +12,7 @@ setup(
     author_email="<rmksrv@outlook.com>",
     description=DESCRIPTION,
     packages=find_packages(),
+    entry_points={
+        'console_scripts': ['pynes=pynes.cli:main'],
+    },
 )
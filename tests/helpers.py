@@ -0,0 +1,25 @@
+"""
+Builders shared by test modules
+"""
+from typing import Tuple
+
+from pynes.core.devices import Bus, Ppu2C02, Cartridge
+
+
+def ines_image(mapper: int, prg_banks: int, chr_banks: int) -> bytes:
+    """
+    Every 8 KB of PRG is filled with its number, every 1 KB of CHR with its number
+    """
+    header = b'NES\x1a' + bytes([prg_banks, chr_banks, (mapper & 0x0f) << 4, mapper & 0xf0]) + bytes(8)
+    prg = b''.join(bytes([bank]) * 0x2000 for bank in range(prg_banks * 2))
+    chr_ = b''.join(bytes([bank]) * 0x0400 for bank in range(chr_banks * 8))
+    return header + prg + chr_
+
+
+def connected(mapper: int, prg_banks: int, chr_banks: int) -> Tuple[Bus, Bus, Cartridge]:
+    bus = Bus()
+    cartridge = Cartridge.from_bytes(ines_image(mapper, prg_banks, chr_banks))
+    cartridge.connect_to_bus(bus)
+    ppu = Ppu2C02()
+    cartridge.connect_to_ppu(ppu)
+    return bus, ppu.internal_bus, cartridge
@@ -0,0 +1,67 @@
+import pytest
+
+from pynes.core.devices import Bus, Cpu6502, Ram, Cartridge
+from pynes.core.exceptions import NoSuchDeviceException
+
+
+@pytest.fixture()
+def bus():
+    bus = Bus()
+    Cpu6502().connect_to_bus(bus)
+    Ram().connect_to_bus(bus)
+    Cartridge().connect_to_bus(bus)
+    yield bus
+
+
+# TESTS
+def test_page_table_routes_to_devices(bus: Bus):
+    bus.write(0x0010, 0x42)
+    bus.write(0x8000, 0x24)
+    assert bus.read(0x0010) == 0x42
+    assert bus.read(0x8000) == 0x24
+    assert bus.address_owner(0x0010) is bus.get_ram()
+    assert bus.address_owner(0x8000) is bus.get_cartridge()
+
+
+def test_split_page_is_decoded_per_byte(bus: Bus):
+    # $4000-$401f is unmapped while $4020-$40ff belongs to the cartridge
+    bus.write(0x4020, 0x11)
+    assert bus.read(0x4020) == 0x11
+    assert bus.address_owner(0x40ff) is bus.get_cartridge()
+    with pytest.raises(NoSuchDeviceException):
+        bus.read(0x401f)
+
+
+def test_unmapped_address_raises(bus: Bus):
+    with pytest.raises(NoSuchDeviceException):
+        bus.read(0x2000)
+    with pytest.raises(NoSuchDeviceException):
+        bus.address_owner(0x2000)
+
+
+def test_cpu_keeps_page_tables_across_remap(bus: Bus):
+    cpu = bus.get_cpu6502()
+    readers = cpu.readers
+    bus.remap()
+    assert cpu.readers is readers is bus.readers
+
+
+def test_block_within_device_is_a_view(bus: Bus):
+    bus.write_block(0x8000, bytes(range(16)))
+    block = bus.read_block(0x8000, 16)
+    assert isinstance(block, memoryview)
+    assert bytes(block) == bytes(range(16))
+    assert bus.read(0x800f) == 0x0f
+
+
+def test_block_is_split_at_device_boundaries(bus: Bus):
+    # last bytes of the second ram mirror and first bytes of the third one
+    bus.write_block(0x0ffe, b'\x01\x02\x03\x04')
+    assert bus.read(0x07fe) == 0x01
+    assert bus.read(0x0001) == 0x04
+    assert bytes(bus.read_block(0x17fe, 4)) == b'\x01\x02\x03\x04'
+
+
+def test_block_over_unmapped_address_raises(bus: Bus):
+    with pytest.raises(NoSuchDeviceException):
+        bus.read_block(0x1ff0, 0x20)
@@ -0,0 +1,152 @@
+import mmap
+import pathlib
+
+import pytest
+
+from pynes.core.devices import Bus, Cpu6502, Ram, Cartridge
+from pynes.core.devices.ines import parse_header
+from pynes.core.devices.ppu.nametable import Mirroring
+from pynes.core.exceptions import InvalidRomException
+
+NESTEST_ROM = pathlib.Path(__file__).parent / 'nestest.nes'
+
+
+def ines_image(flags6: int = 0x00, flags7: int = 0x00, tail: bytes = bytes(8), prg_banks: int = 1) -> bytes:
+    header = b'NES\x1a' + bytes([prg_banks, 1, flags6, flags7]) + tail
+    return header + bytes(range(0x100)) * (prg_banks * 0x40) + b'\xcc' * 0x2000
+
+
+@pytest.fixture()
+def nestest():
+    yield Cartridge.from_file(NESTEST_ROM)
+
+
+# TESTS
+def test_nestest_header(nestest: Cartridge):
+    header = nestest.header
+    assert (header.mapper, header.prg_rom_size, header.chr_rom_size) == (0, 0x4000, 0x2000)
+    assert header.mirroring is Mirroring.HORIZONTAL
+    assert not header.nes2 and not header.trainer
+
+
+def test_rom_is_sliced_without_copy(nestest: Cartridge):
+    assert isinstance(nestest.image, mmap.mmap)
+    assert nestest.prg_rom.obj is nestest.image
+    assert nestest.chr_rom.obj is nestest.image
+    assert len(nestest.chr_rom) == 0x2000
+
+
+def test_nes2_header():
+    header = parse_header(b'NES\x1a' + bytes([0x02, 0x00, 0x13, 0x48, 0x21, 0x00, 0x70, 0x07]) + bytes(4))
+    assert header.nes2
+    assert (header.mapper, header.submapper) == (0x141, 2)
+    assert header.prg_rom_size == 0x8000
+    assert header.prg_nvram_size == 0x2000 and header.chr_ram_size == 0x2000
+    assert header.mirroring is Mirroring.VERTICAL and header.battery
+
+
+def test_diskdude_garbage_ignores_flags7():
+    header = parse_header(b'NES\x1a' + bytes([0x01, 0x01, 0x10, 0x44]) + b'DiskDude')
+    assert header.mapper == 1
+
+
+def test_truncated_file_raises():
+    with pytest.raises(InvalidRomException):
+        Cartridge.from_bytes(ines_image()[:-1])
+    with pytest.raises(InvalidRomException):
+        Cartridge.from_bytes(b'NES')
+
+
+def test_16k_prg_is_mirrored():
+    bus = Bus()
+    cartridge = Cartridge.from_bytes(ines_image())
+    cartridge.connect_to_bus(bus)
+    assert bus.read(0x8010) == bus.read(0xc010) == 0x10
+    assert bytes(bus.read_block(0xfff0, 0x10)) == bytes(range(0xf0, 0x100))
+    bus.write(0x8010, 0xff)
+    assert bus.read(0x8010) == 0x10
+
+
+def test_trainer_is_loaded_to_7000():
+    image = ines_image(flags6=0x04)
+    image = image[:16] + b'\x5a' * 0x200 + image[16:]
+    cartridge = Cartridge.from_bytes(image)
+    assert cartridge.read(0x7000) == 0x5a
+    assert cartridge.read(0x8001) == 0x01
+
+
+def test_nestest_boots_from_file(nestest: Cartridge):
+    bus = Bus()
+    Cpu6502().connect_to_bus(bus)
+    Ram().connect_to_bus(bus)
+    nestest.connect_to_bus(bus)
+    cpu = bus.get_cpu6502()
+    cpu.reset()
+    assert cpu.pc.value == 0xc004
+    cpu.pc.value = 0xc000
+    cpu.run_until(pc=0xc6bd)
+    assert cpu.read(0x0002) == 0x00
+
+
+def test_prg_ram_is_mapped():
+    bus = Bus()
+    cartridge = Cartridge.from_bytes(ines_image())
+    cartridge.connect_to_bus(bus)
+    bus.write(0x6000, 0x11)
+    bus.write_block(0x7ffe, b'\x22\x33\x44')
+    assert cartridge.prg_ram[0] == 0x11
+    assert bytes(bus.read_block(0x7ffe, 2)) == b'\x22\x33'
+    assert bus.read(0x8000) == 0x00
+
+
+def test_battery_ram_persists_in_save_file(tmp_path):
+    rom = tmp_path / 'game.nes'
+    rom.write_bytes(ines_image(flags6=0x02))
+    bus = Bus()
+    cartridge = Cartridge.from_file(rom)
+    cartridge.connect_to_bus(bus)
+    bus.write(0x6123, 0xab)
+    cartridge.flush()
+    save = tmp_path / 'game.sav'
+    assert save.read_bytes()[0x123] == 0xab
+    assert len(save.read_bytes()) == 0x2000
+    assert Cartridge.from_file(rom).read(0x6123) == 0xab
+
+
+def test_close_writes_save_file_and_unmaps_rom(tmp_path):
+    rom = tmp_path / 'game.nes'
+    rom.write_bytes(ines_image(flags6=0x02))
+    bus = Bus()
+    with Cartridge.from_file(rom) as cartridge:
+        cartridge.connect_to_bus(bus)
+        bus.write(0x6123, 0xab)
+        bus.write(0x6124, 0xcd)
+    assert cartridge.save_ram.mapping.closed
+    assert isinstance(cartridge.image, mmap.mmap) and cartridge.image.closed
+    assert (tmp_path / 'game.sav').read_bytes()[0x123:0x125] == b'\xab\xcd'
+    # closing twice is harmless
+    cartridge.close()
+
+
+def test_close_with_views_left(tmp_path):
+    rom = tmp_path / 'game.nes'
+    rom.write_bytes(ines_image(flags6=0x02))
+    bus = Bus()
+    cartridge = Cartridge.from_file(rom)
+    cartridge.connect_to_bus(bus)
+    bus.write(0x6123, 0xab)
+    save_view = bus.read_block(0x6100, 0x40)
+    rom_view = bus.read_block(0x8000, 0x10)
+    cartridge.close()
+    # written back although both files stay mapped while the views live
+    assert (tmp_path / 'game.sav').read_bytes()[0x123] == 0xab
+    assert save_view[0x23] == 0xab and rom_view[1] == 0x01
+    del save_view, rom_view
+    cartridge.close()
+    assert cartridge.save_ram.mapping.closed and cartridge.image.closed
+
+
+def test_save_ram_flushes_after_interval(tmp_path):
+    save_ram = Cartridge.from_bytes(ines_image(flags6=0x02), tmp_path / 'game.sav').save_ram
+    assert not save_ram.maybe_flush(save_ram.last_flush)
+    assert save_ram.maybe_flush(save_ram.last_flush + save_ram.flush_interval)
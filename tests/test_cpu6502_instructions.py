@@ -1,16 +1,53 @@
+import pathlib
+from typing import Tuple
+
 import pytest
 
 from pynes.core.devices import Bus, Cpu6502, Ram, Ppu2C02, Cartridge
+from pynes.core.devices.cpu.blocks import TRANSLATE_THRESHOLD
+from pynes.core.devices.cpu.handlers import FUSED_RAM_HANDLERS, HANDLERS, RAM_HANDLERS, REFERENCE_HANDLERS
 
+NESTEST_ROM = pathlib.Path(__file__).parent / 'nestest.nes'
+# nestest in automation mode: official opcodes are done at $c6bd
+NESTEST_OFFICIAL_INSTRUCTIONS = 5003
 
-@pytest.fixture()
-def bus():
+
+def prepared_bus() -> Bus:
     bus = Bus()
     Cpu6502().connect_to_bus(bus)
     Ppu2C02().connect_to_bus(bus)
     Ram().connect_to_bus(bus)
     Cartridge().connect_to_bus(bus)
-    yield bus
+    return bus
+
+
+def nestest_cpu() -> Cpu6502:
+    cpu = prepared_bus().get_cpu6502()
+    prg = list(NESTEST_ROM.read_bytes()[16:16 + 0x4000])
+    cpu.load_rom(prg, 0x8000)
+    cpu.load_rom(prg, 0xc000)
+    cpu.reset()
+    cpu.pc.value = 0xc000
+    cpu.cycles.value = 0
+    return cpu
+
+
+def step(cpu: Cpu6502) -> int:
+    cpu.clock()
+    cycles = 1
+    while not cpu.complete():
+        cpu.clock()
+        cycles += 1
+    return cycles
+
+
+def cpu_state(cpu: Cpu6502) -> Tuple[int, ...]:
+    return cpu.pc.value, cpu.a.value, cpu.x.value, cpu.y.value, cpu.sp.value, cpu.status.value
+
+
+@pytest.fixture()
+def bus():
+    yield prepared_bus()
 
 
 @pytest.fixture()
@@ -21,3 +58,155 @@ def cpu(bus: Bus):
 # TESTS
 def test_instructions(cpu: Cpu6502):
     pass
+
+
+def test_register_compat_view(cpu: Cpu6502):
+    cpu.a.value = 0x1ff
+    cpu.pc.value = 0x1ffff
+    assert cpu.a.value == 0xff
+    assert cpu.pc.value == 0xffff
+
+
+def test_nestest_official_opcodes():
+    cpu = nestest_cpu()
+    for _ in range(NESTEST_OFFICIAL_INSTRUCTIONS):
+        step(cpu)
+    assert cpu.pc.value == 0xc6bd
+    assert cpu.read(0x0002) == 0x00
+
+
+@pytest.mark.parametrize('handlers', [HANDLERS, RAM_HANDLERS])
+def test_fused_handlers_match_reference(handlers):
+    fused = nestest_cpu()
+    fused.handlers = handlers
+    reference = nestest_cpu()
+    reference.handlers = REFERENCE_HANDLERS
+    for _ in range(NESTEST_OFFICIAL_INSTRUCTIONS):
+        assert step(fused) == step(reference)
+        assert cpu_state(fused) == cpu_state(reference)
+
+
+def test_direct_ram_handlers_follow_ram_mapping():
+    bus = Bus()
+    cpu = Cpu6502()
+    cpu.connect_to_bus(bus)
+    assert cpu.handlers is HANDLERS and cpu.ram is None
+    ram = Ram()
+    ram.connect_to_bus(bus)
+    assert cpu.handlers is RAM_HANDLERS and cpu.ram is ram.data
+
+
+def test_step_matches_clock():
+    stepped = nestest_cpu()
+    clocked = nestest_cpu()
+    for _ in range(500):
+        assert stepped.step() == step(clocked)
+        assert cpu_state(stepped) == cpu_state(clocked)
+    assert stepped.total_cycles == clocked.total_cycles
+
+
+def test_run_until_pc():
+    cpu = nestest_cpu()
+    # nestest log starts at cycle 7 and reaches $c6bd at cycle 14579
+    assert cpu.run_until(pc=0xc6bd) == 14579 - 7
+    assert cpu.read(0x0002) == 0x00
+
+
+def test_run_cycles_budget():
+    cpu = nestest_cpu()
+    spent = cpu.run_cycles(1000)
+    assert 1000 <= spent < 1000 + 8
+    assert cpu.total_cycles == spent
+
+
+@pytest.mark.parametrize('program, branch_pc, idle', [
+    # loop: LDA $10; BEQ loop
+    ([0xa5, 0x10, 0xf0, 0xfc], 0x8002, True),
+    # loop: JMP loop
+    ([0x4c, 0x00, 0x80], 0x8000, True),
+    # loop: DEX; BNE loop; idle: JMP idle
+    ([0xca, 0xd0, 0xfd, 0x4c, 0x03, 0x80], 0x8001, False),
+])
+def test_idle_loop_skipping_keeps_timing(program, branch_pc: int, idle: bool):
+    cpus = []
+    for skip in (False, True):
+        cpu = prepared_bus().get_cpu6502()
+        cpu.load_rom(program, 0x8000)
+        cpu.pc.value = 0x8000
+        cpu.skip_idle_loops = skip
+        cpu.run_cycles(10000)
+        cpus.append(cpu)
+    assert cpus[0].total_cycles == cpus[1].total_cycles
+    assert cpu_state(cpus[0]) == cpu_state(cpus[1])
+    assert (cpus[1].idle_loops[branch_pc] is not None) == idle
+
+
+def test_translated_blocks_match_interpreter():
+    cpus = []
+    for translate in (False, True):
+        cpu = nestest_cpu()
+        cpu.translate_blocks = translate
+        for _ in range(100):
+            cpu.run_cycles(150)
+        cpus.append(cpu)
+    assert cpus[0].total_cycles == cpus[1].total_cycles
+    assert cpu_state(cpus[0]) == cpu_state(cpus[1])
+    assert cpus[0].bus.get_ram().snapshot() == cpus[1].bus.get_ram().snapshot()
+    assert cpus[1].blocks
+
+
+@pytest.mark.parametrize('program', [
+    # nestest
+    None,
+    # loop: LDX #$05; loop2: DEX; BNE loop2; LDA $10; STA $11; INX; CPX #$03; JMP loop
+    [0xa2, 0x05, 0xca, 0xd0, 0xfd, 0xa5, 0x10, 0x85, 0x11, 0xe8, 0xe0, 0x03, 0x4c, 0x00, 0x80],
+])
+def test_fused_pairs_match_interpreter(program):
+    cpus = []
+    for fuse in (False, True):
+        if program is None:
+            cpu = nestest_cpu()
+        else:
+            cpu = prepared_bus().get_cpu6502()
+            cpu.load_rom(program, 0x8000)
+            cpu.pc.value = 0x8000
+        cpu.fuse_instructions = fuse
+        # odd slices end in between pairs too
+        for _ in range(100):
+            cpu.run_cycles(151)
+        cpus.append(cpu)
+    assert cpus[1].handlers is FUSED_RAM_HANDLERS
+    assert cpus[0].total_cycles == cpus[1].total_cycles
+    assert cpu_state(cpus[0]) == cpu_state(cpus[1])
+    assert cpus[0].bus.get_ram().snapshot() == cpus[1].bus.get_ram().snapshot()
+
+
+def test_step_does_not_fuse_instructions():
+    cpu = prepared_bus().get_cpu6502()
+    cpu.fuse_instructions = True
+    # loop: DEX; BNE loop
+    cpu.load_rom([0xca, 0xd0, 0xfd], 0x8000)
+    cpu.pc.value = 0x8000
+    assert cpu.step() == 2
+    assert cpu.pc.value == 0x8001
+    assert cpu.run_until(pc=0x8000) == 3
+    cpu.fuse_instructions = False
+    assert cpu.handlers is RAM_HANDLERS
+
+
+def test_store_into_translated_code_drops_its_blocks():
+    # $0300: loop: LDA #$00; CLC; ADC #$01; STA $0301; STA $10; JMP loop
+    # every pass stores the next value into the LDA operand
+    program = [0xa9, 0x00, 0x18, 0x69, 0x01, 0x8d, 0x01, 0x03, 0x85, 0x10, 0x4c, 0x00, 0x03]
+    cpus = []
+    for translate in (False, True):
+        cpu = prepared_bus().get_cpu6502()
+        cpu.translate_blocks = translate
+        cpu.load_rom(program, 0x0300)
+        cpu.pc.value = 0x0300
+        cpu.run_cycles(1000)
+        cpus.append(cpu)
+    assert cpus[0].total_cycles == cpus[1].total_cycles
+    assert cpu_state(cpus[0]) == cpu_state(cpus[1])
+    assert cpus[0].bus.get_ram().snapshot() == cpus[1].bus.get_ram().snapshot()
+    assert cpus[1].read(0x0301) > TRANSLATE_THRESHOLD
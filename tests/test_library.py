@@ -0,0 +1,80 @@
+import os
+import pathlib
+import shutil
+
+import pytest
+
+from pynes.cli import main
+from pynes.library import RomLibrary, hash_rom
+
+NESTEST_ROM = pathlib.Path(__file__).parent / 'nestest.nes'
+
+
+@pytest.fixture()
+def roms(tmp_path: pathlib.Path):
+    directory = tmp_path / 'roms'
+    (directory / 'sub').mkdir(parents=True)
+    shutil.copy(NESTEST_ROM, directory / 'nestest.nes')
+    shutil.copy(NESTEST_ROM, directory / 'sub' / 'copy.nes')
+    (directory / 'broken.nes').write_bytes(b'not a rom')
+    (directory / 'readme.txt').write_text('skipped')
+    yield directory
+
+
+@pytest.fixture()
+def library(tmp_path: pathlib.Path):
+    library = RomLibrary(str(tmp_path / 'library.sqlite3'))
+    yield library
+    library.close()
+
+
+# TESTS
+@pytest.mark.parametrize('jobs', [1, 2])
+def test_scan_indexes_headers_and_hashes(roms, library: RomLibrary, jobs):
+    result = library.scan(str(roms), jobs=jobs)
+    assert (result.hashed, result.failed) == (3, 1)
+    record = library.lookup(str(roms / 'nestest.nes'))[0]
+    assert (record.mapper, record.mirroring, record.battery) == (0, 'horizontal', False)
+    assert record.prg_rom_size == 0x4000
+    assert len(library.lookup(record.rom_crc32)) == 2
+    assert library.lookup(str(roms / 'broken.nes'))[0].error
+
+
+def test_hash_rom_of_vanished_file(tmp_path: pathlib.Path):
+    record = hash_rom(str(tmp_path / 'gone.nes'))
+    assert record.error
+    assert (record.size, record.mtime_ns, record.rom_sha1) == (0, 0, None)
+
+
+def test_scan_records_vanished_file(roms, library: RomLibrary):
+    # listed by the walk, but stat fails as if removed right after
+    os.symlink(roms / 'gone.nes', roms / 'dangling.nes')
+    result = library.scan(str(roms), jobs=1)
+    assert (result.hashed, result.failed) == (4, 2)
+    assert library.lookup(str(roms / 'dangling.nes'))[0].error
+    assert library.lookup(str(roms / 'nestest.nes'))[0].rom_sha1
+
+
+def test_rescan_hashes_only_changed_files(roms, library: RomLibrary):
+    library.scan(str(roms), jobs=1)
+    assert library.scan(str(roms), jobs=1).hashed == 0
+    with open(roms / 'sub' / 'copy.nes', 'ab') as rom_io:
+        rom_io.write(b'\x00')
+    os.remove(roms / 'broken.nes')
+    result = library.scan(str(roms), jobs=1)
+    assert (result.hashed, result.unchanged, result.removed) == (1, 1, 1)
+
+
+def test_overrides(library: RomLibrary):
+    library.set_override('abc', mirroring='vertical')
+    assert library.override('abc') == {'mirroring': 'vertical'}
+    assert library.override('def') == {}
+
+
+def test_cli_index_and_info(roms, tmp_path, capsys):
+    db = str(tmp_path / 'cli.sqlite3')
+    assert main(['index', str(roms), '--db', db, '-j', '1']) == 0
+    assert 'hashed 3' in capsys.readouterr().out
+    assert main(['info', str(roms / 'nestest.nes'), '--db', db]) == 0
+    assert 'mapper 0.0, horizontal mirroring' in capsys.readouterr().out
+    assert main(['info', 'ffffffff', '--db', db]) == 1
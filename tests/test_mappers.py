@@ -0,0 +1,103 @@
+import pytest
+
+from pynes.core.devices import Bus
+from pynes.core.devices.mappers import Cnrom, Mmc1, Mmc3, Nrom, Uxrom
+from pynes.core.devices.ppu.nametable import Mirroring
+from tests.helpers import connected
+
+
+def mmc1_write(bus: Bus, addr: int, value: int) -> None:
+    for bit in range(5):
+        bus.write(addr, (value >> bit) & 0x01)
+
+
+# TESTS
+@pytest.mark.parametrize('number, mapper', [(0, Nrom), (1, Mmc1), (2, Uxrom), (3, Cnrom), (4, Mmc3)])
+def test_mapper_by_header(number, mapper):
+    _, _, cartridge = connected(number, 2, 1)
+    assert type(cartridge.mapper) is mapper
+
+
+def test_uxrom_switches_low_window():
+    bus, _, _ = connected(2, 8, 0)
+    bus.write(0x8000, 0x03)
+    assert bus.read(0x8000) == 6 and bus.read(0xbfff) == 7
+    assert bus.read(0xc000) == 14
+
+
+def test_switch_repoints_only_window_pages():
+    bus, _, _ = connected(2, 8, 0)
+    readers = bus.readers
+    before = list(readers)
+    bus.write(0x8000, 0x01)
+    assert bus.readers is readers
+    changed = [page for page in range(0x100) if readers[page] is not before[page]]
+    assert changed == list(range(0x80, 0xc0))
+
+
+def test_switch_keeps_watchpoints():
+    bus, _, _ = connected(2, 8, 0)
+    hits = []
+    bus.add_watchpoint(0x8000, 0x8000, 'read', lambda *hit: hits.append(hit))
+    bus.write(0x8000, 0x02)
+    assert bus.read(0x8000) == 4
+    assert hits == [(0x8000, 4, None)]
+
+
+def test_cnrom_switches_chr():
+    bus, ppu_bus, _ = connected(3, 2, 4)
+    assert ppu_bus.read(0x0000) == 0
+    bus.write(0x8000, 0x02)
+    assert ppu_bus.read(0x0000) == 16 and ppu_bus.read(0x1fff) == 23
+    assert bytes(ppu_bus.read_block(0x0400, 4)) == bytes([17] * 4)
+
+
+def test_chr_ram_is_writable():
+    _, ppu_bus, _ = connected(2, 2, 0)
+    ppu_bus.write(0x1234, 0x99)
+    assert ppu_bus.read(0x1234) == 0x99
+
+
+def test_mmc1_serial_registers():
+    bus, ppu_bus, cartridge = connected(1, 8, 2)
+    mmc1_write(bus, 0xe000, 0x02)
+    assert bus.read(0x8000) == 4 and bus.read(0xc000) == 14
+    # 4 KB CHR mode, vertical mirroring
+    mmc1_write(bus, 0x8000, 0x12)
+    mmc1_write(bus, 0xc000, 0x03)
+    assert ppu_bus.read(0x1000) == 12
+    assert cartridge.mirroring is Mirroring.VERTICAL
+    ppu_bus.write(0x2401, 0x77)
+    assert ppu_bus.read(0x2c01) == 0x77 and ppu_bus.read(0x2001) == 0x00
+    # reset bit brings back fixed last bank
+    bus.write(0x8000, 0x80)
+    assert bus.read(0xc000) == 14
+
+
+def test_mmc3_banks_and_modes():
+    bus, ppu_bus, _ = connected(4, 8, 8)
+    bus.write(0x8000, 0x06)
+    bus.write(0x8001, 0x05)
+    assert bus.read(0x8000) == 5 and bus.read(0xc000) == 14 and bus.read(0xe000) == 15
+    bus.write(0x8000, 0x46)
+    assert bus.read(0x8000) == 14 and bus.read(0xc000) == 5
+    bus.write(0x8000, 0x02)
+    bus.write(0x8001, 0x21)
+    assert ppu_bus.read(0x1000) == 0x21
+    bus.write(0x8000, 0x82)
+    assert ppu_bus.read(0x0000) == 0x21
+
+
+def test_mmc3_scanline_irq():
+    bus, _, cartridge = connected(4, 2, 1)
+    mapper = cartridge.mapper
+    bus.write(0xc000, 0x02)
+    bus.write(0xc001, 0x00)
+    bus.write(0xe001, 0x00)
+    mapper.scanline()
+    mapper.scanline()
+    assert not mapper.irq_pending
+    mapper.scanline()
+    assert mapper.irq_pending
+    bus.write(0xe000, 0x00)
+    assert not mapper.irq_pending
@@ -0,0 +1,65 @@
+from pynes.core.devices import Bus, Ram, Cartridge
+from pynes.core.devices.ppu.nametable import Mirroring, PpuNametable
+
+
+# TESTS
+def test_storage_is_contiguous_buffer():
+    cartridge = Cartridge()
+    assert isinstance(cartridge.data, bytearray)
+    assert len(cartridge.memory) == cartridge.size_memory
+
+
+def test_read_returns_int_not_cell():
+    ram = Ram()
+    ram.write(0x0010, 0x42)
+    value = ram.read(0x0010)
+    ram.write(0x0010, 0x43)
+    assert value == 0x42
+    assert ram.read(0x0010) == 0x43
+
+
+def test_snapshot_restore():
+    ram = Ram()
+    ram.write(0x0001, 0x99)
+    snapshot = ram.snapshot()
+    ram.write(0x0001, 0x00)
+    ram.restore(snapshot)
+    assert ram.read(0x0001) == 0x99
+
+
+def test_ram_is_mirrored_2k():
+    bus = Bus()
+    ram = Ram()
+    ram.connect_to_bus(bus)
+    assert len(ram.data) == 0x0800
+    bus.write(0x1803, 0x5a)
+    assert bus.read(0x0003) == bus.read(0x0803) == bus.read(0x1003) == 0x5a
+    assert ram.read(0x0803) == 0x5a
+
+
+def test_nametables_share_2k():
+    bus = Bus()
+    nametable = PpuNametable(Mirroring.VERTICAL)
+    nametable.connect_to_bus(bus)
+    assert len(nametable.snapshot()) == 0x0800
+    bus.write(0x2001, 0x11)
+    bus.write(0x2402, 0x22)
+    assert bus.read(0x2801) == 0x11 and bus.read(0x2c02) == 0x22
+    assert bus.read(0x2401) == 0x00
+
+
+def test_mirroring_switch_repoints_pages():
+    bus = Bus()
+    nametable = PpuNametable(Mirroring.VERTICAL)
+    nametable.connect_to_bus(bus)
+    bus.write(0x2001, 0x11)
+    bus.write(0x2401, 0x22)
+    nametable.set_mirroring(Mirroring.HORIZONTAL)
+    assert bus.read(0x2401) == 0x11 and bus.read(0x2801) == 0x22
+    assert bytes(bus.read_block(0x23ff, 3)) == bytes([0x00, 0x00, 0x11])
+    nametable.set_mirroring(Mirroring.SINGLE_HI)
+    assert bus.read(0x2001) == bus.read(0x2c01) == 0x22
+    nametable.set_mirroring(Mirroring.FOUR_SCREEN)
+    bus.write(0x2c01, 0x44)
+    assert bus.read(0x2001) == 0x11 and bus.read(0x2c01) == 0x44
+    assert len(nametable.snapshot()) == 0x1000
@@ -0,0 +1,165 @@
+import pathlib
+
+import pytest
+
+from pynes.core.devices import Cartridge
+from pynes.core.devices.io_registers import FRAME_COUNTER_PERIOD, FRAME_IRQ_CYCLE
+from pynes.core.nes import Nes
+
+NESTEST_ROM = pathlib.Path(__file__).parent / 'nestest.nes'
+
+# LDA #$02; STA $4014; idle: JMP idle
+DMA_PROGRAM = bytes([0xa9, 0x02, 0x8d, 0x14, 0x40, 0x4c, 0x05, 0x80])
+# LDA #$xx; STA $4017; CLI; idle: JMP idle
+FRAME_IRQ_PROGRAM = bytes([0xa9, 0x00, 0x8d, 0x17, 0x40, 0x58, 0x4c, 0x06, 0x80])
+# IRQ handler: LDA $4015 (acknowledges); INC $00; RTI
+FRAME_IRQ_HANDLER = bytes([0xad, 0x15, 0x40, 0xe6, 0x00, 0x40])
+# SEI; LDA #$80; STA $2000; wait: LDA $00; BEQ wait; LDA #$00; STA $00; INC $01; BIT $2002; JMP wait
+NMI_WAIT_PROGRAM = bytes([0x78, 0xa9, 0x80, 0x8d, 0x00, 0x20, 0xa5, 0x00, 0xf0, 0xfc, 0xa9, 0x00, 0x85, 0x00,
+                          0xe6, 0x01, 0x2c, 0x02, 0x20, 0x4c, 0x06, 0x80])
+# NMI handler: INC $00; RTI
+NMI_WAIT_HANDLER = bytes([0xe6, 0x00, 0x40])
+# waits for vblank, enables NMI in the middle of it, then counts in X forever:
+#   loop: BIT $2002; BPL loop; LDA #$80; STA $2000; idle: INX; JMP idle
+VBLANK_PROGRAM = bytes([0x2c, 0x02, 0x20, 0x10, 0xfb, 0xa9, 0x80, 0x8d, 0x00, 0x20, 0xe8, 0x4c, 0x0a, 0x80])
+# NMI handler: STX $00; RTI
+VBLANK_HANDLER = bytes([0x86, 0x00, 0x40])
+# SEI; LDX #$00; INX; INX; CLI; idle: JMP idle
+IRQ_PROGRAM = bytes([0x78, 0xa2, 0x00, 0xe8, 0xe8, 0x58, 0x4c, 0x06, 0x80])
+# IRQ handler: STX $00; LDA #$00; STA $01 (acknowledges); RTI
+IRQ_HANDLER = bytes([0x86, 0x00, 0xa9, 0x00, 0x85, 0x01, 0x40])
+
+
+def program_nes(program: bytes, handler: bytes = b'\x40', lockstep: bool = False) -> Nes:
+    cartridge = Cartridge()
+    cartridge.write_block(0x8000, program)
+    cartridge.write_block(0x9000, handler)
+    # NMI, reset and IRQ vectors
+    cartridge.write_block(0xfffa, bytes([0x00, 0x90, 0x00, 0x80, 0x00, 0x90]))
+    return Nes(cartridge, lockstep)
+
+
+def state(nes: Nes):
+    cpu = nes.cpu
+    return (cpu.total_cycles, cpu.pc.value, cpu.a.value, cpu.x.value, cpu.y.value, cpu.status.value,
+            nes.ppu.dots, nes.ppu.frame.tobytes(), bytes(nes.ppu.oam), nes.ram.snapshot())
+
+
+# TESTS
+def test_scheduler_matches_lockstep_on_nestest():
+    states = []
+    for lockstep in (True, False):
+        nes = Nes.from_file(NESTEST_ROM, lockstep)
+        for _ in range(8):
+            nes.run_frame()
+        states.append(state(nes))
+    assert states[0] == states[1]
+
+
+def test_run_frame_stops_at_vblank():
+    nes = Nes.from_file(NESTEST_ROM)
+    frame = nes.run_frame()
+    assert frame is nes.ppu.frame
+    assert nes.ppu.frame_count == 0 and nes.ppu.scanline == 241
+
+
+def test_oam_is_copied_when_dma_ends():
+    nes = program_nes(DMA_PROGRAM)
+    nes.bus.write_block(0x0200, bytes(range(0x100)))
+    nes.step()
+    start = nes.cpu.total_cycles
+    cycles = nes.step()
+    assert cycles == 4 + 513 + ((start + 4) & 1)
+    assert bytes(nes.ppu.oam) == bytes(range(0x100))
+    assert 'dma_end' not in nes.pending
+
+
+@pytest.mark.parametrize('lockstep', [True, False])
+def test_frame_counter_irq(lockstep: bool):
+    nes = program_nes(FRAME_IRQ_PROGRAM, FRAME_IRQ_HANDLER, lockstep)
+    nes.run_cycles(FRAME_IRQ_CYCLE + FRAME_COUNTER_PERIOD + 100)
+    assert nes.ram.read(0x0000) == 2
+    assert not nes.io.frame_irq
+
+
+def test_frame_counter_irq_inhibit():
+    program = bytearray(FRAME_IRQ_PROGRAM)
+    program[1] = 0x40
+    nes = program_nes(bytes(program), FRAME_IRQ_HANDLER)
+    nes.run_cycles(3 * FRAME_COUNTER_PERIOD)
+    assert nes.ram.read(0x0000) == 0
+    assert 'frame_counter' not in nes.pending
+
+
+def test_skipped_idle_loops_match_lockstep():
+    states = []
+    for lockstep, skip in ((True, False), (False, False), (False, True)):
+        nes = program_nes(NMI_WAIT_PROGRAM, NMI_WAIT_HANDLER, lockstep)
+        nes.cpu.skip_idle_loops = skip
+        for _ in range(3):
+            nes.run_frame()
+        nes.run_cycles(1000)
+        states.append(state(nes))
+    assert states[0] == states[1] == states[2]
+    assert nes.ram.read(0x0001) == 3
+    assert nes.cpu.idle_loops[0x8008] is not None
+
+
+def test_frame_counter_irq_matches_lockstep():
+    states = []
+    for lockstep in (True, False):
+        nes = program_nes(FRAME_IRQ_PROGRAM, FRAME_IRQ_HANDLER, lockstep)
+        nes.run_cycles(2 * FRAME_COUNTER_PERIOD)
+        states.append(state(nes))
+    assert states[0] == states[1]
+
+
+@pytest.mark.parametrize('lockstep', [True, False])
+def test_nmi_enabled_in_vblank_is_taken_after_write(lockstep: bool):
+    nes = program_nes(VBLANK_PROGRAM, VBLANK_HANDLER, lockstep)
+    nes.run_frame()
+    nes.run_cycles(20)
+    # NMI came right after STA $2000, before the first INX
+    assert nes.ram.read(0x0000) == 0
+
+
+def test_vblank_nmi_matches_lockstep():
+    states = []
+    for lockstep in (True, False):
+        nes = program_nes(VBLANK_PROGRAM, VBLANK_HANDLER, lockstep)
+        for _ in range(3):
+            nes.run_frame()
+        states.append(state(nes))
+    assert states[0] == states[1]
+
+
+@pytest.mark.parametrize('lockstep', [True, False])
+def test_masked_irq_is_taken_after_cli(lockstep: bool):
+    nes = program_nes(IRQ_PROGRAM, IRQ_HANDLER, lockstep)
+    # IRQ line held by RAM $01 until the handler acknowledges it
+    nes.irq_line = lambda: nes.ram.read(0x0001) != 0
+    nes.ram.write(0x0001, 0x01)
+    nes.run_cycles(100)
+    assert nes.ram.read(0x0000) == 2 and nes.ram.read(0x0001) == 0
+
+
+def test_frame_irq_is_masked_after_reset():
+    # idle: JMP idle, the frame counter IRQ is on since power up
+    nes = program_nes(bytes([0x4c, 0x00, 0x80]), NMI_WAIT_HANDLER)
+    nes.run_cycles(2 * FRAME_COUNTER_PERIOD)
+    assert nes.io.frame_irq
+    assert nes.ram.read(0x0000) == 0
+    assert nes.cpu.pc.value == 0x8000
+
+
+@pytest.mark.parametrize('addr, skipped', [(0x4015, True), (0x4016, False), (0x4017, False)])
+def test_io_polling_loops(addr: int, skipped: bool):
+    # loop: LDA addr; BEQ loop
+    nes = program_nes(bytes([0xad, addr & 0xff, addr >> 8, 0xf0, 0xfb]))
+    readers = nes.bus.readers
+    read = readers[0x40]
+    reads = []
+    readers[0x40] = lambda a: reads.append(a) or read(a)
+    nes.run_cycles(10000)
+    assert nes.cpu.pc.value in (0x8000, 0x8003)
+    assert (len(reads) < 100) == skipped
@@ -0,0 +1,64 @@
+import pytest
+
+from pynes.core.devices import Bus, Cpu6502, Ppu2C02, Ram, Cartridge, IoRegisters
+
+# LDA #$02; STA $4014
+DMA_PROGRAM = bytes([0xa9, 0x02, 0x8d, 0x14, 0x40])
+
+
+@pytest.fixture()
+def bus():
+    bus = Bus()
+    Cpu6502().connect_to_bus(bus)
+    Ppu2C02().connect_to_bus(bus)
+    Ram().connect_to_bus(bus)
+    IoRegisters().connect_to_bus(bus)
+    Cartridge().connect_to_bus(bus)
+    bus.write_block(0x0200, bytes(range(0x100)))
+    bus.write_block(0x8000, DMA_PROGRAM)
+    cpu = bus.get_cpu6502()
+    cpu.pc.value = 0x8000
+    yield bus
+
+
+# TESTS
+def test_dma_copies_page_into_oam(bus: Bus):
+    cpu = bus.get_cpu6502()
+    assert cpu.step() == 2
+    assert cpu.step() == 4 + 513
+    assert bytes(bus.get_ppu2C02().oam) == bytes(range(0x100))
+
+
+def test_dma_on_odd_cycle_takes_alignment_cycle(bus: Bus):
+    cpu = bus.get_cpu6502()
+    cpu.total_cycles = 1
+    cpu.step()
+    assert cpu.step() == 4 + 514
+
+
+def test_dma_starts_at_oam_addr(bus: Bus):
+    ppu = bus.get_ppu2C02()
+    ppu.oam_addr = 0x10
+    bus.get_cpu6502().run_until(pc=0x8005)
+    assert ppu.oam[0x10] == 0x00
+    assert ppu.oam[0x0f] == 0xff
+
+
+def test_dma_stall_is_spent_by_clock(bus: Bus):
+    cpu = bus.get_cpu6502()
+    cpu.step()
+    clocks = 1
+    cpu.clock()
+    while not cpu.complete():
+        cpu.clock()
+        clocks += 1
+    assert clocks == 4 + 513
+    assert cpu.total_cycles == 2 + 4 + 513
+
+
+def test_oam_registers_are_mirrored(bus: Bus):
+    bus.write(0x3ffb, 0x20)
+    bus.write(0x2004, 0x77)
+    ppu = bus.get_ppu2C02()
+    assert ppu.oam[0x20] == 0x77
+    assert ppu.oam_addr == 0x21
@@ -0,0 +1,191 @@
+import pathlib
+
+import numpy as np
+import pytest
+
+from pynes.core.devices import Bus, Cpu6502, Ppu2C02, Ram, Cartridge, IoRegisters
+from pynes.core.devices.ppu.ppu2C02 import DOTS_PER_FRAME, STATUS_OVERFLOW, STATUS_SPRITE_0, STATUS_VBLANK
+from tests.helpers import connected
+
+NESTEST_ROM = pathlib.Path(__file__).parent / 'nestest.nes'
+
+BACKDROP = 0x0f
+TILE_COLOR = 0x30
+SPRITE_COLOR = 0x16
+
+
+def vram_write(ppu: Ppu2C02, addr: int, data: bytes) -> None:
+    ppu.cpu_write(0x2006, addr >> 8)
+    ppu.cpu_write(0x2006, addr & 0xff)
+    for value in data:
+        ppu.cpu_write(0x2007, value)
+
+
+@pytest.fixture()
+def ppu():
+    ppu = Ppu2C02()
+    # tile 1: solid color 1
+    vram_write(ppu, 0x0010, b'\xff' * 8 + bytes(8))
+    vram_write(ppu, 0x2000, b'\x01')
+    vram_write(ppu, 0x3f00, bytes([BACKDROP, TILE_COLOR]))
+    vram_write(ppu, 0x3f11, bytes([SPRITE_COLOR]))
+    # scroll back to the top left corner, hide all sprites
+    vram_write(ppu, 0x0000, b'')
+    ppu.sprites[:] = 0xff
+    ppu.cpu_write(0x2001, 0x1e)
+    yield ppu
+
+
+# TESTS
+def test_background_tile(ppu: Ppu2C02):
+    ppu.run_dots(DOTS_PER_FRAME)
+    assert ppu.frame_complete
+    assert (ppu.frame[:8, :8] == TILE_COLOR).all()
+    assert (ppu.frame[8:, :] == BACKDROP).all()
+    assert (ppu.frame[:, 8:] == BACKDROP).all()
+
+
+def test_fine_x_scroll(ppu: Ppu2C02):
+    ppu.cpu_write(0x2005, 4)
+    ppu.cpu_write(0x2005, 0)
+    ppu.run_dots(DOTS_PER_FRAME)
+    assert (ppu.frame[0, :4] == TILE_COLOR).all()
+    assert (ppu.frame[0, 4:252] == BACKDROP).all()
+    # horizontal mirroring: the 33rd tile fetched is the first one again
+    assert (ppu.frame[0, 252:] == TILE_COLOR).all()
+
+
+def test_sprite_over_background_sets_sprite_0_hit(ppu: Ppu2C02):
+    ppu.sprites[0] = (3, 0x01, 0x00, 4)
+    ppu.run_dots(240 * 341)
+    assert ppu.status & STATUS_SPRITE_0
+    assert (ppu.frame[4:12, 4:12] == SPRITE_COLOR).all()
+    assert (ppu.frame[:4, :8] == TILE_COLOR).all()
+
+
+def test_sprite_0_hit_is_seen_at_its_dot(ppu: Ppu2C02):
+    ppu.sprites[0] = (3, 0x01, 0x00, 4)
+    # first opaque pixel of both on line 4 is x=4, output at dot 5
+    assert ppu.next_sprite_0_dot() == 4 * 341 + 5
+    ppu.run_dots(4 * 341 + 4)
+    assert not ppu.cpu_read(0x2002) & STATUS_SPRITE_0
+    ppu.run_dots(1)
+    assert ppu.cpu_read(0x2002) & STATUS_SPRITE_0
+    # next hit is in the next frame, one line lower after the move
+    ppu.cpu_write(0x2003, 0x00)
+    ppu.cpu_write(0x2004, 4)
+    assert ppu.next_sprite_0_dot() == DOTS_PER_FRAME + 5 * 341 + 5
+
+
+def test_sprite_0_without_background_never_hits(ppu: Ppu2C02):
+    ppu.sprites[0] = (100, 0x01, 0x00, 4)
+    assert ppu.next_sprite_0_dot() == float('inf')
+
+
+def test_sprite_behind_background(ppu: Ppu2C02):
+    ppu.sprites[0] = (3, 0x01, 0x20, 4)
+    ppu.run_dots(240 * 341)
+    assert (ppu.frame[4:8, 4:8] == TILE_COLOR).all()
+    assert (ppu.frame[8:12, 8:12] == SPRITE_COLOR).all()
+
+
+def test_sprite_overflow(ppu: Ppu2C02):
+    for i in range(8):
+        ppu.sprites[i] = (100, 0x01, 0x00, i * 16)
+    ppu.run_dots(240 * 341)
+    assert not ppu.status & STATUS_OVERFLOW
+    ppu.sprites[8] = (100, 0x01, 0x00, 200)
+    ppu.run_dots(DOTS_PER_FRAME)
+    assert ppu.status & STATUS_OVERFLOW
+    # only the first 8 sprites are drawn
+    assert (ppu.frame[101, 112:120] == SPRITE_COLOR).all()
+    assert (ppu.frame[101, 200:208] == BACKDROP).all()
+
+
+def test_sprite_overflow_misses_with_diagonal_evaluation(ppu: Ppu2C02):
+    for i in range(8):
+        ppu.sprites[i] = (100, 0x01, 0x00, i * 16)
+    # after 8 sprites hardware compares byte m of sprite n as Y, both going up
+    # on a miss: Y of sprite 8, tile of sprite 9, attributes of sprite 10
+    ppu.sprites[10] = (0xff, 0xff, 100, 0xff)
+    ppu.run_dots(240 * 341)
+    assert ppu.status & STATUS_OVERFLOW
+    # a sprite really on the line but not looked at as Y is missed
+    ppu.sprites[10] = (0xff, 0xff, 0xff, 0xff)
+    ppu.sprites[11] = (100, 0x01, 0x00, 0xff)
+    ppu.run_dots(DOTS_PER_FRAME)
+    assert not ppu.status & STATUS_OVERFLOW
+
+
+def test_lower_sprite_wins_on_overlap(ppu: Ppu2C02):
+    vram_write(ppu, 0x3f15, bytes([0x11]))
+    ppu.sprites[1] = (100, 0x01, 0x00, 20)
+    ppu.sprites[2] = (100, 0x01, 0x01, 16)
+    ppu.run_dots(240 * 341)
+    assert (ppu.frame[101, 16:20] == 0x11).all()
+    assert (ppu.frame[101, 20:28] == SPRITE_COLOR).all()
+
+
+def test_status_read_clears_vblank(ppu: Ppu2C02):
+    ppu.run_dots(241 * 341 + 1)
+    assert ppu.cpu_read(0x2002) & STATUS_VBLANK
+    assert not ppu.cpu_read(0x2002) & STATUS_VBLANK
+
+
+def test_status_low_bits_are_last_write(ppu: Ppu2C02):
+    # PPUDATA read buffer holds the tile row byte
+    vram_write(ppu, 0x0010, b'')
+    ppu.cpu_read(0x2007)
+    ppu.cpu_write(0x2003, 0xf5)
+    assert ppu.cpu_read(0x2002) & 0x1f == 0x15
+    assert ppu.cpu_read(0x2000) == 0xf5
+
+
+def test_ppudata_read_is_buffered(ppu: Ppu2C02):
+    vram_write(ppu, 0x2400, b'\xab\xcd')
+    ppu.cpu_write(0x2006, 0x24)
+    ppu.cpu_write(0x2006, 0x00)
+    ppu.cpu_read(0x2007)
+    assert ppu.cpu_read(0x2007) == 0xab
+    assert ppu.cpu_read(0x2007) == 0xcd
+
+
+def test_chr_ram_write_invalidates_one_tile(ppu: Ppu2C02):
+    cache = ppu.tile_cache
+    cache.update()
+    assert (cache.tiles[1] == 1).all()
+    vram_write(ppu, 0x0023, b'\x81')
+    assert cache.stale == {2}
+    cache.update()
+    assert list(cache.tiles[2, 3]) == [1, 0, 0, 0, 0, 0, 0, 1]
+    assert not cache.tiles[2, :3].any() and not cache.tiles[2, 4:].any()
+
+
+def test_tile_cache_follows_chr_bank_switch():
+    bus, ppu_bus, _ = connected(3, 2, 4)
+    ppu = ppu_bus.get_ppu2C02()
+    ppu.tile_cache.update()
+    assert not ppu.tile_cache.tiles[0].any()
+    bus.write(0x8000, 0x02)
+    assert len(ppu.tile_cache.stale) == 512
+    ppu.tile_cache.update()
+    # every byte of the first 1 KB is 16: both planes have bit 4 set
+    assert list(ppu.tile_cache.tiles[0, 0]) == [0, 0, 0, 3, 0, 0, 0, 0]
+
+
+def test_nestest_menu_renders_in_lockstep():
+    bus = Bus()
+    cpu = Cpu6502()
+    cpu.connect_to_bus(bus)
+    ppu = Ppu2C02()
+    ppu.connect_to_bus(bus)
+    Ram().connect_to_bus(bus)
+    IoRegisters().connect_to_bus(bus)
+    cartridge = Cartridge.from_file(NESTEST_ROM)
+    cartridge.connect_to_bus(bus)
+    cartridge.connect_to_ppu(ppu)
+    ppu.nmi_callback = cpu.nmi
+    cpu.reset()
+    while ppu.frame_count < 5:
+        ppu.run_dots(3 * cpu.step())
+    assert len(np.unique(ppu.frame)) > 1
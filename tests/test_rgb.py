@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+
+from pynes.core.devices import Ppu2C02
+from pynes.core.devices.ppu.rgb import DEFAULT_COLORS, RgbPalette, load_pal
+
+
+# TESTS
+def test_convert_looks_up_every_pixel():
+    palette = RgbPalette()
+    frame = np.zeros((240, 256), dtype=np.uint8)
+    frame[10, 20] = 0x16
+    output = palette.convert(frame)
+    assert output.shape == (256, 240, 3)
+    assert tuple(output[20, 10]) == tuple(DEFAULT_COLORS[0x16])
+    assert tuple(output[0, 0]) == tuple(DEFAULT_COLORS[0x00])
+    # output array is reused
+    assert palette.convert(frame) is output
+
+
+def test_emphasis_dims_other_channels():
+    palette = RgbPalette()
+    frame = np.full((240, 256), 0x30, dtype=np.uint8)
+    emphasis = np.zeros(240, dtype=np.uint8)
+    emphasis[5] = 0x01
+    output = palette.convert(frame, emphasis)
+    assert tuple(output[0, 0]) == (236, 238, 236)
+    red, green, blue = output[0, 5]
+    assert red == 236 and green < 238 and blue < 236
+
+
+def test_pal_file(tmp_path):
+    path = tmp_path / 'grey.pal'
+    path.write_bytes(bytes(i for i in range(64) for _ in range(3)))
+    palette = RgbPalette.from_file(path)
+    assert palette.table.shape == (512, 3)
+    assert tuple(palette.table[0x21]) == (0x21, 0x21, 0x21)
+    path.write_bytes(bytes(100))
+    with pytest.raises(ValueError):
+        load_pal(path)
+
+
+def test_entries_follow_palette_ram():
+    ppu = Ppu2C02()
+    palettes = ppu.internal_bus.devices['PpuPalettes']
+    ppu.internal_bus.write(0x3f01, 0x16)
+    assert tuple(RgbPalette().entries(palettes)[1]) == tuple(DEFAULT_COLORS[0x16])
+
+
+def test_save_ppm(tmp_path):
+    palette = RgbPalette()
+    palette.convert(np.zeros((240, 256), dtype=np.uint8))
+    palette.save_ppm(tmp_path / 'frame.ppm')
+    data = (tmp_path / 'frame.ppm').read_bytes()
+    assert data.startswith(b'P6 256 240 255\n')
+    assert len(data) == len(b'P6 256 240 255\n') + 256 * 240 * 3
@@ -0,0 +1,73 @@
+import pytest
+
+from pynes.core.devices import Bus, Cpu6502, Ram, Cartridge
+from pynes.core.devices.cpu.handlers import HANDLERS, RAM_HANDLERS
+
+# $8000: LDA #$42; STA $10; LDX $10; NOP
+PROGRAM = bytes([0xa9, 0x42, 0x85, 0x10, 0xa6, 0x10, 0xea])
+
+
+@pytest.fixture()
+def bus():
+    bus = Bus()
+    Cpu6502().connect_to_bus(bus)
+    Ram().connect_to_bus(bus)
+    Cartridge().connect_to_bus(bus)
+    bus.write_block(0x8000, PROGRAM)
+    bus.get_cpu6502().pc.value = 0x8000
+    yield bus
+
+
+# TESTS
+@pytest.mark.parametrize('kind, expected', [
+    ('write', [(0x0010, 0x42, 0x8002)]),
+    ('read', [(0x0010, 0x42, 0x8004)]),
+])
+def test_data_watchpoint_reports_access(bus: Bus, kind, expected):
+    hits = []
+    bus.add_watchpoint(0x0010, 0x0010, kind, lambda *hit: hits.append(hit))
+    bus.get_cpu6502().run_until(pc=0x8007)
+    assert hits == expected
+
+
+def test_execute_watchpoint_reports_fetch(bus: Bus):
+    hits = []
+    bus.add_watchpoint(0x8004, 0x8006, 'execute', lambda *hit: hits.append(hit))
+    bus.get_cpu6502().run_until(pc=0x8007)
+    assert hits == [(0x8004, 0xa6, 0x8004), (0x8006, 0xea, 0x8006)]
+
+
+def test_mirrors_are_watched_on_their_own(bus: Bus):
+    hits = []
+    bus.add_watchpoint(0x0000, 0x07ff, 'write', lambda *hit: hits.append(hit))
+    bus.write(0x0810, 0x11)
+    assert hits == [] and bus.read(0x0010) == 0x11
+    bus.add_watchpoint(0x0800, 0x1fff, 'write', lambda *hit: hits.append(hit))
+    bus.write(0x0810, 0x22)
+    bus.write(0x0010, 0x33)
+    assert [addr for addr, _, _ in hits] == [0x0810, 0x0010]
+
+
+def test_only_watched_pages_are_swapped(bus: Bus):
+    readers = list(bus.readers)
+    watchpoint = bus.add_watchpoint(0x0010, 0x0010, 'read', print)
+    assert [page for page in range(0x100) if bus.readers[page] is not readers[page]] == [0x00]
+    bus.remove_watchpoint(watchpoint)
+    assert bus.readers == readers
+
+
+def test_watched_ram_disables_direct_handlers(bus: Bus):
+    cpu = bus.get_cpu6502()
+    assert cpu.handlers is RAM_HANDLERS
+    watchpoint = bus.add_watchpoint(0x01f0, 0x01ff, 'write', print)
+    assert cpu.handlers is HANDLERS
+    bus.remove_watchpoint(watchpoint)
+    assert cpu.handlers is RAM_HANDLERS
+
+
+def test_watchpoints_survive_remap(bus: Bus):
+    hits = []
+    bus.add_watchpoint(0x0010, 0x0010, 'write', lambda *hit: hits.append(hit))
+    bus.remap()
+    bus.write(0x0010, 0x01)
+    assert len(hits) == 1